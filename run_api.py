@@ -1,5 +1,6 @@
 """Script to run the fraud detection API server."""
 
+import argparse
 import os
 import sys
 
@@ -8,16 +9,49 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import uvicorn
 
+from src.config import API_WORKERS, API_THREADS_PER_WORKER, API_WORKER_REPORT_INTERVAL
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the fraud detection API server")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind")
+    parser.add_argument(
+        "--workers", type=int, default=API_WORKERS,
+        help="Worker processes; more than 1 starts the pre-fork production server"
+    )
+    parser.add_argument(
+        "--threads-per-worker", type=int, default=API_THREADS_PER_WORKER,
+        help="OpenMP/BLAS threads allowed in each worker"
+    )
+    parser.add_argument("--no-reload", action="store_true", help="Disable auto-reload for a single worker")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    
     print("🚀 Starting Fraud Detection API...")
-    print("📊 API Documentation: http://localhost:8000/docs")
-    print("🔍 Health Check: http://localhost:8000/health")
+    print(f"📊 API Documentation: http://localhost:{args.port}/docs")
+    print(f"🔍 Health Check: http://localhost:{args.port}/health")
     print("\nPress CTRL+C to stop the server\n")
     
-    uvicorn.run(
-        "src.api.app:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    if args.workers > 1:
+        # Production: load the model once, then fork workers sharing it copy-on-write
+        from src.api.server import PreforkServer
+        
+        PreforkServer(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            threads_per_worker=args.threads_per_worker,
+            report_interval=API_WORKER_REPORT_INTERVAL
+        ).run()
+    else:
+        uvicorn.run(
+            "src.api.app:app",
+            host=args.host,
+            port=args.port,
+            reload=not args.no_reload,
+            log_level="info"
+        )
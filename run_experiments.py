@@ -11,7 +11,7 @@ project_root = Path(__file__).parent
 sys.path.append(str(project_root))
 
 import mlflow
-from src.config import MLFLOW_TRACKING_URI, EXPERIMENT_NAME, RAW_DATA_DIR, PROCESSED_DATA_DIR, MODELS_DIR, IMBALANCE_RATIO
+from src.config import MLFLOW_TRACKING_URI, EXPERIMENT_NAME, RAW_DATA_DIR, RAW_DATA_FORMAT, PROCESSED_DATA_DIR, MODELS_DIR, IMBALANCE_RATIO, ensure_directories
 from src.data.data_loader import generate_fraud_data
 from src.data.preprocessing import preprocess_data
 from src.models.train import train_model, evaluate_model, save_model
@@ -77,10 +77,11 @@ def main():
     print("="*60)
     print("Fraud Detection - Multiple Experiments Demo")
     print("="*60)
+    ensure_directories()
     
     # Load and preprocess data once
     print("\nGenerating and preprocessing fraud detection data...")
-    df = generate_fraud_data(n_samples=10000, fraud_ratio=IMBALANCE_RATIO, save_path=RAW_DATA_DIR)
+    df = generate_fraud_data(n_samples=10000, fraud_ratio=IMBALANCE_RATIO, save_path=RAW_DATA_DIR, data_format=RAW_DATA_FORMAT)
     X_train, X_test, y_train, y_test, scaler, encoders = preprocess_data(
         df, test_size=0.3, random_state=42, save_path=PROCESSED_DATA_DIR
     )
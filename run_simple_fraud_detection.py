@@ -16,7 +16,7 @@ import joblib
 from src.config import EXPERIMENT_NAME, MLFLOW_TRACKING_URI, MODEL_PARAMS
 from src.data.data_loader import generate_fraud_data
 from src.data.preprocessing import preprocess_data
-from src.models.train import train_model, evaluate_model
+from src.models.train import train_model, evaluate_model, compile_model
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -80,6 +80,9 @@ def main():
         joblib.dump(model, model_path)
         logger.info(f"Model saved to: {model_path}")
         
+        # Flattened forest for fast small-batch serving
+        compile_model(model, X_test, Path("models"), model_name="fraud_detection_model_compiled.npz")
+        
         # Log model to MLflow
         mlflow.sklearn.log_model(model, "model")
         
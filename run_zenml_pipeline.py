@@ -12,9 +12,9 @@ project_root = Path(__file__).parent
 sys.path.append(str(project_root))
 
 from src.config import (
-    RAW_DATA_DIR, PROCESSED_DATA_DIR, MODELS_DIR,
+    RAW_DATA_DIR, RAW_DATA_FORMAT, PROCESSED_DATA_DIR, MODELS_DIR,
     MLFLOW_TRACKING_URI, EXPERIMENT_NAME, MODEL_PARAMS,
-    TEST_SIZE, RANDOM_STATE, IMBALANCE_RATIO
+    TEST_SIZE, RANDOM_STATE, IMBALANCE_RATIO, ensure_directories
 )
 from src.data.data_loader import generate_fraud_data
 from src.data.preprocessing import preprocess_data
@@ -41,6 +41,7 @@ def run_fraud_detection_pipeline():
     logger.info(f"MLflow tracking URI: {MLFLOW_TRACKING_URI}")
     logger.info(f"Experiment name: {EXPERIMENT_NAME}")
     logger.info("")
+    ensure_directories()
     
     try:
         # Step 1: Load/Generate Data
@@ -50,7 +51,8 @@ def run_fraud_detection_pipeline():
         df = generate_fraud_data(
             n_samples=10000,
             fraud_ratio=IMBALANCE_RATIO,
-            save_path=RAW_DATA_DIR
+            save_path=RAW_DATA_DIR,
+            data_format=RAW_DATA_FORMAT
         )
         logger.info(f"✅ Data loaded successfully: {df.shape[0]} transactions")
         logger.info(f"   - Fraudulent: {df['is_fraud'].sum()}")
@@ -1 +1,6 @@
 """API module for fraud detection."""
+
+import time
+
+# Taken before src.api.app imports its dependencies: the "imports" startup phase
+IMPORTS_STARTED = time.perf_counter()
@@ -0,0 +1,178 @@
+"""Admission control and load shedding for the scoring endpoints.
+
+Without a limit, a traffic spike queues unbounded work: every request gets
+slow, upstream clients time out and the work already done on their requests
+is wasted. :class:`AdmissionController` bounds the number of scoring calls
+in flight and the number waiting for a slot. It rejects a request up front,
+with a ``Retry-After`` hint, when the queue is full or the projected wait
+would break the latency target.
+
+The projection uses the recent service time (how long an admitted call holds
+its slot, dominated by the model's ``predict_proba``). While all slots are
+busy they free up at a rate of ``max_concurrency / service_time``, so a
+request with ``queued`` requests ahead of it waits about
+``(queued + 1) * service_time / max_concurrency``.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional
+
+# Shed reasons reported in the metrics
+SHED_REASONS = ("queue_full", "latency_target", "queue_timeout")
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of queued."""
+
+    def __init__(self, reason: str, status_code: int, retry_after: int, detail: str):
+        super().__init__(detail)
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded FIFO queue and latency-target shedding."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        max_queue: int = 256,
+        latency_target: float = 0.5,
+        smoothing: float = 0.2,
+        on_queue_time: Optional[Callable[[float], None]] = None
+    ):
+        """
+        Args:
+            max_concurrency: Scoring calls allowed in flight
+            max_queue: Requests allowed to wait for a slot (beyond this they get 429)
+            latency_target: Seconds a request may spend queued and being served
+            smoothing: Weight of the newest sample in the service-time moving average
+            on_queue_time: Called with the queue time of every admitted request
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.latency_target = latency_target
+        self.smoothing = smoothing
+        self.on_queue_time = on_queue_time
+
+        self.in_flight = 0
+        self.service_time: Optional[float] = None
+        self._waiters: "deque[asyncio.Future]" = deque()
+
+        # Statistics
+        self.admitted = 0
+        self.shed: Dict[str, int] = {reason: 0 for reason in SHED_REASONS}
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def projected_queue_time(self) -> float:
+        """Expected wait for a slot of a request arriving now."""
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            return 0.0
+        return (self.queued + 1) * (self.service_time or 0.0) / self.max_concurrency
+
+    def _reject(self, reason: str, status_code: int, detail: str, wait: float):
+        self.shed[reason] += 1
+        raise AdmissionRejected(reason, status_code, max(1, math.ceil(wait)), detail)
+
+    def check(self):
+        """Raise :class:`AdmissionRejected` if a request arriving now would be shed."""
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            return
+
+        wait = self.projected_queue_time()
+        if self.queued >= self.max_queue:
+            self._reject("queue_full", 429, "Too many requests queued", wait)
+        if wait + (self.service_time or 0.0) > self.latency_target:
+            self._reject(
+                "latency_target", 503,
+                f"Projected latency {(wait + self.service_time) * 1000:.0f} ms exceeds the "
+                f"{self.latency_target * 1000:.0f} ms target",
+                wait
+            )
+
+    async def acquire(self):
+        """Take a slot, queueing for at most the latency target, or raise :class:`AdmissionRejected`."""
+        self.check()
+        started = time.perf_counter()
+
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                # A slot is handed over by release(), which leaves in_flight unchanged;
+                # past the deadline the request could no longer be served within the target
+                deadline = max(self.latency_target - (self.service_time or 0.0), 0.0)
+                await asyncio.wait_for(waiter, deadline)
+            except asyncio.TimeoutError:
+                self._discard(waiter)
+                # A slot handed over as the deadline expired is ours: serve the request
+                if not waiter.done() or waiter.cancelled():
+                    self._reject(
+                        "queue_timeout", 503, "Timed out waiting for a free slot", self.projected_queue_time()
+                    )
+            except asyncio.CancelledError:
+                self._discard(waiter)
+                # The slot may have been handed over just before the cancellation
+                if waiter.done() and not waiter.cancelled():
+                    self.release()
+                raise
+
+        self.admitted += 1
+        if self.on_queue_time is not None:
+            self.on_queue_time(time.perf_counter() - started)
+
+    def _discard(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, service_time: Optional[float] = None):
+        """Free a slot (handing it to the oldest waiter) and record how long it was held."""
+        if service_time is not None:
+            if self.service_time is None:
+                self.service_time = service_time
+            else:
+                self.service_time += self.smoothing * (service_time - self.service_time)
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def admit(self):
+        """Hold a slot for the duration of the block."""
+        await self.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        """Admission control statistics."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "latency_target_ms": self.latency_target * 1000,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "service_time_ms": (self.service_time or 0.0) * 1000,
+            "projected_queue_time_ms": self.projected_queue_time() * 1000,
+            "admitted": self.admitted,
+            "shed": dict(self.shed)
+        }
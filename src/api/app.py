@@ -1,25 +1,198 @@
 """FastAPI application for fraud detection model serving."""
 
+import asyncio
+import contextlib
+import json
 import os
-import pickle
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Sequence
+
 import numpy as np
-from typing import Dict, List
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 import uvicorn
 
+from src.api.admission import AdmissionController, AdmissionRejected
+from src.api.audit import AuditLog
+from src.api.artifacts import (
+    ModelBundle, artifact_paths, artifacts_signature, load_model_bundle, warm_up_bundle
+)
+from src.api.batching import MicroBatcher
+from src.api.cache import PredictionCache, transaction_key
+from src.api.drift import DriftMonitor
+from src.api.columnar import (
+    ARROW_CONTENT_TYPE, RAW_CONTENT_TYPE, decode_arrow_columns, decode_raw_columns,
+    encode_arrow_columns, encode_raw_columns
+)
+from src.api.executor import EventLoopLagMonitor, InferenceExecutor
+from src.api.feature_store import FEATURE_NAMES, FeatureStore
+from src.api.server import WORKER_INDEX_VAR, process_memory
+from src.api import IMPORTS_STARTED, metrics
+from src.config import (
+    API_MICROBATCH_ENABLED, API_MICROBATCH_MAX_SIZE, API_MICROBATCH_MAX_WAIT_MS,
+    API_EXECUTOR, API_EXECUTOR_WORKERS, API_MAX_CONCURRENT_INFERENCE, API_MODEL_WATCH_INTERVAL,
+    API_STREAM_CHUNK_SIZE, API_MODEL_ENGINE, API_COMPILED_MAX_ROWS,
+    API_EARLY_EXIT, API_EARLY_EXIT_DELTA, API_EARLY_EXIT_BLOCK_TREES, FRAUD_THRESHOLD,
+    API_CASCADE, API_PREDICTION_CACHE_SIZE, API_PREDICTION_CACHE_TTL,
+    API_ADMISSION_MAX_CONCURRENCY, API_ADMISSION_MAX_QUEUE, API_ADMISSION_LATENCY_TARGET_MS,
+    API_FEATURE_STORE, API_FEATURE_STORE_MAX_ACCOUNTS, API_FEATURE_STORE_RING_SIZE,
+    API_FEATURE_STORE_WINDOW_SECONDS, API_FEATURE_STORE_SNAPSHOT_PATH, API_FEATURE_STORE_SNAPSHOT_INTERVAL,
+    API_AUDIT_LOG, API_AUDIT_LOG_DIR, API_AUDIT_MAX_PENDING_ROWS, API_AUDIT_FLUSH_ROWS,
+    API_AUDIT_FLUSH_INTERVAL, API_AUDIT_BACKPRESSURE, API_AUDIT_SEGMENT_MAX_MB, API_AUDIT_SEGMENT_MAX_AGE,
+    API_DRIFT_MONITOR, API_DRIFT_SAMPLE_RATE, API_DRIFT_WINDOW_SECONDS, API_DRIFT_BUCKETS, API_DRIFT_MIN_ROWS
+)
+
+# Seconds spent in each startup phase, reported by /health
+startup_phases: Dict[str, float] = {"imports": time.perf_counter() - IMPORTS_STARTED}
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Fraud Detection API",
     description="Real-time fraud detection using ML model",
     version="1.0.0"
 )
+app.add_middleware(
+    metrics.MetricsMiddleware,
+    endpoints=(
+        "/predict", "/batch-predict", "/batch-predict/stream", "/batch-predict/columnar",
+        "/health", "/metrics"
+    )
+)
+
+# Probabilities where the confidence bucket changes (see confidence_levels)
+CONFIDENCE_BOUNDARIES = (0.3, 0.4, 0.6, 0.7)
+
+# Latency series of the scoring stages
+STAGE_COLUMNS = metrics.STAGE_LATENCY.labels("columns")
+STAGE_INFERENCE = metrics.STAGE_LATENCY.labels("inference")
+STAGE_TRANSFORM = metrics.STAGE_LATENCY.labels("transform")
+STAGE_PREDICT = metrics.STAGE_LATENCY.labels("predict")
+STAGE_POSTPROCESS = metrics.STAGE_LATENCY.labels("postprocess")
+STAGE_BUILD_RESPONSES = metrics.STAGE_LATENCY.labels("build_responses")
+
+# Runtime state read by /metrics at scrape time
+EVENT_LOOP_LAG = metrics.REGISTRY.register(metrics.Histogram(
+    "fraud_api_event_loop_lag_seconds", "Delay of the event loop waking up from a periodic sleep.",
+    metrics.LATENCY_BUCKETS
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_inference_calls", "Inference calls running on or waiting for the executor.",
+    lambda: [(("running",), executor.in_flight), (("waiting",), executor.waiting)] if executor else [],
+    label_names=("state",)
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_prediction_cache_events_total", "Prediction cache lookups and evictions.",
+    lambda: [
+        ((event,), getattr(prediction_cache, event))
+        for event in ("hits", "misses", "coalesced", "evictions", "expirations", "invalidations")
+    ] if prediction_cache else [],
+    label_names=("event",),
+    metric_type="counter"
+))
+ADMISSION_QUEUE_TIME = metrics.REGISTRY.register(metrics.Histogram(
+    "fraud_api_admission_queue_seconds", "Time admitted requests waited for a scoring slot.",
+    metrics.LATENCY_BUCKETS
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_shed_requests_total", "Requests rejected by admission control.",
+    lambda: [((reason,), count) for reason, count in admission.shed.items()] if admission else [],
+    label_names=("reason",),
+    metric_type="counter"
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_admission_requests", "Requests holding or waiting for a scoring slot.",
+    lambda: [(("in_flight",), admission.in_flight), (("queued",), admission.queued)] if admission else [],
+    label_names=("state",)
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_admission_service_seconds", "Recent time an admitted request holds its scoring slot.",
+    lambda: [((), admission.service_time)] if admission and admission.service_time is not None else []
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_feature_store_accounts", "Accounts held by the online feature store.",
+    lambda: [((), feature_store.accounts)] if feature_store else []
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_feature_store_bytes", "Slab memory of the online feature store.",
+    lambda: [
+        (("used",), feature_store.stats()["used_bytes"]),
+        (("per_account",), feature_store.bytes_per_account)
+    ] if feature_store else [],
+    label_names=("kind",)
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_audit_rows_total", "Scored transactions written to or dropped from the audit log.",
+    lambda: [(("written",), audit_log.rows_written), (("dropped",), audit_log.rows_dropped)] if audit_log else [],
+    label_names=("event",),
+    metric_type="counter"
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_audit_pending_rows", "Audit records waiting in memory to be written.",
+    lambda: [((), audit_log.pending_rows)] if audit_log else []
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_feature_drift_psi", "Population stability index of each feature over the drift window.",
+    lambda: drift_score_samples("psi"),
+    label_names=("feature",)
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_feature_drift_ks", "Binned Kolmogorov-Smirnov statistic of each feature over the drift window.",
+    lambda: drift_score_samples("ks"),
+    label_names=("feature",)
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_worker_memory_bytes", "Memory of this worker process (shared pages are counted in every worker's rss).",
+    lambda: [((kind,), value) for kind, value in process_memory().items()],
+    label_names=("kind",)
+))
+metrics.REGISTRY.register(metrics.CallbackMetric(
+    "fraud_api_model_info", "Model version currently served.",
+    lambda: [((bundle.version, bundle.model_type), 1)] if bundle else [],
+    label_names=("version", "model_type")
+))
+
+# Model and preprocessing artifacts, swapped atomically as one object on reload
+bundle: Optional[ModelBundle] = None
+reload_lock: Optional[asyncio.Lock] = None
+model_watcher = None
+
+# Optional micro-batcher for single-transaction predictions
+batcher = None
+
+# Optional cache of recent /predict results, cleared on model reload
+prediction_cache = None
 
-# Global variables for model and preprocessing artifacts
-model = None
-scaler = None
-encoders = None
-feature_names = None
+# Optional admission control shedding load that would break the latency target
+admission = None
+
+# Optional per-account feature store enriching requests that carry an account_id
+feature_store = None
+feature_snapshotter = None
+
+# Optional audit log of every scored transaction, written in the background
+audit_log = None
+
+# Optional monitor comparing live feature distributions with the training ones
+drift_monitor = None
+
+# Inference executor keeping CPU-bound work off the event loop
+executor = None
+loop_lag_monitor = None
+
+# Set once startup (including warm-up) has finished; /health reports 503 until then
+ready = False
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """Answer shed requests at once, telling the client when to retry."""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
 
 
 class Transaction(BaseModel):
@@ -29,6 +202,12 @@ class Transaction(BaseModel):
     time_of_day: str = Field(..., description="Time of day", example="morning")
     location: str = Field(..., description="Location", example="online")
     transaction_type: str = Field(..., description="Transaction type", example="purchase")
+    transaction_id: Optional[str] = Field(None, description="Caller's transaction id, kept in the audit log for label joins")
+    account_id: Optional[str] = Field(None, description="Account used for history features", example="acct-1042")
+    timestamp: Optional[float] = Field(None, description="Unix time of the transaction (defaults to now)")
+    latitude: Optional[float] = Field(None, description="Latitude where the transaction took place")
+    longitude: Optional[float] = Field(None, description="Longitude where the transaction took place")
+    account_opened_at: Optional[float] = Field(None, description="Unix time the account was opened, for account_age_days")
     
     class Config:
         schema_extra = {
@@ -47,66 +226,316 @@ class PredictionResponse(BaseModel):
     is_fraud: bool = Field(..., description="Whether transaction is fraudulent")
     fraud_probability: float = Field(..., description="Probability of fraud (0-1)")
     confidence: str = Field(..., description="Confidence level: low, medium, high")
+    model_version: str = Field(..., description="Version of the model that scored the transaction")
 
 
 def load_model_artifacts():
     """Load model and preprocessing artifacts."""
-    global model, scaler, encoders, feature_names
+    global bundle
     
     try:
-        # Load model - try different paths and formats
-        model_paths = [
-            "models/fraud_detection_model.pkl",
-            "models/fraud_detector.pkl"
-        ]
-        
-        model_loaded = False
-        for model_path in model_paths:
-            if os.path.exists(model_path):
-                try:
-                    with open(model_path, "rb") as f:
-                        # Try loading with different protocols
-                        try:
-                            model = pickle.load(f)
-                            model_loaded = True
-                            print(f"✅ Loaded model from: {model_path}")
-                            break
-                        except Exception:
-                            # Try with joblib if pickle fails
-                            import joblib
-                            f.seek(0)
-                            model = joblib.load(f)
-                            model_loaded = True
-                            print(f"✅ Loaded model from: {model_path} (using joblib)")
-                            break
-                except Exception as e:
-                    print(f"⚠️  Failed to load {model_path}: {e}")
-                    continue
+        new_bundle = _load_warm_bundle(startup_phases)
+        bundle = new_bundle
+        print(f"✅ Model and artifacts loaded successfully! (version {bundle.version})")
         
-        if not model_loaded:
-            raise Exception("No valid model file found")
-        
-        # Load preprocessing artifacts
-        with open("data/processed/scaler.pkl", "rb") as f:
-            scaler = pickle.load(f)
+    except Exception as e:
+        print(f"❌ Error loading model artifacts: {e}")
+        raise
+
+
+def create_executor() -> InferenceExecutor:
+    """Create and start the inference executor."""
+    new_executor = InferenceExecutor(
+        kind=API_EXECUTOR,
+        max_workers=API_EXECUTOR_WORKERS,
+        max_concurrency=API_MAX_CONCURRENT_INFERENCE,
+        worker_initializer=init_inference_worker
+    )
+    new_executor.start()
+    return new_executor
+
+
+def _load_warm_bundle(phases: Optional[Dict[str, float]] = None) -> ModelBundle:
+    """
+    Load a new bundle and warm it up (runs in a background thread on reload).
+    
+    Args:
+        phases: Optional dictionary receiving the 'load_artifacts' and 'warm_up' durations
+    """
+    started = time.perf_counter()
+    new_bundle = load_model_bundle(
+        engine=API_MODEL_ENGINE,
+        compiled_max_rows=API_COMPILED_MAX_ROWS,
+        early_exit_delta=API_EARLY_EXIT_DELTA if API_EARLY_EXIT else None,
+        early_exit_block_trees=API_EARLY_EXIT_BLOCK_TREES,
+        decision_boundaries=sorted(CONFIDENCE_BOUNDARIES + (FRAUD_THRESHOLD,)),
+        cascade=API_CASCADE
+    )
+    loaded = time.perf_counter()
+    warm_up_bundle(new_bundle)
+    if phases is not None:
+        phases["load_artifacts"] = loaded - started
+        phases["warm_up"] = time.perf_counter() - loaded
+    return new_bundle
+
+
+def create_drift_monitor(current: ModelBundle) -> Optional[DriftMonitor]:
+    """Create a drift monitor for a bundle (None if training saved no reference distributions)."""
+    if current.drift_reference is None:
+        print("⚠️  Drift monitor disabled: the transform plan has no reference distributions")
+        return None
+    return DriftMonitor(
+        current.drift_reference,
+        current.version,
+        window_seconds=API_DRIFT_WINDOW_SECONDS,
+        n_buckets=API_DRIFT_BUCKETS,
+        min_rows=API_DRIFT_MIN_ROWS
+    )
+
+
+def drift_score_samples(score: str) -> list:
+    """Per-feature drift scores for /metrics (only features observed in enough rows of the window)."""
+    if drift_monitor is None:
+        return []
+    values = drift_monitor.scores()[score]
+    if values is None:
+        return []
+    return [
+        ((name,), float(value))
+        for name, value in zip(drift_monitor.reference.feature_names, values)
+        if not np.isnan(value)
+    ]
+
+
+async def reload_model() -> tuple:
+    """
+    Load a new model bundle in the background and swap it in atomically.
+    
+    Requests already running keep the bundle they started with.
+    
+    Returns:
+        Tuple of (previous_version, new_version)
+    """
+    global bundle, executor, drift_monitor
+    
+    async with reload_lock:
+        new_bundle = await asyncio.get_running_loop().run_in_executor(None, _load_warm_bundle)
+        previous = bundle
+        bundle = new_bundle
+        if prediction_cache is not None:
+            prediction_cache.clear()
+        # Live traffic is compared with the new model's training distributions
+        if API_DRIFT_MONITOR:
+            drift_monitor = create_drift_monitor(new_bundle)
         
-        with open("data/processed/encoders.pkl", "rb") as f:
-            encoders = pickle.load(f)
+        # Process workers hold their own copy of the model: move to a fresh pool
+        if executor is not None and executor.kind == "process":
+            old_executor = executor
+            executor = create_executor()
+            asyncio.get_running_loop().create_task(old_executor.drain_and_shutdown())
         
-        with open("data/processed/feature_names.pkl", "rb") as f:
-            feature_names = pickle.load(f)
+        previous_version = previous.version if previous is not None else None
+        print(f"🔄 Reloaded model: {previous_version} -> {new_bundle.version}")
+        return previous_version, new_bundle.version
+
+
+async def watch_model_artifacts(interval: float):
+    """Reload the model when its artifact files change on disk."""
+    paths = artifact_paths()
+    current = artifacts_signature(paths)
+    changed = None
+    
+    while True:
+        await asyncio.sleep(interval)
+        signature = artifacts_signature(paths)
+        if signature == current:
+            changed = None
+            continue
         
-        print("✅ Model and artifacts loaded successfully!")
+        # Wait until the files stop changing before loading them
+        if signature != changed:
+            changed = signature
+            continue
         
-    except Exception as e:
-        print(f"❌ Error loading model artifacts: {e}")
-        raise
+        try:
+            await reload_model()
+        except Exception as e:
+            print(f"⚠️  Model reload failed, keeping version {bundle.version}: {e}")
+        current = signature
+        changed = None
+
+
+async def snapshot_feature_store(interval: float):
+    """Periodically write the feature store to disk for fast restarts."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # Copy on the event loop (consistent state), write in a background thread
+            arrays = feature_store.snapshot()
+            await asyncio.get_running_loop().run_in_executor(
+                None, FeatureStore.write_snapshot, arrays, feature_store_snapshot_path()
+            )
+        except Exception as e:
+            print(f"⚠️  Feature store snapshot failed: {e}")
+
+
+def feature_store_snapshot_path() -> Path:
+    """
+    Snapshot file of this process's feature store.
+    
+    Account state is per process, so each pre-forked worker snapshots to its
+    own file, named after its worker index (kept across worker restarts).
+    """
+    index = os.environ.get(WORKER_INDEX_VAR)
+    path = API_FEATURE_STORE_SNAPSHOT_PATH
+    if index is None:
+        return path
+    return path.with_name(f"{path.stem}.worker-{index}{path.suffix}")
+
+
+def create_feature_store() -> FeatureStore:
+    """Create the feature store, restoring the last snapshot if there is one."""
+    store = FeatureStore(
+        max_accounts=API_FEATURE_STORE_MAX_ACCOUNTS,
+        ring_size=API_FEATURE_STORE_RING_SIZE,
+        window_seconds=API_FEATURE_STORE_WINDOW_SECONDS
+    )
+    snapshot_path = feature_store_snapshot_path()
+    if snapshot_path.exists():
+        try:
+            store.load(snapshot_path)
+        except Exception as e:
+            print(f"⚠️  Could not restore feature store snapshot, starting empty: {e}")
+    return store
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Load model on startup."""
-    load_model_artifacts()
+    """Load and warm up the model, then start the executor and background tasks."""
+    global batcher, executor, loop_lag_monitor, reload_lock, model_watcher, prediction_cache, admission, ready
+    global feature_store, feature_snapshotter, audit_log, drift_monitor
+    started = time.perf_counter()
+    # A pre-fork parent may already have loaded the bundle for its workers
+    if bundle is None:
+        load_model_artifacts()
+    reload_lock = asyncio.Lock()
+    
+    executor_started = time.perf_counter()
+    executor = create_executor()
+    await executor.warm_up(inference_worker_ready)
+    startup_phases["executor"] = time.perf_counter() - executor_started
+    print(f"✅ Inference executor: {API_EXECUTOR} ({API_EXECUTOR_WORKERS} workers)")
+    
+    loop_lag_monitor = EventLoopLagMonitor(on_sample=EVENT_LOOP_LAG.observe)
+    loop_lag_monitor.start()
+    
+    if API_MICROBATCH_ENABLED:
+        batcher = MicroBatcher(
+            score_batch,
+            max_batch_size=API_MICROBATCH_MAX_SIZE,
+            max_wait_ms=API_MICROBATCH_MAX_WAIT_MS
+        )
+        batcher.start()
+        print(f"✅ Micro-batching enabled (max size {API_MICROBATCH_MAX_SIZE}, "
+              f"max wait {API_MICROBATCH_MAX_WAIT_MS} ms)")
+    
+    if API_PREDICTION_CACHE_SIZE > 0:
+        prediction_cache = PredictionCache(
+            max_entries=API_PREDICTION_CACHE_SIZE,
+            ttl_seconds=API_PREDICTION_CACHE_TTL
+        )
+        print(f"✅ Prediction cache enabled ({API_PREDICTION_CACHE_SIZE} entries, "
+              f"TTL {API_PREDICTION_CACHE_TTL} s)")
+    
+    if API_ADMISSION_MAX_CONCURRENCY > 0:
+        admission = AdmissionController(
+            max_concurrency=API_ADMISSION_MAX_CONCURRENCY,
+            max_queue=API_ADMISSION_MAX_QUEUE,
+            latency_target=API_ADMISSION_LATENCY_TARGET_MS / 1000,
+            on_queue_time=ADMISSION_QUEUE_TIME.observe
+        )
+        print(f"✅ Admission control enabled ({API_ADMISSION_MAX_CONCURRENCY} in flight, "
+              f"{API_ADMISSION_MAX_QUEUE} queued, {API_ADMISSION_LATENCY_TARGET_MS:.0f} ms target)")
+    
+    if API_FEATURE_STORE:
+        feature_store = create_feature_store()
+        print(f"✅ Feature store enabled ({feature_store.accounts} accounts restored, "
+              f"{feature_store.bytes_per_account} bytes per account, "
+              f"up to {API_FEATURE_STORE_MAX_ACCOUNTS} accounts)")
+        if API_FEATURE_STORE_SNAPSHOT_INTERVAL > 0:
+            feature_snapshotter = asyncio.get_running_loop().create_task(
+                snapshot_feature_store(API_FEATURE_STORE_SNAPSHOT_INTERVAL)
+            )
+    
+    if API_AUDIT_LOG:
+        audit_log = AuditLog(
+            API_AUDIT_LOG_DIR,
+            max_pending_rows=API_AUDIT_MAX_PENDING_ROWS,
+            flush_rows=API_AUDIT_FLUSH_ROWS,
+            flush_interval=API_AUDIT_FLUSH_INTERVAL,
+            backpressure=API_AUDIT_BACKPRESSURE,
+            segment_max_bytes=int(API_AUDIT_SEGMENT_MAX_MB * 2**20),
+            segment_max_age=API_AUDIT_SEGMENT_MAX_AGE,
+            string_columns=AUDIT_STRING_COLUMNS
+        )
+        audit_log.start()
+        print(f"✅ Audit log enabled ({API_AUDIT_LOG_DIR}, backpressure: {API_AUDIT_BACKPRESSURE})")
+    
+    if API_DRIFT_MONITOR:
+        drift_monitor = create_drift_monitor(bundle)
+        if drift_monitor is not None:
+            print(f"✅ Drift monitor enabled (sampling {API_DRIFT_SAMPLE_RATE:.0%} of rows, "
+                  f"{API_DRIFT_WINDOW_SECONDS:.0f} s window, {drift_monitor.stats()['memory_bytes']} bytes)")
+    
+    if API_MODEL_WATCH_INTERVAL > 0:
+        model_watcher = asyncio.get_running_loop().create_task(
+            watch_model_artifacts(API_MODEL_WATCH_INTERVAL)
+        )
+    
+    startup_phases["startup_event"] = time.perf_counter() - started
+    ready = True
+    print("⏱️  Startup: " + ", ".join(f"{phase} {seconds:.3f} s" for phase, seconds in startup_phases.items()))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks on shutdown."""
+    global batcher, executor, loop_lag_monitor, model_watcher, prediction_cache, admission, ready
+    global feature_store, feature_snapshotter, audit_log, drift_monitor
+    ready = False
+    prediction_cache = None
+    admission = None
+    drift_monitor = None
+    if model_watcher is not None:
+        model_watcher.cancel()
+        model_watcher = None
+    
+    if batcher is not None:
+        await batcher.stop()
+        batcher = None
+    
+    if audit_log is not None:
+        await audit_log.stop()
+        audit_log = None
+    
+    if loop_lag_monitor is not None:
+        await loop_lag_monitor.stop()
+        loop_lag_monitor = None
+    
+    if executor is not None:
+        executor.shutdown()
+        executor = None
+    
+    if feature_snapshotter is not None:
+        feature_snapshotter.cancel()
+        feature_snapshotter = None
+    if feature_store is not None:
+        if API_FEATURE_STORE_SNAPSHOT_INTERVAL > 0:
+            try:
+                feature_store.save(feature_store_snapshot_path())
+            except Exception as e:
+                print(f"⚠️  Feature store snapshot failed: {e}")
+        feature_store = None
 
 
 @app.get("/")
@@ -119,6 +548,18 @@ async def root():
             "health": "/health",
             "predict": "/predict",
             "batch_predict": "/batch-predict",
+            "batch_predict_stream": "/batch-predict/stream",
+            "batch_predict_columnar": "/batch-predict/columnar",
+            "reload": "/admin/reload",
+            "batching_stats": "/batching-stats",
+            "executor_stats": "/executor-stats",
+            "cache_stats": "/cache-stats",
+            "admission_stats": "/admission-stats",
+            "feature_store_stats": "/feature-store-stats",
+            "labels": "/labels",
+            "audit_stats": "/audit-stats",
+            "drift_stats": "/drift-stats",
+            "metrics": "/metrics",
             "docs": "/docs"
         }
     }
@@ -127,85 +568,272 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    if model is None:
+    if bundle is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
+    if not ready:
+        raise HTTPException(status_code=503, detail="Warming up")
     
     return {
         "status": "healthy",
-        "model_loaded": model is not None,
-        "scaler_loaded": scaler is not None,
-        "encoders_loaded": encoders is not None
+        "model_loaded": bundle.model is not None or bundle.compiled is not None,
+        "compiled_model_loaded": bundle.compiled is not None,
+        "scaler_fused": bundle.compiled is not None and not bundle.compiled.input_scaled,
+        "early_exit": bundle.compiled is not None and bundle.early_exit_delta is not None,
+        "cascade_screener_loaded": bundle.screener is not None,
+        "scaler_loaded": bundle.scaler is not None or bundle.bundle_path is not None,
+        "encoders_loaded": bundle.encoders is not None,
+        "model_version": bundle.version,
+        "worker": {"pid": os.getpid(), "memory_bytes": process_memory()},
+        "startup_seconds": startup_phases
     }
 
 
+def transaction_columns(transactions: List[Transaction], current: ModelBundle) -> Dict[str, list]:
+    """Gather each raw input field the transform plan knows about as one column."""
+    columns = {
+        name: [getattr(t, name) for t in transactions]
+        for name in current.transform_plan.feature_names
+        if name in Transaction.model_fields
+    }
+    if feature_store is not None:
+        columns.update(account_feature_columns(transactions, current))
+    return columns
+
+
+def account_feature_columns(transactions: List[Transaction], current: ModelBundle) -> Dict[str, list]:
+    """
+    Look up history features for transactions with an account_id and record them.
+    
+    Rows without an account get None, which the transform plan imputes.
+    """
+    names = [name for name in FEATURE_NAMES if name in current.transform_plan.feature_names]
+    if not names or all(t.account_id is None for t in transactions):
+        return {}
+    
+    columns = {name: [None] * len(transactions) for name in names}
+    for i, t in enumerate(transactions):
+        if t.account_id is None:
+            continue
+        features = feature_store.update(
+            t.account_id, t.amount, t.timestamp, t.latitude, t.longitude, t.account_opened_at
+        )
+        for name in names:
+            columns[name][i] = features[name]
+    return columns
+
+
+def preprocess_transactions(transactions: List[Transaction]) -> np.ndarray:
+    """Preprocess a batch of transactions into a single scaled feature matrix."""
+    current = bundle
+    return current.transform_plan.transform_columns(
+        transaction_columns(transactions, current), len(transactions)
+    )
+
+
 def preprocess_transaction(transaction: Transaction) -> np.ndarray:
     """Preprocess transaction data for prediction."""
-    # Create feature dictionary
-    features = {
-        'amount': transaction.amount,
-        'merchant_category': transaction.merchant_category,
-        'time_of_day': transaction.time_of_day,
-        'location': transaction.location,
-        'transaction_type': transaction.transaction_type
-    }
+    return preprocess_transactions([transaction])
+
+
+def confidence_levels(fraud_probs: np.ndarray) -> np.ndarray:
+    """Bucket fraud probabilities into low/medium/high confidence levels."""
+    return np.where(
+        (fraud_probs < 0.3) | (fraud_probs > 0.7),
+        "high",
+        np.where((fraud_probs < 0.4) | (fraud_probs > 0.6), "medium", "low")
+    )
+
+
+def init_inference_worker():
+    """Load the model once in a process-pool worker unless it was inherited by fork."""
+    if bundle is None:
+        load_model_artifacts()
+
+
+def inference_worker_ready() -> int:
+    """No-op run on every executor worker at startup so each one is started and initialized."""
+    return os.getpid()
+
+
+def predict_fraud_probabilities(
+    columns: Dict[str, list], n_rows: int, current: ModelBundle = None, drift_sample_rate: float = 0.0
+) -> tuple:
+    """
+    Encode, scale and score a batch of raw columns (runs on the inference executor).
     
-    # Encode categorical features
-    encoded_features = []
-    for feature_name in feature_names:
-        if feature_name == 'amount':
-            encoded_features.append(features['amount'])
-        else:
-            # Extract the original feature name from encoded feature name
-            # e.g., 'merchant_category_grocery' -> 'merchant_category'
-            for orig_feature in ['merchant_category', 'time_of_day', 'location', 'transaction_type']:
-                if feature_name.startswith(orig_feature):
-                    value = features[orig_feature]
-                    # Check if this is the matching encoded feature
-                    expected_name = f"{orig_feature}_{value}"
-                    encoded_features.append(1.0 if feature_name == expected_name else 0.0)
-                    break
+    Process workers are called without a bundle and use the one they loaded.
+    With a drift_sample_rate, a sample of the rows, encoded without imputation,
+    is returned for the drift monitor.
+    
+    Returns:
+        Tuple of (fraud_probabilities, model_version, stage_times, sampled rows or None)
+    """
+    current = current or bundle
+    stage_times = {}
+    drift_sample = {} if drift_sample_rate > 0 else None
+    fraud_probs = current.score_columns(columns, n_rows, stage_times, drift_sample, drift_sample_rate)
+    return fraud_probs, current.version, stage_times, (drift_sample or {}).get("rows")
+
+
+async def run_inference(columns: Dict[str, list], n_rows: int, current: ModelBundle) -> tuple:
+    """
+    Score columns on the inference executor and record the stage latencies.
+    
+    Returns:
+        Tuple of (fraud_probabilities, model_version)
+    """
+    started = time.perf_counter()
+    sample_rate = API_DRIFT_SAMPLE_RATE if drift_monitor is not None else 0.0
+    if executor is None:
+        fraud_probs, version, stage_times, drift_rows = predict_fraud_probabilities(
+            columns, n_rows, current, sample_rate
+        )
+    else:
+        fraud_probs, version, stage_times, drift_rows = await executor.run(
+            predict_fraud_probabilities, columns, n_rows,
+            None if executor.kind == "process" else current, sample_rate
+        )
+    STAGE_INFERENCE.observe(time.perf_counter() - started)
+    STAGE_TRANSFORM.observe(stage_times["transform"])
+    STAGE_PREDICT.observe(stage_times["predict"])
+    if drift_rows is not None and drift_monitor is not None:
+        drift_monitor.add(drift_rows, version)
+    return fraud_probs, version
+
+
+class ScoredBatch(NamedTuple):
+    """Scores of a batch of transactions."""
+    fraud_probs: np.ndarray
+    is_fraud: np.ndarray
+    confidence: np.ndarray
+    model_version: str
+
+
+async def score_transactions(transactions: List[Transaction], source: str = "batch") -> ScoredBatch:
+    """Score a batch of transactions with a single model call (source labels the batch-size metric)."""
+    # Pin the bundle so the whole request is served by one model version
+    current = bundle
+    metrics.BATCH_SIZE.observe(len(transactions), source)
+    started = time.perf_counter()
+    columns = transaction_columns(transactions, current)
+    STAGE_COLUMNS.observe(time.perf_counter() - started)
     
-    # Convert to numpy array and reshape
-    X = np.array(encoded_features).reshape(1, -1)
+    # Make predictions for the whole batch at once, off the event loop
+    fraud_probs, version = await run_inference(columns, len(transactions), current)
     
-    # Scale features
-    X_scaled = scaler.transform(X)
+    started = time.perf_counter()
+    is_fraud = fraud_probs > FRAUD_THRESHOLD
+    confidence = confidence_levels(fraud_probs)
+    STAGE_POSTPROCESS.observe(time.perf_counter() - started)
     
-    return X_scaled
+    scored = ScoredBatch(fraud_probs, is_fraud, confidence, version)
+    if audit_log is not None:
+        record = {name: [getattr(t, name) for t in transactions] for name in Transaction.model_fields}
+        record.update(columns)
+        await audit_log.record(audit_record(record, scored, source), len(transactions))
+    return scored
+
+
+# Audit columns kept as strings: the string fields of a transaction (ids must
+# not be read back as numbers) and the labels added by audit_record
+AUDIT_STRING_COLUMNS = tuple(
+    name for name, field in Transaction.model_fields.items() if field.annotation in (str, Optional[str])
+) + ("source", "model_version")
+
+
+def audit_record(
+    columns: Dict[str, Sequence], scored: ScoredBatch, source: str, cached: bool = False
+) -> Dict[str, Sequence]:
+    """Add the scoring outcome to a batch's input columns for the audit log."""
+    n_rows = len(scored.fraud_probs)
+    return {
+        "scored_at": np.full(n_rows, time.time()),
+        "source": [source] * n_rows,
+        "cached": np.full(n_rows, cached),
+        "model_version": [scored.model_version] * n_rows,
+        **columns,
+        "fraud_probability": scored.fraud_probs,
+        "is_fraud": scored.is_fraud
+    }
+
+
+def build_responses(scored: ScoredBatch) -> List[PredictionResponse]:
+    """Convert scored arrays into prediction responses."""
+    started = time.perf_counter()
+    responses = [
+        PredictionResponse(
+            is_fraud=fraud, fraud_probability=prob, confidence=level, model_version=scored.model_version
+        )
+        for fraud, prob, level in zip(
+            scored.is_fraud.tolist(), scored.fraud_probs.tolist(), scored.confidence.tolist()
+        )
+    ]
+    STAGE_BUILD_RESPONSES.observe(time.perf_counter() - started)
+    return responses
+
+
+def admission_slot():
+    """Scoring slot from the admission controller (a no-op context when it is disabled)."""
+    return admission.admit() if admission is not None else contextlib.nullcontext()
+
+
+async def score_batch(transactions: List[Transaction]) -> List[PredictionResponse]:
+    """Score a micro-batch of single-transaction requests."""
+    return build_responses(await score_transactions(transactions, source="microbatch"))
 
 
 @app.post("/predict", response_model=PredictionResponse)
-async def predict(transaction: Transaction):
+async def predict(transaction: Transaction, request: Request):
     """Predict fraud for a single transaction."""
-    if model is None:
+    metrics.handler_started(request.scope)
+    if bundle is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
     
     try:
-        # Preprocess transaction
-        X = preprocess_transaction(transaction)
-        
-        # Make prediction
-        fraud_prob = model.predict_proba(X)[0][1]
-        is_fraud = bool(fraud_prob > 0.5)
-        
-        # Determine confidence level
-        if fraud_prob < 0.3 or fraud_prob > 0.7:
-            confidence = "high"
-        elif fraud_prob < 0.4 or fraud_prob > 0.6:
-            confidence = "medium"
+        # An account's features change with every transaction it sends, so
+        # identical requests for an account are not repeats of one prediction
+        if prediction_cache is None or transaction.account_id is not None:
+            response = await predict_uncached(transaction)
         else:
-            confidence = "low"
-        
-        return PredictionResponse(
-            is_fraud=is_fraud,
-            fraud_probability=float(fraud_prob),
-            confidence=confidence
-        )
+            computed = False
+
+            async def compute():
+                nonlocal computed
+                computed = True
+                return await predict_uncached(transaction)
+
+            key = transaction_key(transaction.model_dump(), bundle.version)
+            response = await prediction_cache.get_or_compute(key, compute)
+            if not computed and audit_log is not None:
+                await audit_cached_prediction(transaction, response)
+        metrics.handler_finished(request.scope)
+        return response
         
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
 
+async def audit_cached_prediction(transaction: Transaction, response: PredictionResponse):
+    """Record a prediction answered from the cache (or by an identical in-flight request)."""
+    scored = ScoredBatch(
+        np.array([response.fraud_probability]), np.array([response.is_fraud]),
+        np.array([response.confidence]), response.model_version
+    )
+    record = {name: [getattr(transaction, name)] for name in Transaction.model_fields}
+    await audit_log.record(audit_record(record, scored, "predict", cached=True), 1)
+
+
+async def predict_uncached(transaction: Transaction) -> PredictionResponse:
+    """Score one transaction, through the micro-batcher when enabled."""
+    async with admission_slot():
+        if batcher is not None:
+            return await batcher.submit(transaction)
+        scored = await score_transactions([transaction], source="predict")
+    return build_responses(scored)[0]
+
+
 class BatchTransactions(BaseModel):
     """Batch transactions input schema."""
     transactions: List[Transaction]
@@ -217,49 +845,345 @@ class BatchPredictionResponse(BaseModel):
     total_transactions: int
     fraud_count: int
     fraud_percentage: float
+    model_version: str
 
 
 @app.post("/batch-predict", response_model=BatchPredictionResponse)
-async def batch_predict(batch: BatchTransactions):
+async def batch_predict(batch: BatchTransactions, request: Request):
     """Predict fraud for multiple transactions."""
-    if model is None:
+    metrics.handler_started(request.scope)
+    if bundle is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
     
     try:
-        predictions = []
-        fraud_count = 0
+        total = len(batch.transactions)
+        if total == 0:
+            return BatchPredictionResponse(
+                predictions=[], total_transactions=0, fraud_count=0, fraud_percentage=0,
+                model_version=bundle.version
+            )
         
-        for transaction in batch.transactions:
-            result = await predict(transaction)
-            predictions.append(result)
-            if result.is_fraud:
-                fraud_count += 1
+        async with admission_slot():
+            scored = await score_transactions(batch.transactions, source="batch")
+        predictions = build_responses(scored)
+        fraud_count = int(scored.is_fraud.sum())
         
-        total = len(batch.transactions)
-        fraud_pct = (fraud_count / total * 100) if total > 0 else 0
+        fraud_pct = fraud_count / total * 100
         
-        return BatchPredictionResponse(
+        response = BatchPredictionResponse(
             predictions=predictions,
             total_transactions=total,
             fraud_count=fraud_count,
-            fraud_percentage=round(fraud_pct, 2)
+            fraud_percentage=round(fraud_pct, 2),
+            model_version=scored.model_version
+        )
+        metrics.handler_finished(request.scope)
+        return response
+        
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch prediction error: {str(e)}")
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    Streaming response produced while the request body is still being read.
+    
+    Starlette's StreamingResponse watches for client disconnects by reading
+    from the request channel, which would swallow body chunks the generator
+    still needs. A disconnect surfaces through ``request.stream()`` instead.
+    """
+    
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def read_ndjson_lines(request: Request) -> AsyncIterator[bytes]:
+    """Yield the lines of an NDJSON request body as they arrive."""
+    buffer = b""
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+async def stream_predictions(request: Request, chunk_size: int) -> AsyncIterator[bytes]:
+    """Score an NDJSON body in fixed-size chunks, yielding NDJSON results and a summary."""
+    total = 0
+    fraud_count = 0
+    errors = 0
+    versions = set()
+    chunk: List[Transaction] = []
+    
+    async def flush() -> bytes:
+        nonlocal total, fraud_count
+        scored = await score_transactions(chunk, source="stream")
+        total += len(chunk)
+        fraud_count += int(scored.is_fraud.sum())
+        versions.add(scored.model_version)
+        chunk.clear()
+        return "".join(
+            json.dumps(response.model_dump()) + "\n" for response in build_responses(scored)
+        ).encode()
+    
+    line_number = 0
+    async for line in read_ndjson_lines(request):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            chunk.append(Transaction.model_validate_json(line))
+        except ValidationError as e:
+            # Keep results aligned with the input: flush what came before the bad line
+            if chunk:
+                yield await flush()
+            errors += 1
+            # The input of a line that is not JSON is raw bytes: leave it out
+            error = {
+                "line": line_number,
+                "errors": e.errors(include_url=False, include_context=False, include_input=False)
+            }
+            yield (json.dumps(error) + "\n").encode()
+            continue
+        
+        if len(chunk) >= chunk_size:
+            yield await flush()
+    
+    if chunk:
+        yield await flush()
+    
+    summary = {
+        "total_transactions": total,
+        "fraud_count": fraud_count,
+        "fraud_percentage": round(fraud_count / total * 100, 2) if total else 0.0,
+        "invalid_lines": errors,
+        "model_versions": sorted(versions)
+    }
+    yield (json.dumps({"summary": summary}) + "\n").encode()
+
+
+@app.post("/batch-predict/stream")
+async def batch_predict_stream(request: Request):
+    """
+    Predict fraud for a newline-delimited JSON stream of transactions.
+    
+    The body is parsed incrementally and scored in fixed-size chunks, and the
+    results are streamed back as NDJSON followed by a summary record, so
+    memory use does not depend on the number of transactions.
+    """
+    if bundle is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    # Shed before streaming starts; chunks are then bounded by the executor
+    if admission is not None:
+        admission.check()
+    
+    return RequestStreamingResponse(
+        stream_predictions(request, API_STREAM_CHUNK_SIZE),
+        media_type="application/x-ndjson"
+    )
+
+
+@app.post("/batch-predict/columnar")
+async def batch_predict_columnar(request: Request):
+    """
+    Predict fraud for a bulk batch sent as Arrow IPC or raw column buffers.
+    
+    Columns are mapped directly into NumPy arrays (no per-row objects) and the
+    fraud probabilities are returned in the same columnar format.
+    """
+    current = bundle
+    if current is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in (RAW_CONTENT_TYPE, ARROW_CONTENT_TYPE):
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported content type, expected {RAW_CONTENT_TYPE} or {ARROW_CONTENT_TYPE}"
+        )
+    
+    body = await request.body()
+    try:
+        if content_type == ARROW_CONTENT_TYPE:
+            columns, n_rows = decode_arrow_columns(body, current.transform_plan)
+        else:
+            columns, n_rows = decode_raw_columns(body, current.transform_plan)
+    except ImportError:
+        raise HTTPException(status_code=415, detail="Arrow input requires pyarrow to be installed")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid columnar payload: {str(e)}")
+    
+    try:
+        metrics.BATCH_SIZE.observe(n_rows, "columnar")
+        async with admission_slot():
+            fraud_probs, version = await run_inference(columns, n_rows, current)
+        
+        results = {
+            "fraud_probability": fraud_probs,
+            "is_fraud": (fraud_probs > FRAUD_THRESHOLD).astype(np.uint8)
+        }
+        if audit_log is not None:
+            scored = ScoredBatch(fraud_probs, results["is_fraud"].astype(bool), None, version)
+            await audit_log.record(audit_record(columns, scored, "columnar"), n_rows)
+        encode = encode_arrow_columns if content_type == ARROW_CONTENT_TYPE else encode_raw_columns
+        
+        return Response(
+            content=encode(results),
+            media_type=content_type,
+            headers={"X-Model-Version": version}
         )
         
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch prediction error: {str(e)}")
 
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Expose request, stage and runtime metrics in Prometheus text format."""
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/batching-stats")
+async def batching_stats():
+    """Get micro-batching statistics."""
+    if batcher is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **batcher.stats()}
+
+
+@app.get("/cache-stats")
+async def cache_stats():
+    """Get prediction cache statistics."""
+    if prediction_cache is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **prediction_cache.stats()}
+
+
+@app.get("/admission-stats")
+async def admission_stats():
+    """Get admission control statistics."""
+    if admission is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **admission.stats()}
+
+
+@app.get("/feature-store-stats")
+async def feature_store_stats():
+    """Get feature store usage and memory statistics."""
+    if feature_store is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **feature_store.stats()}
+
+
+@app.get("/features/{account_id}")
+async def account_features(account_id: str):
+    """Get the rolling aggregates the feature store holds for one account."""
+    if feature_store is None:
+        raise HTTPException(status_code=404, detail="Feature store is disabled")
+    
+    state = feature_store.account_state(account_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Unknown account '{account_id}'")
+    return {"account_id": account_id, **state}
+
+
+class FraudLabel(BaseModel):
+    """Confirmed outcome of a past transaction (chargeback, analyst review)."""
+    account_id: str = Field(..., description="Account the transaction belonged to", example="acct-1042")
+    is_fraud: bool = Field(..., description="Whether the transaction was confirmed fraudulent")
+
+
+class LabelBatch(BaseModel):
+    """Batch of fraud labels."""
+    labels: List[FraudLabel]
+
+
+@app.post("/labels")
+async def record_labels(batch: LabelBatch):
+    """Record confirmed fraud labels for the accounts' previous_fraud_rate."""
+    if feature_store is None:
+        raise HTTPException(status_code=404, detail="Feature store is disabled")
+    
+    recorded = feature_store.record_labels(
+        [label.account_id for label in batch.labels], [label.is_fraud for label in batch.labels]
+    )
+    return {"received": len(batch.labels), "recorded": recorded}
+
+
+@app.get("/audit-stats")
+async def audit_stats():
+    """Get audit log statistics."""
+    if audit_log is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **audit_log.stats()}
+
+
+@app.get("/drift-stats")
+async def drift_stats():
+    """Get per-feature drift scores of recent traffic against the training distributions."""
+    if drift_monitor is None:
+        return {"enabled": False}
+
+    return {"enabled": True, **drift_monitor.report(), "monitor": drift_monitor.stats()}
+
+
+@app.get("/executor-stats")
+async def executor_stats():
+    """Get inference executor and event-loop lag statistics."""
+    return {
+        "executor": executor.stats() if executor is not None else None,
+        "event_loop_lag": loop_lag_monitor.stats() if loop_lag_monitor is not None else None
+    }
+
+
 @app.get("/model-info")
 async def model_info():
     """Get model information."""
-    if model is None:
+    if bundle is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
     
+    current = bundle
+    return {
+        "model_type": current.model_type,
+        "compiled_model": current.compiled is not None,
+        "cascade_screener": {
+            "low_cutoff": current.screener.low_cutoff,
+            "high_cutoff": current.screener.high_cutoff
+        } if current.screener is not None else None,
+        "model_version": current.version,
+        "model_path": current.model_path,
+        "bundle_path": current.bundle_path,
+        "n_features": len(current.feature_names),
+        "feature_names": current.feature_names,
+        "categorical_features": list(current.encoders.keys()) if current.encoders else []
+    }
+
+
+@app.post("/admin/reload")
+async def admin_reload():
+    """Load the latest model artifacts and swap them in without downtime."""
+    try:
+        previous_version, new_version = await reload_model()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model reload error: {str(e)}")
+    
     return {
-        "model_type": type(model).__name__,
-        "n_features": len(feature_names),
-        "feature_names": feature_names,
-        "categorical_features": list(encoders.keys()) if encoders else []
+        "status": "reloaded",
+        "previous_version": previous_version,
+        "model_version": new_version
     }
 
 
@@ -0,0 +1,443 @@
+"""Loading of the model bundle served by the API.
+
+The model, scaler, encoders, feature names and compiled transform plan are
+loaded together into one immutable :class:`ModelBundle`. The API swaps the
+whole bundle atomically on reload, so a request that started on one model
+version finishes on it.
+
+When training saved a compiled forest next to the pickled model
+(``<model>_compiled.npz``), small batches are scored with the array-backed
+engine and large batches with scikit-learn (``engine="auto"``), or every
+batch is scored by the compiled engine without loading scikit-learn at all
+(``engine="compiled"``). A fused forest (``<model>_fused.npz``) with the
+scaler folded into its thresholds is preferred when present, so requests
+served by the compiled engine skip feature scaling. The compiled engine can
+optionally retire rows early once their decision is settled (early exit).
+
+A single-file bundle (``<model>.fdb``, see :mod:`src.models.bundle_format`)
+replaces the pickles when present: its arrays are memory-mapped, so loading
+is near-instant and processes serving the same file share its pages. In
+``auto`` mode the pickled forest is then only unpickled by the first batch
+too large for the compiled engine, so workers that never see one never pay
+for a private copy of it.
+
+With ``cascade=True`` a linear screener (``<model>_screener.npz``) answers
+clear-cut rows and only the ambiguous ones reach the forest.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.data.drift_reference import DriftReference
+from src.data.transform_plan import (
+    PLAN_FILENAME, CompiledTransformPlan, build_transform_plan, load_transform_plan
+)
+from src.models.bundle_format import BUNDLE_SUFFIX, load_model_bundle_file
+from src.models.compiled_forest import DECISION_BOUNDARIES, CompiledForest
+from src.models.screener import LinearScreener
+
+# Candidate model files, in order of preference
+MODEL_PATHS = [
+    "models/fraud_detection_model.pkl",
+    "models/fraud_detector.pkl"
+]
+PROCESSED_DIR = "data/processed"
+MODEL_ENGINES = ("auto", "compiled", "sklearn")
+
+
+
+class LazyModel:
+    """A pickled model unpickled by its first use, once across executor threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self):
+        """The model, unpickling it on first use."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    started = time.perf_counter()
+                    self._model = _load_pickled_model(self.path)
+                    print(f"✅ Loaded {self.path} for large batches ({time.perf_counter() - started:.2f} s)")
+        return self._model
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """Immutable set of artifacts needed to score transactions."""
+    model: Optional[object]
+    compiled: Optional[CompiledForest]
+    scaler: Optional[object]
+    encoders: dict
+    feature_names: List[str]
+    transform_plan: CompiledTransformPlan
+    version: str
+    model_path: str
+    compiled_max_rows: int = 512
+    early_exit_delta: Optional[float] = None
+    early_exit_block_trees: int = 25
+    decision_boundaries: Tuple[float, ...] = DECISION_BOUNDARIES
+    screener: Optional[LinearScreener] = None
+    bundle_path: Optional[str] = None
+    drift_reference: Optional[DriftReference] = None
+    # Pickled model unpickled on the first batch over compiled_max_rows (model is None)
+    lazy_model: Optional[LazyModel] = None
+    loaded_at: float = field(default_factory=time.time)
+
+    @property
+    def model_type(self) -> str:
+        return type(self.model if self.model is not None else self.compiled).__name__
+
+    @property
+    def sklearn_loaded(self) -> bool:
+        """Whether the scikit-learn model is in memory (a deferred one once a large batch loaded it)."""
+        return self.model is not None or (self.lazy_model is not None and self.lazy_model.loaded)
+
+    def score_columns(
+        self,
+        columns: Dict[str, Sequence],
+        n_rows: int,
+        stage_times: Optional[dict] = None,
+        drift_sample: Optional[dict] = None,
+        drift_sample_rate: float = 1.0
+    ) -> np.ndarray:
+        """
+        Encode raw columns and return the fraud probability of each row.
+
+        When stage_times is given, the transform and predict durations (seconds)
+        are stored in it. When drift_sample is given and the bundle carries
+        reference distributions, a drift_sample_rate sample of the rows is
+        stored in it under "rows" (None if no row was sampled), encoded in raw
+        units with missing values left as NaN.
+        """
+        started = time.perf_counter()
+        self._sample(columns, n_rows, drift_sample, drift_sample_rate)
+        if self.screener is None:
+            use_compiled = self._use_compiled(n_rows)
+            X = self.transform_plan.transform_columns(columns, n_rows, scale=self._forest_scaled(use_compiled))
+            transformed = time.perf_counter()
+            proba = self._score_forest(X, use_compiled)
+        else:
+            # Cascade: the raw-unit screener answers clear-cut rows, the forest the rest
+            X = self.transform_plan.transform_columns(columns, n_rows, scale=False)
+            transformed = time.perf_counter()
+            proba, ambiguous = self.screener.screen(X)
+            n_ambiguous = int(ambiguous.sum())
+            if n_ambiguous:
+                use_compiled = self._use_compiled(n_ambiguous)
+                X_forest = X[ambiguous]
+                if self._forest_scaled(use_compiled):
+                    self.transform_plan.scale_features(X_forest)
+                proba[ambiguous] = self._score_forest(X_forest, use_compiled)
+
+        if stage_times is not None:
+            stage_times["transform"] = transformed - started
+            stage_times["predict"] = time.perf_counter() - transformed
+        return proba
+
+    def _sample(self, columns: Dict[str, Sequence], n_rows: int, drift_sample: Optional[dict], sample_rate: float):
+        if drift_sample is None or self.drift_reference is None:
+            return
+        index = self.drift_reference.sample_index(n_rows, sample_rate)
+        if index is None:
+            drift_sample["rows"] = None
+            return
+        # Imputed values would pile up in one bin and look like drift: leave them out
+        sampled = {name: _take(values, index) for name, values in columns.items()}
+        drift_sample["rows"] = self.transform_plan.transform_columns(sampled, len(index), scale=False, impute=False)
+
+    def _use_compiled(self, n_rows: int) -> bool:
+        has_sklearn = self.model is not None or self.lazy_model is not None
+        return self.compiled is not None and (not has_sklearn or n_rows <= self.compiled_max_rows)
+
+    def _sklearn_model(self):
+        """The scikit-learn model, unpickling it on first use when it was deferred."""
+        return self.model if self.model is not None else self.lazy_model.get()
+
+    def _forest_scaled(self, use_compiled: bool) -> bool:
+        # A fused forest takes raw features: no scaling pass needed
+        return not use_compiled or self.compiled.input_scaled
+
+    def _score_forest(self, X: np.ndarray, use_compiled: bool) -> np.ndarray:
+        if not use_compiled:
+            return self._sklearn_model().predict_proba(X)[:, 1]
+        if self.early_exit_delta is not None:
+            return self.compiled.predict_fraud_proba_early_exit(
+                X, self.decision_boundaries, self.early_exit_block_trees, self.early_exit_delta
+            )[0]
+        return self.compiled.predict_fraud_proba(X)
+
+
+def _take(values: Sequence, index: np.ndarray) -> Sequence:
+    """Rows of one raw column (a list or a NumPy array) at the given positions."""
+    if isinstance(values, np.ndarray):
+        return values[index]
+    return [values[i] for i in index]
+
+
+def _load_pickled_model(model_path: str):
+    """Load a model with pickle, falling back to joblib."""
+    with open(model_path, "rb") as f:
+        try:
+            return pickle.load(f)
+        except Exception:
+            # Try with joblib if pickle fails
+            import joblib
+            f.seek(0)
+            return joblib.load(f)
+
+
+def _files_digest(paths: List[str]) -> str:
+    """Short content hash of the model files, used as the model version."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def compiled_model_path(model_path: str) -> str:
+    """Path of the compiled forest saved next to a pickled model."""
+    return os.path.splitext(model_path)[0] + "_compiled.npz"
+
+
+def fused_model_path(model_path: str) -> str:
+    """Path of the scaler-fused compiled forest saved next to a pickled model."""
+    return os.path.splitext(model_path)[0] + "_fused.npz"
+
+
+def screener_model_path(model_path: str) -> str:
+    """Path of the cascade screener saved next to a pickled model."""
+    return os.path.splitext(model_path)[0] + "_screener.npz"
+
+
+def bundle_file_path(model_path: str) -> str:
+    """Path of the single-file model bundle saved next to a pickled model."""
+    return os.path.splitext(model_path)[0] + BUNDLE_SUFFIX
+
+
+def _compiled_candidate(model_path: str) -> Optional[str]:
+    """Compiled forest to serve for a model, preferring the fused one."""
+    for path in (fused_model_path(model_path), compiled_model_path(model_path)):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def artifact_paths(model_paths: List[str] = None, processed_dir: str = PROCESSED_DIR) -> List[str]:
+    """All files a bundle is loaded from (used to detect new deployments)."""
+    model_paths = list(model_paths or MODEL_PATHS)
+    return model_paths + [compiled_model_path(p) for p in model_paths] + [
+        fused_model_path(p) for p in model_paths
+    ] + [screener_model_path(p) for p in model_paths] + [bundle_file_path(p) for p in model_paths] + [
+        os.path.join(processed_dir, name)
+        for name in ("scaler.pkl", "encoders.pkl", "feature_names.pkl", PLAN_FILENAME)
+    ]
+
+
+def artifacts_signature(paths: List[str]) -> Tuple:
+    """Modification time and size of every existing artifact file."""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def load_model_bundle(
+    model_paths: List[str] = None,
+    processed_dir: str = PROCESSED_DIR,
+    engine: str = "auto",
+    compiled_max_rows: int = 512,
+    early_exit_delta: Optional[float] = None,
+    early_exit_block_trees: int = 25,
+    decision_boundaries: Tuple[float, ...] = DECISION_BOUNDARIES,
+    cascade: bool = False
+) -> ModelBundle:
+    """
+    Load the model and preprocessing artifacts into a bundle.
+
+    Args:
+        model_paths: Candidate model files, tried in order
+        processed_dir: Directory holding the preprocessing artifacts
+        engine: 'auto', 'compiled' (no scikit-learn at inference) or 'sklearn'
+        compiled_max_rows: Largest batch scored by the compiled engine in 'auto' mode
+        early_exit_delta: Enables early exit in the compiled engine with this confidence parameter
+        early_exit_block_trees: Trees evaluated between early-exit checks
+        decision_boundaries: Probabilities where the served decision or confidence bucket changes
+        cascade: Screen rows with the saved linear screener before the forest
+
+    Returns:
+        Loaded model bundle
+    """
+    if engine not in MODEL_ENGINES:
+        raise ValueError(f"Unknown model engine '{engine}', expected one of {MODEL_ENGINES}")
+
+    serving = dict(
+        compiled_max_rows=compiled_max_rows,
+        early_exit_delta=early_exit_delta,
+        early_exit_block_trees=early_exit_block_trees,
+        decision_boundaries=tuple(decision_boundaries)
+    )
+
+    # A single-file bundle replaces the compiled forest and preprocessing pickles
+    if engine != "sklearn":
+        for candidate in model_paths or MODEL_PATHS:
+            bundle_path = bundle_file_path(candidate)
+            if not os.path.exists(bundle_path):
+                continue
+            try:
+                return _load_from_bundle_file(candidate, bundle_path, engine, cascade, serving)
+            except Exception as e:
+                print(f"⚠️  Failed to load {bundle_path}: {e}")
+
+    model = None
+    compiled = None
+    model_path = None
+    compiled_path = None
+    for candidate in model_paths or MODEL_PATHS:
+        compiled_path = _compiled_candidate(candidate) if engine != "sklearn" else None
+        if engine == "compiled" and compiled_path is None:
+            continue
+        if not os.path.exists(candidate) and compiled_path is None:
+            continue
+        try:
+            if engine != "compiled":
+                model = _load_pickled_model(candidate)
+            if compiled_path is not None:
+                compiled = CompiledForest.load(compiled_path)
+            model_path = candidate
+            print(f"✅ Loaded model from: {candidate}" + (f" ({compiled_path})" if compiled_path else ""))
+            break
+        except Exception as e:
+            print(f"⚠️  Failed to load {candidate}: {e}")
+            model = compiled = None
+            continue
+
+    if model is None and compiled is None:
+        raise Exception("No valid model file found")
+
+    version_files = ([model_path] if model is not None else []) + (
+        [compiled_path] if compiled is not None else []
+    )
+
+    screener = None
+    screener_path = screener_model_path(model_path)
+    if cascade and os.path.exists(screener_path):
+        screener = LinearScreener.load(screener_path)
+        version_files.append(screener_path)
+        print(f"✅ Loaded cascade screener from: {screener_path}")
+
+    # Load preprocessing artifacts
+    with open(os.path.join(processed_dir, "scaler.pkl"), "rb") as f:
+        scaler = pickle.load(f)
+
+    with open(os.path.join(processed_dir, "encoders.pkl"), "rb") as f:
+        encoders = pickle.load(f)
+
+    with open(os.path.join(processed_dir, "feature_names.pkl"), "rb") as f:
+        feature_names = pickle.load(f)
+
+    # Compile the transform plan emitted by training (or derive it from older artifacts)
+    plan_path = os.path.join(processed_dir, PLAN_FILENAME)
+    if os.path.exists(plan_path):
+        plan = load_transform_plan(plan_path)
+    else:
+        plan = build_transform_plan(feature_names, encoders, scaler)
+    transform_plan = CompiledTransformPlan(plan)
+
+    # The bundle runs the screener on raw features, ahead of any scaling
+    if screener is not None and screener.input_scaled:
+        screener = screener.fuse_scaler(transform_plan.mean, transform_plan.scale)
+
+    return ModelBundle(
+        model=model,
+        compiled=compiled,
+        scaler=scaler,
+        encoders=encoders,
+        feature_names=feature_names,
+        transform_plan=transform_plan,
+        version=_files_digest(version_files),
+        model_path=model_path,
+        screener=screener,
+        drift_reference=DriftReference.from_plan(plan),
+        **serving
+    )
+
+
+def _load_from_bundle_file(model_path: str, bundle_path: str, engine: str, cascade: bool, serving: dict) -> ModelBundle:
+    """Build a ModelBundle from a memory-mapped bundle file (plus, lazily, the pickle for large batches in 'auto')."""
+    compiled, plan, screener, checksum = load_model_bundle_file(bundle_path)
+    transform_plan = CompiledTransformPlan(plan)
+
+    # The checksum already covers the bundle: hashing the pickle too would read it on every load
+    lazy_model = None
+    if engine == "auto" and os.path.exists(model_path):
+        lazy_model = LazyModel(model_path)
+
+    if not cascade:
+        screener = None
+    elif screener is not None and screener.input_scaled:
+        screener = screener.fuse_scaler(transform_plan.mean, transform_plan.scale)
+
+    print(f"✅ Loaded model bundle from: {bundle_path}" + (
+        f" ({model_path} is loaded by the first batch over {serving['compiled_max_rows']} rows)"
+        if lazy_model is not None else ""
+    ))
+    return ModelBundle(
+        model=None,
+        compiled=compiled,
+        scaler=None,
+        encoders={name: table.sorted_categories.tolist() for name, table in transform_plan.categorical.items()},
+        feature_names=transform_plan.feature_names,
+        transform_plan=transform_plan,
+        version=checksum[:12],
+        model_path=model_path,
+        screener=screener,
+        bundle_path=bundle_path,
+        drift_reference=DriftReference.from_plan(plan),
+        lazy_model=lazy_model,
+        **serving
+    )
+
+
+def warm_up_bundle(bundle: ModelBundle, n_rows: int = 64) -> float:
+    """
+    Run a synthetic batch through the bundle so first-call costs are paid up front.
+
+    Returns:
+        Warm-up duration in seconds
+    """
+    started = time.perf_counter()
+    plan = bundle.transform_plan
+    sizes = [n_rows]
+    if bundle.model is not None and bundle.compiled is not None:
+        # Warm up the large-batch engine as well (a deferred pickle stays deferred)
+        sizes.append(bundle.compiled_max_rows + 1)
+
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        columns = {
+            name: plan.mean[j] + plan.scale[j] * rng.normal(size=size)
+            for j, name in zip(plan.numeric_index, plan.numeric_names)
+        }
+        bundle.score_columns(columns, size)
+    return time.perf_counter() - started
@@ -0,0 +1,380 @@
+"""Non-blocking audit log of every scored transaction.
+
+Request handlers hand each scored batch (its input columns, fraud
+probabilities and model version) to :class:`AuditLog`, which only appends it
+to a bounded in-memory ring. A background task drains the ring in large
+batches and encodes and writes them from a worker thread, so the request path
+never touches the disk.
+
+When the ring is full, the ``backpressure`` policy decides: ``drop`` discards
+the batch and counts it, ``block`` makes the request wait for space.
+
+Segments are append-only files of length-prefixed, checksummed blocks, one
+per flush::
+
+    b"FDAUDIT1" | block | block | ...
+    block = uint32 payload length | uint32 CRC-32 | payload
+    payload = uint32 length | JSON dictionaries | raw column buffers
+
+The column buffers use the raw columnar format of :mod:`src.api.columnar`.
+String columns are dictionary-encoded: int32 codes in the buffers (``-1`` for
+missing) and the distinct values in the JSON part. Object columns of numbers
+and None are stored as float64, except columns declared as strings
+(identifiers such as ``transaction_id``), which are never converted. A
+segment is rotated once it exceeds a size or age limit. :func:`read_audit_log` turns segments back
+into a DataFrame, skipping a block cut short by a crash.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Collection, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from src.api.columnar import decode_raw_columns, encode_raw_columns
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAGIC = b"FDAUDIT1"
+SEGMENT_SUFFIX = ".seg"
+BACKPRESSURE_POLICIES = ("drop", "block")
+
+_BLOCK_HEADER = struct.Struct("<II")
+_LENGTH = struct.Struct("<I")
+
+
+def _encode_column(values, as_string: bool = False) -> tuple:
+    """
+    Convert a column to a fixed-width NumPy array.
+
+    Args:
+        values: Column values
+        as_string: Dictionary-encode the values as strings whatever they look like
+
+    Returns:
+        Tuple of (array, categories or None for numeric columns)
+    """
+    if as_string:
+        # np.asarray would turn numeric-looking values into numbers
+        array = np.empty(len(values), dtype=object)
+        array[:] = list(values)
+    else:
+        array = values if isinstance(values, np.ndarray) else np.asarray(values)
+        if array.dtype.kind in "fiub":
+            return array, None
+
+        if array.dtype.kind == "O":
+            # Numbers mixed with missing values
+            try:
+                return array.astype(np.float64), None
+            except (TypeError, ValueError):
+                pass
+
+    missing = np.array([value is None for value in array.tolist()], dtype=bool)
+    strings = np.where(missing, "", array.astype(str))
+    categories, codes = np.unique(strings, return_inverse=True)
+    codes = codes.astype(np.int32)
+    codes[missing] = -1
+    return codes, categories.tolist()
+
+
+def encode_block(columns: Dict[str, Sequence], string_columns: Collection[str] = ()) -> bytes:
+    """Encode equally long columns as one checksummed segment block."""
+    arrays = {}
+    dictionaries = {}
+    for name, values in columns.items():
+        arrays[name], categories = _encode_column(values, as_string=name in string_columns)
+        if categories is not None:
+            dictionaries[name] = categories
+
+    header = json.dumps(dictionaries).encode()
+    payload = _LENGTH.pack(len(header)) + header + encode_raw_columns(arrays)
+    return _BLOCK_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_block(payload: bytes) -> Dict[str, np.ndarray]:
+    """Decode a block payload, mapping dictionary codes back to strings (None when missing)."""
+    (header_length,) = _LENGTH.unpack_from(payload, 0)
+    offset = _LENGTH.size + header_length
+    dictionaries = json.loads(payload[_LENGTH.size:offset])
+    columns, _ = decode_raw_columns(payload[offset:])
+
+    for name, categories in dictionaries.items():
+        codes = columns[name]
+        values = np.asarray(categories + [None], dtype=object)
+        # Code -1 selects the trailing None
+        columns[name] = values[codes]
+    return columns
+
+
+def iter_segment_blocks(path: Path) -> Iterator[Dict[str, np.ndarray]]:
+    """Yield the decoded blocks of a segment, stopping at a truncated or corrupt tail."""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if data[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+        raise ValueError(f"Not an audit segment: {path}")
+
+    offset = len(SEGMENT_MAGIC)
+    while offset + _BLOCK_HEADER.size <= len(data):
+        length, checksum = _BLOCK_HEADER.unpack_from(data, offset)
+        start = offset + _BLOCK_HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            logger.warning(f"Skipping truncated or corrupt block at byte {offset} of {path}")
+            return
+        yield decode_block(payload)
+        offset = start + length
+
+
+def read_audit_log(source: Union[Path, str, Iterable[Path]]) -> "pd.DataFrame":
+    """
+    Read audit segments into one DataFrame (e.g. to join labels for retraining).
+
+    Args:
+        source: Segment directory, or an iterable of segment files
+
+    Returns:
+        DataFrame with one row per audited transaction, in write order
+    """
+    import pandas as pd
+
+    if isinstance(source, (str, Path)):
+        paths = sorted(Path(source).glob(f"*{SEGMENT_SUFFIX}"))
+    else:
+        paths = [Path(p) for p in source]
+
+    frames = [pd.DataFrame(block) for path in paths for block in iter_segment_blocks(path)]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+class SegmentWriter:
+    """Append blocks to rotating segment files (used from a single writer thread)."""
+
+    def __init__(self, directory: Path, max_bytes: int, max_age_seconds: float):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_seconds
+
+        self._file = None
+        self._opened_at = 0.0
+        self._sequence = 0
+        self.path: Optional[Path] = None
+        self.segments = 0
+        self.bytes_written = 0
+
+    def _rotate(self):
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        # The pid keeps segments of pre-forked workers apart
+        self.path = self.directory / f"audit-{stamp}-{os.getpid()}-{self._sequence:06d}{SEGMENT_SUFFIX}"
+        self._sequence += 1
+        self._file = open(self.path, "ab")
+        self._file.write(SEGMENT_MAGIC)
+        self._opened_at = time.monotonic()
+        self.segments += 1
+
+    def write(self, block: bytes):
+        """Write a block, starting a new segment when the current one is full or old."""
+        if (
+            self._file is None
+            or self._file.tell() >= self.max_bytes
+            or time.monotonic() - self._opened_at >= self.max_age
+        ):
+            self._rotate()
+        self._file.write(block)
+        self._file.flush()
+        self.bytes_written += len(block)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class AuditLog:
+    """Bounded in-memory ring of scored batches flushed to segments in the background."""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_pending_rows: int = 100000,
+        flush_rows: int = 10000,
+        flush_interval: float = 1.0,
+        backpressure: str = "drop",
+        segment_max_bytes: int = 64 * 2**20,
+        segment_max_age: float = 3600.0,
+        string_columns: Collection[str] = ()
+    ):
+        """
+        Args:
+            directory: Directory receiving the segment files
+            max_pending_rows: Rows the in-memory ring holds before backpressure applies
+            flush_rows: Pending rows that trigger a flush before the interval elapses
+            flush_interval: Maximum seconds a record waits in memory
+            backpressure: 'drop' (discard and count) or 'block' (wait for space)
+            segment_max_bytes: Size after which a new segment is started
+            segment_max_age: Seconds after which a new segment is started
+            string_columns: Columns always stored as strings (identifiers), even
+                when their values look numeric or are all missing
+        """
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy '{backpressure}', expected one of {BACKPRESSURE_POLICIES}")
+
+        self.max_pending_rows = max_pending_rows
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.string_columns = frozenset(string_columns)
+        self.writer = SegmentWriter(directory, segment_max_bytes, segment_max_age)
+
+        self._ring: "deque[tuple]" = deque()
+        self.pending_rows = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # Statistics
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.blocked = 0
+        self.flushes = 0
+        self.flush_time = 0.0
+        self.write_errors = 0
+
+    def start(self):
+        """Start the background flush task on the running event loop."""
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Flush everything still pending and close the current segment."""
+        if self._task is not None:
+            # Let the flush task finish its current write and drain the ring
+            self._stopping = True
+            self._wakeup.set()
+            self._space.set()
+            await self._task
+            self._task = None
+        self.writer.close()
+
+    def _push(self, columns: Dict[str, Sequence], n_rows: int):
+        self._ring.append((columns, n_rows))
+        self.pending_rows += n_rows
+        if self.pending_rows >= self.flush_rows:
+            self._wakeup.set()
+
+    async def record(self, columns: Dict[str, Sequence], n_rows: int):
+        """
+        Queue one scored batch. Returns at once unless the ring is full and
+        the policy is 'block'.
+
+        Args:
+            columns: Equally long columns (lists or arrays) of the batch
+            n_rows: Number of rows in the batch
+        """
+        while self.pending_rows + n_rows > self.max_pending_rows and self.pending_rows:
+            if self.backpressure == "drop":
+                self.rows_dropped += n_rows
+                return
+            self.blocked += 1
+            self._space.clear()
+            self._wakeup.set()
+            await self._space.wait()
+        self._push(columns, n_rows)
+
+    def _drain(self) -> List[tuple]:
+        """Take every pending batch out of the ring and wake blocked producers."""
+        batches = list(self._ring)
+        self._ring.clear()
+        self.pending_rows = 0
+        self._space.set()
+        return batches
+
+    def _write(self, batches: List[tuple]) -> int:
+        """Encode the batches as one block and append it (runs in a worker thread)."""
+        if not batches:
+            return 0
+        started = time.perf_counter()
+        names = list(batches[0][0])
+        columns = {}
+        for name in names:
+            parts = [batch[name] for batch, _ in batches]
+            if all(isinstance(part, np.ndarray) for part in parts):
+                columns[name] = np.concatenate(parts)
+            else:
+                columns[name] = [value for part in parts for value in (
+                    part.tolist() if isinstance(part, np.ndarray) else part
+                )]
+        self.writer.write(encode_block(columns, self.string_columns))
+
+        n_rows = sum(n for _, n in batches)
+        self.rows_written += n_rows
+        self.flushes += 1
+        self.flush_time += time.perf_counter() - started
+        return n_rows
+
+    def _write_groups(self, batches: List[tuple]):
+        """Write batches with the same columns together, one block per run of identical column sets."""
+        group: List[tuple] = []
+        for batch in batches:
+            if group and list(batch[0]) != list(group[0][0]):
+                self._write(group)
+                group = []
+            group.append(batch)
+        self._write(group)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while not (self._stopping and not self._ring):
+            if not self._stopping:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+
+            batches = self._drain()
+            if not batches:
+                continue
+            try:
+                await loop.run_in_executor(None, self._write_groups, batches)
+            except Exception as e:
+                n_rows = sum(n for _, n in batches)
+                self.write_errors += 1
+                self.rows_dropped += n_rows
+                logger.error(f"Audit log write failed, {n_rows} rows lost: {e}")
+
+    def stats(self) -> dict:
+        """Audit log statistics."""
+        return {
+            "directory": str(self.writer.directory),
+            "current_segment": str(self.writer.path) if self.writer.path else None,
+            "backpressure": self.backpressure,
+            "pending_rows": self.pending_rows,
+            "max_pending_rows": self.max_pending_rows,
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "blocked": self.blocked,
+            "flushes": self.flushes,
+            "mean_flush_ms": self.flush_time / self.flushes * 1000 if self.flushes else 0.0,
+            "segments": self.writer.segments,
+            "bytes_written": self.writer.bytes_written,
+            "write_errors": self.write_errors
+        }
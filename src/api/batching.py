@@ -0,0 +1,163 @@
+"""Adaptive micro-batching for single-transaction predictions.
+
+Concurrent ``/predict`` calls are gathered for a short window (or until a
+maximum batch size is reached) and scored with one model call. The window
+adapts to the observed arrival rate: when requests arrive further apart than
+the maximum window, a request is scored immediately, so latency at low load
+stays flat.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional
+
+import numpy as np
+
+# Upper bounds of the batch-size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class MicroBatcher:
+    """Gather single requests into small batches scored by one call."""
+
+    def __init__(
+        self,
+        score_batch: Callable[[list], Awaitable[list]],
+        max_batch_size: int = 256,
+        max_wait_ms: float = 5.0,
+        smoothing: float = 0.1
+    ):
+        """
+        Args:
+            score_batch: Coroutine function scoring a list of items, returning one result per item
+            max_batch_size: Maximum number of items scored in one call
+            max_wait_ms: Maximum time the first item of a batch waits for companions
+            smoothing: EWMA weight used to track the request inter-arrival time
+        """
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.smoothing = smoothing
+
+        self._pending: List[tuple] = []
+        self._in_flight: List[tuple] = []   # batch being scored, failed too if stopped mid-call
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_arrival: Optional[float] = None
+        self._interarrival = float("inf")
+
+        # Statistics
+        self.batches = 0
+        self.items = 0
+        self.batch_size_counts = np.zeros(len(BATCH_SIZE_BUCKETS) + 1, dtype=np.int64)
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    def start(self):
+        """Start the background batching task on the running event loop."""
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching task, failing any requests still waiting or being scored."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for _, future, _ in self._in_flight + self._pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+        self._in_flight = []
+        self._pending.clear()
+
+    async def submit(self, item):
+        """Queue one item and wait for its individual result."""
+        now = time.perf_counter()
+        if self._last_arrival is not None:
+            gap = now - self._last_arrival
+            if self._interarrival == float("inf"):
+                self._interarrival = gap
+            else:
+                self._interarrival += self.smoothing * (gap - self._interarrival)
+        self._last_arrival = now
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future, now))
+        self._wakeup.set()
+        return await future
+
+    def current_window(self) -> float:
+        """Time to keep a batch open, adapted to the observed arrival rate."""
+        if self._interarrival >= self.max_wait:
+            # Too little traffic to fill a batch within the window: don't wait
+            return 0.0
+        remaining = self.max_batch_size - len(self._pending)
+        return min(self.max_wait, self._interarrival * remaining)
+
+    async def _run(self):
+        """Collect and score batches until cancelled."""
+        while True:
+            await self._wakeup.wait()
+
+            window = self.current_window()
+            if window > 0 and len(self._pending) < self.max_batch_size:
+                deadline = time.perf_counter() + window
+                while len(self._pending) < self.max_batch_size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            if not self._pending:
+                self._wakeup.clear()
+            if batch:
+                # Cleared only once scored: a cancelled call leaves it for stop() to fail
+                self._in_flight = batch
+                await self._score(batch)
+                self._in_flight = []
+
+    async def _score(self, batch: List[tuple]):
+        """Score one batch and resolve each caller's future."""
+        started = time.perf_counter()
+        waits = [started - submitted for _, _, submitted in batch]
+        self.batches += 1
+        self.items += len(batch)
+        self.batch_size_counts[np.searchsorted(BATCH_SIZE_BUCKETS, len(batch))] += 1
+        self.queue_wait_total += sum(waits)
+        self.queue_wait_max = max(self.queue_wait_max, max(waits))
+
+        try:
+            results = await self.score_batch([item for item, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        """Batch-size and queue-wait statistics."""
+        labels = [f"<={b}" for b in BATCH_SIZE_BUCKETS] + [f">{BATCH_SIZE_BUCKETS[-1]}"]
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "batch_size_histogram": dict(zip(labels, self.batch_size_counts.tolist())),
+            "mean_queue_wait_ms": self.queue_wait_total / self.items * 1000 if self.items else 0.0,
+            "max_queue_wait_ms": self.queue_wait_max * 1000,
+            "current_window_ms": self.current_window() * 1000,
+            "pending": len(self._pending)
+        }
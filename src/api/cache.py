@@ -0,0 +1,116 @@
+"""In-process prediction cache for repeated transactions.
+
+Retries, duplicate webhooks and replays resend byte-identical transactions.
+:class:`PredictionCache` keeps recent predictions keyed by a canonical hash of
+the transaction fields and the model version, bounded by an LRU entry limit
+and a TTL. Concurrent requests for the same key share a single computation
+instead of each scoring the transaction.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict
+
+
+def transaction_key(fields: Dict[str, Any], model_version: str) -> str:
+    """Canonical hash of a transaction's fields for one model version."""
+    canonical = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.blake2b(canonical.encode(), digest_size=16)
+    digest.update(model_version.encode())
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """LRU + TTL cache with in-flight request coalescing."""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60.0):
+        """
+        Args:
+            max_entries: Maximum number of cached predictions
+            ttl_seconds: Time after which a cached prediction expires
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+
+        # key -> (expires_at, value), oldest use first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        """Return the cached value for key, computing it at most once concurrently."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.expirations += 1
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            # Shield so one cancelled waiter does not cancel the shared result
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            self._store(key, value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    def _store(self, key: str, value):
+        """Insert a value, evicting the least recently used entries."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached prediction (e.g. after a model reload)."""
+        self._entries.clear()
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Cache usage statistics."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "in_flight": len(self._in_flight),
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0
+        }
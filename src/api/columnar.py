@@ -0,0 +1,155 @@
+"""Columnar binary formats for bulk scoring.
+
+Two request/response formats avoid per-row JSON decoding and validation:
+
+* Raw column buffers (``application/x-fraud-columns``)::
+
+      b"FDC1" | uint32 header length | JSON header | column buffers
+
+  The little-endian JSON header lists ``n_rows`` and the ``name`` and NumPy
+  ``dtype`` (e.g. ``"<f8"``, ``"<i4"``) of every column. Each column buffer
+  starts on an 8-byte boundary. Categorical features are sent as integer
+  codes from the transform plan's category tables; float columns are
+  rejected for them rather than read as unknown categories.
+
+* Arrow IPC streams (``application/vnd.apache.arrow.stream``), available when
+  ``pyarrow`` is installed. String and dictionary-encoded columns are mapped
+  to category codes once per distinct value.
+
+Columns are mapped straight into NumPy arrays without copying.
+"""
+
+import json
+import struct
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.data.transform_plan import CompiledTransformPlan
+
+RAW_CONTENT_TYPE = "application/x-fraud-columns"
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+RAW_MAGIC = b"FDC1"
+ALIGNMENT = 8
+SUPPORTED_KINDS = "fiub"
+
+
+def _padding(offset: int) -> int:
+    """Bytes needed to reach the next aligned offset."""
+    return -offset % ALIGNMENT
+
+
+def decode_raw_columns(
+    body: bytes, plan: Optional[CompiledTransformPlan] = None
+) -> Tuple[Dict[str, np.ndarray], int]:
+    """
+    Map a raw column-buffer payload into NumPy arrays without copying.
+
+    Args:
+        body: Raw column-buffer payload
+        plan: When given, categorical features of the plan must be integer codes
+
+    Returns:
+        Tuple of (columns, n_rows)
+
+    Raises:
+        ValueError: If the payload or its header is malformed
+    """
+    if len(body) < 8 or body[:4] != RAW_MAGIC:
+        raise ValueError("Not a raw column payload (bad magic)")
+
+    (header_length,) = struct.unpack_from("<I", body, 4)
+    offset = 8 + header_length
+    if offset > len(body):
+        raise ValueError("Truncated header")
+
+    try:
+        header = json.loads(body[8:offset])
+        n_rows = int(header["n_rows"])
+        specs = [(str(spec["name"]), np.dtype(spec["dtype"])) for spec in header["columns"]]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid header: {e!r}")
+    if n_rows < 0:
+        raise ValueError(f"Invalid header: negative n_rows ({n_rows})")
+
+    columns = {}
+    for name, dtype in specs:
+        if dtype.kind not in SUPPORTED_KINDS or dtype.byteorder == ">":
+            raise ValueError(f"Unsupported dtype for column '{name}': {dtype.str}")
+        if plan is not None and name in plan.categorical and dtype.kind not in "iu":
+            raise ValueError(f"Categorical column '{name}' must hold integer codes, got {dtype.str}")
+        if name in columns:
+            raise ValueError(f"Duplicate column '{name}'")
+
+        offset += _padding(offset)
+        end = offset + n_rows * dtype.itemsize
+        if end > len(body):
+            raise ValueError(f"Truncated buffer for column '{name}'")
+
+        columns[name] = np.frombuffer(body, dtype=dtype, count=n_rows, offset=offset)
+        offset = end
+
+    return columns, n_rows
+
+
+def encode_raw_columns(columns: Dict[str, np.ndarray]) -> bytes:
+    """Serialize equally long NumPy columns into a raw column-buffer payload."""
+    arrays = {name: np.ascontiguousarray(values) for name, values in columns.items()}
+    n_rows = len(next(iter(arrays.values()))) if arrays else 0
+    header = json.dumps({
+        "n_rows": n_rows,
+        "columns": [{"name": name, "dtype": values.dtype.str} for name, values in arrays.items()]
+    }).encode()
+
+    parts = [RAW_MAGIC, struct.pack("<I", len(header)), header]
+    offset = 8 + len(header)
+    for values in arrays.values():
+        pad = _padding(offset)
+        parts.append(b"\0" * pad)
+        data = values.astype(values.dtype.newbyteorder("<"), copy=False).tobytes()
+        parts.append(data)
+        offset += pad + len(data)
+
+    return b"".join(parts)
+
+
+def decode_arrow_columns(body: bytes, plan: CompiledTransformPlan) -> Tuple[Dict[str, np.ndarray], int]:
+    """
+    Read an Arrow IPC stream into NumPy columns for the features of the plan.
+
+    Returns:
+        Tuple of (columns, n_rows)
+    """
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(body).read_all()
+    columns = {}
+    for name in plan.feature_names:
+        if name not in table.column_names:
+            continue
+        column = table.column(name).combine_chunks()
+
+        if name in plan.categorical and pa.types.is_floating(column.type):
+            raise ValueError(
+                f"Categorical column '{name}' must hold integer codes or strings, got {column.type}"
+            )
+        if name in plan.categorical and pa.types.is_dictionary(column.type):
+            # Encode each distinct dictionary value once, then gather by index
+            codes = plan.encode_categorical(name, column.dictionary.to_numpy(zero_copy_only=False))
+            columns[name] = codes[column.indices.to_numpy(zero_copy_only=False)]
+        else:
+            columns[name] = column.to_numpy(zero_copy_only=False)
+
+    return columns, table.num_rows
+
+
+def encode_arrow_columns(columns: Dict[str, np.ndarray]) -> bytes:
+    """Serialize NumPy columns as an Arrow IPC stream."""
+    import pyarrow as pa
+
+    table = pa.table({name: pa.array(values) for name, values in columns.items()})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,212 @@
+"""Streaming feature-drift monitor.
+
+The inference workers hand back a uniform sample of the encoded rows of each
+scored batch, with missing values left as NaN (see
+:mod:`src.data.drift_reference`). :class:`DriftMonitor`
+stages the samples in a small buffer and bins them in bulk against the
+reference edges, so the per-call cost stays a few microseconds even for
+single-row requests. Bin counts go to a ring of time buckets: memory stays
+constant however much traffic is scored. The counts of the buckets inside
+the window are compared with the reference distributions saved by training:
+a PSI and a binned KS statistic per feature, plus live quantiles estimated
+from the same counts. Each feature is scored over the rows where it was
+observed, so values the model had to impute never look like drift.
+"""
+
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from src.data.drift_reference import BatchSketch, DriftReference, ks_statistic, population_stability_index
+
+# PSI above which a feature is reported as shifted or drifted
+PSI_SHIFTED = 0.1
+PSI_DRIFTED = 0.25
+
+REPORT_QUANTILES = (0.1, 0.5, 0.9)
+
+
+class DriftMonitor:
+    """Per-feature bin counts of recent traffic in a ring of time buckets."""
+
+    def __init__(
+        self,
+        reference: DriftReference,
+        model_version: str,
+        window_seconds: float = 3600.0,
+        n_buckets: int = 12,
+        min_rows: int = 500,
+        flush_rows: int = 256
+    ):
+        """
+        Args:
+            reference: Reference distributions of the served model
+            model_version: Version of the served model; samples from other versions are ignored
+            window_seconds: Length of the sliding window the scores cover
+            n_buckets: Time buckets in the window (the window slides one bucket at a time)
+            min_rows: Observed values of a feature needed in the window before its drift is reported
+            flush_rows: Sampled rows staged before they are binned
+        """
+        self.window = window_seconds
+        self.n_buckets = n_buckets
+        self.bucket_seconds = window_seconds / n_buckets
+        self.min_rows = min_rows
+        self.flush_rows = flush_rows
+        self.reset(reference, model_version)
+
+    def reset(self, reference: DriftReference, model_version: str):
+        """Start over with a new reference (after a model reload)."""
+        self.reference = reference
+        self.model_version = model_version
+
+        shape = (self.n_buckets, reference.n_features)
+        self.counts = np.zeros(shape + (reference.max_bins,), dtype=np.int64)
+        self.minimum = np.full(shape, np.inf)
+        self.maximum = np.full(shape, -np.inf)
+        self.bucket_rows = np.zeros(self.n_buckets, dtype=np.int64)
+        self.bucket_ids = np.full(self.n_buckets, -1, dtype=np.int64)
+
+        self._staged: List[np.ndarray] = []
+        self.staged_rows = 0
+
+        # Statistics
+        self.samples = 0
+        self.rows = 0
+        self.stale_samples = 0
+
+    def _bucket(self, now: float) -> int:
+        """Ring slot of the current time bucket, cleared when it is reused."""
+        bucket_id = int(now // self.bucket_seconds)
+        slot = bucket_id % self.n_buckets
+        if self.bucket_ids[slot] != bucket_id:
+            self.counts[slot] = 0
+            self.minimum[slot] = np.inf
+            self.maximum[slot] = -np.inf
+            self.bucket_rows[slot] = 0
+            self.bucket_ids[slot] = bucket_id
+        return slot
+
+    def add(self, rows: np.ndarray, model_version: str, now: Optional[float] = None):
+        """Stage the sampled rows of a scored batch, binning the staged rows once there are enough."""
+        if model_version != self.model_version:
+            # Scored by the previous model just before a reload
+            self.stale_samples += 1
+            return
+
+        self._staged.append(rows)
+        self.staged_rows += len(rows)
+        self.samples += 1
+        if self.staged_rows >= self.flush_rows:
+            self.flush(now)
+
+    def flush(self, now: Optional[float] = None):
+        """Bin the staged rows into the current time bucket."""
+        if not self._staged:
+            return
+        rows = self._staged[0] if len(self._staged) == 1 else np.concatenate(self._staged)
+        self._staged = []
+        self.staged_rows = 0
+        self.update(self.reference.sketch(rows), now)
+
+    def update(self, sketch: BatchSketch, now: Optional[float] = None):
+        """Add binned rows to the current time bucket."""
+        slot = self._bucket(time.time() if now is None else now)
+        self.counts[slot] += sketch.counts
+        np.minimum(self.minimum[slot], sketch.minimum, out=self.minimum[slot])
+        np.maximum(self.maximum[slot], sketch.maximum, out=self.maximum[slot])
+        self.bucket_rows[slot] += sketch.n_rows
+        self.rows += sketch.n_rows
+
+    def _window(self, now: float) -> tuple:
+        """Row count, counts and value range summed over the buckets inside the window."""
+        current = int(now // self.bucket_seconds)
+        live = (self.bucket_ids > current - self.n_buckets) & (self.bucket_ids >= 0)
+        return int(self.bucket_rows[live].sum()), self.counts[live].sum(axis=0), \
+            self.minimum[live].min(axis=0, initial=np.inf), self.maximum[live].max(axis=0, initial=-np.inf)
+
+    def scores(self, now: Optional[float] = None) -> dict:
+        """
+        Drift scores of the window against the reference.
+
+        Returns:
+            Dictionary with the window's sampled row count, the observed values
+            per feature and, per feature, the PSI and KS statistic (None until
+            the window holds min_rows rows; NaN for features observed fewer
+            than min_rows times)
+        """
+        now = time.time() if now is None else now
+        self.flush(now)
+        window_rows, counts, _, _ = self._window(now)
+        observed = counts.sum(axis=1)
+        if window_rows < self.min_rows:
+            return {"window_rows": window_rows, "observed": observed, "psi": None, "ks": None}
+
+        actual = counts / np.maximum(observed, 1)[:, None]
+        scored = observed >= self.min_rows
+        return {
+            "window_rows": window_rows,
+            "observed": observed,
+            "psi": np.where(scored, population_stability_index(self.reference.proportions, actual), np.nan),
+            "ks": np.where(scored, ks_statistic(self.reference.proportions, actual), np.nan)
+        }
+
+    def report(self, now: Optional[float] = None) -> dict:
+        """Per-feature drift report of the window."""
+        now = time.time() if now is None else now
+        scores = self.scores(now)
+        _, counts, minimum, maximum = self._window(now)
+        quantiles = self.reference.quantiles(counts, minimum, maximum, list(REPORT_QUANTILES))
+
+        features = {}
+        for j, name in enumerate(self.reference.feature_names):
+            feature = {
+                "kind": self.reference.kinds[j],
+                "observed_rows": int(scores["observed"][j]),
+                "psi": None,
+                "ks": None,
+                "status": "insufficient_data"
+            }
+            if scores["psi"] is not None and not np.isnan(scores["psi"][j]):
+                psi = float(scores["psi"][j])
+                feature.update(psi=psi, ks=float(scores["ks"][j]), status=drift_status(psi))
+            if self.reference.kinds[j] == "numeric" and scores["observed"][j]:
+                feature["live_quantiles"] = {
+                    f"p{round(q * 100)}": float(v) for q, v in zip(REPORT_QUANTILES, quantiles[j])
+                }
+            features[name] = feature
+
+        return {
+            "model_version": self.model_version,
+            "window_seconds": self.window,
+            "window_rows": scores["window_rows"],
+            "min_rows": self.min_rows,
+            "drifted_features": drifted_features(features),
+            "features": features
+        }
+
+    def stats(self) -> dict:
+        """Monitor usage statistics."""
+        return {
+            "model_version": self.model_version,
+            "samples": self.samples,
+            "sampled_rows": self.rows,
+            "staged_rows": self.staged_rows,
+            "stale_samples": self.stale_samples,
+            "bins_per_feature": self.reference.n_bins.tolist(),
+            "memory_bytes": self.counts.nbytes + self.minimum.nbytes + self.maximum.nbytes
+        }
+
+
+def drift_status(psi: float) -> str:
+    """Conventional reading of a PSI value."""
+    if psi >= PSI_DRIFTED:
+        return "drifted"
+    if psi >= PSI_SHIFTED:
+        return "shifted"
+    return "stable"
+
+
+def drifted_features(features: dict) -> List[str]:
+    """Names of the features whose status is 'drifted'."""
+    return [name for name, feature in features.items() if feature["status"] == "drifted"]
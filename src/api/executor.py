@@ -0,0 +1,176 @@
+"""Run CPU-bound inference off the asyncio event loop.
+
+Inference runs on a thread pool or a process pool with bounded concurrency so
+the event loop stays free to serve I/O (including ``/health``) while large
+batches are being scored.
+
+Process-pool workers load the model once in their initializer (or inherit it
+from the parent when the pool is forked), so only the request features travel
+to a worker on each call, never the model itself.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+EXECUTOR_KINDS = ("thread", "process", "inline")
+
+
+class InferenceExecutor:
+    """Bounded-concurrency executor for model inference."""
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_concurrency: Optional[int] = None,
+        worker_initializer: Optional[Callable] = None
+    ):
+        """
+        Args:
+            kind: 'thread', 'process' or 'inline' (run on the event loop)
+            max_workers: Number of pool workers
+            max_concurrency: Maximum inference calls in flight (defaults to max_workers)
+            worker_initializer: Called once in each process worker to load the model
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind '{kind}', expected one of {EXECUTOR_KINDS}")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+        self.worker_initializer = worker_initializer
+
+        self._pool: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.calls = 0
+        self.busy_time = 0.0
+
+    def start(self):
+        """Create the worker pool."""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.kind == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        elif self.kind == "process":
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.worker_initializer)
+
+    async def warm_up(self, fn: Callable, *args) -> float:
+        """
+        Submit fn(*args) once per worker, all at once, and wait for every call.
+
+        Process workers are started and run their initializer (loading the
+        model) in parallel instead of on the first requests.
+
+        Returns:
+            Warm-up duration in seconds
+        """
+        started = time.perf_counter()
+        if self._pool is None:
+            fn(*args)
+        else:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(
+                loop.run_in_executor(self._pool, fn, *args) for _ in range(self.max_workers)
+            ))
+        return time.perf_counter() - started
+
+    def shutdown(self):
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def drain_and_shutdown(self, poll_interval: float = 0.05):
+        """Let queued and in-flight calls finish, then shut down the pool."""
+        while self.in_flight or self.waiting:
+            await asyncio.sleep(poll_interval)
+        self.shutdown()
+
+    async def run(self, fn: Callable, *args):
+        """Run fn(*args) on the pool, waiting for a free slot first."""
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            if self._pool is None:
+                return fn(*args)
+            return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+        finally:
+            self.busy_time += time.perf_counter() - started
+            self.calls += 1
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        """Executor usage statistics."""
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "calls": self.calls,
+            "mean_call_ms": self.busy_time / self.calls * 1000 if self.calls else 0.0
+        }
+
+
+class EventLoopLagMonitor:
+    """Measure how late the event loop wakes up from a periodic sleep."""
+
+    def __init__(self, interval: float = 0.1, on_sample: Optional[Callable[[float], None]] = None):
+        """
+        Args:
+            interval: Seconds between samples
+            on_sample: Called with each lag sample in seconds
+        """
+        self.interval = interval
+        self.on_sample = on_sample
+        self._task: Optional[asyncio.Task] = None
+        self.samples = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+
+    def start(self):
+        """Start sampling on the running event loop."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        """Sleep for the interval and record how much longer it actually took."""
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+            self.samples += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.total_lag += lag
+            if self.on_sample is not None:
+                self.on_sample(lag)
+
+    def stats(self) -> dict:
+        """Event-loop lag statistics in milliseconds."""
+        return {
+            "samples": self.samples,
+            "last_lag_ms": self.last_lag * 1000,
+            "mean_lag_ms": self.total_lag / self.samples * 1000 if self.samples else 0.0,
+            "max_lag_ms": self.max_lag * 1000
+        }
@@ -0,0 +1,349 @@
+"""In-process online feature store for per-account velocity features.
+
+The model was trained on account history features (``transaction_frequency``,
+``account_age_days``, ``distance_from_home`` and ``previous_fraud_rate``) that
+callers cannot compute. :class:`FeatureStore` keeps rolling aggregates per
+account and derives these features for each incoming transaction.
+
+State lives in preallocated NumPy slabs with one row per account:
+
+- A ring buffer of the last ``ring_size`` transaction timestamps and amounts.
+  Entries older than the window are evicted from the head when the account is
+  next seen, so the window count and amount sum are maintained in amortized
+  O(1) per transaction.
+- Scalars: first-seen time, the account's open date when a caller supplied
+  one, coordinate sums for the home location, and counts of labelled and
+  confirmed fraudulent transactions.
+
+``account_age_days`` comes from the open date only. How long an account has
+been known to this process says nothing about its age (every account would
+start at 0 days), so accounts without an open date leave it to imputation.
+Likewise ``previous_fraud_rate`` comes from fraud labels reported through
+:meth:`FeatureStore.record_labels` (chargebacks, analyst reviews), never from
+the model's own decisions: feeding those back would let one false positive
+raise the account's next scores.
+
+Every account uses the same fixed number of bytes. When ``max_accounts`` is
+reached, the least recently seen account is evicted. Untouched rows of the
+zero-initialized slabs are not backed by physical memory until used.
+
+Snapshots are compact ``.npz`` files holding only the accounts in use, with
+their rings stored oldest first, so a restarted API resumes with warm state.
+"""
+
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 3
+
+# Features the store provides, in the names used by the transform plan
+FEATURE_NAMES = ("transaction_frequency", "account_age_days", "distance_from_home", "previous_fraud_rate")
+
+EARTH_RADIUS_KM = 6371.0088
+SECONDS_PER_DAY = 86400.0
+
+# Per-account scalar slabs: name -> dtype
+_SCALARS = {
+    "start": np.int32,          # ring index of the oldest entry
+    "size": np.int32,           # entries in the ring
+    "window_amount": np.float64,
+    "first_seen": np.float64,
+    "opened_at": np.float64,    # NaN until a caller supplies the open date
+    "lat_sum": np.float64,
+    "lon_sum": np.float64,
+    "located": np.int64,        # transactions with coordinates
+    "labeled": np.int64,        # transactions with a reported fraud label
+    "fraud_labels": np.int64    # of which confirmed fraudulent
+}
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in kilometres."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+class FeatureStore:
+    """Per-account sliding-window aggregates in fixed-size slabs."""
+
+    def __init__(self, max_accounts: int = 100000, ring_size: int = 32, window_seconds: float = SECONDS_PER_DAY):
+        """
+        Args:
+            max_accounts: Accounts kept before the least recently seen one is evicted
+            ring_size: Transactions remembered per account (window counts saturate at this)
+            window_seconds: Length of the sliding window for counts and sums
+        """
+        self.max_accounts = max_accounts
+        self.ring_size = ring_size
+        self.window = window_seconds
+        self._allocate()
+
+        # Statistics
+        self.updates = 0
+        self.account_evictions = 0
+        self.ring_overflows = 0
+
+    def _allocate(self):
+        """Create empty slabs with every row free."""
+        self.times = np.zeros((self.max_accounts, self.ring_size), dtype=np.float64)
+        self.amounts = np.zeros((self.max_accounts, self.ring_size), dtype=np.float32)
+        for name, dtype in _SCALARS.items():
+            setattr(self, name, np.zeros(self.max_accounts, dtype=dtype))
+
+        # account id -> slab row, least recently seen first
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._free: List[int] = list(range(self.max_accounts - 1, -1, -1))
+
+    @property
+    def accounts(self) -> int:
+        return len(self._slots)
+
+    @property
+    def bytes_per_account(self) -> int:
+        """Bytes of slab memory used by each account."""
+        ring = self.times.itemsize + self.amounts.itemsize
+        return self.ring_size * ring + sum(getattr(self, name).itemsize for name in _SCALARS)
+
+    def _slot(self, account_id: str, timestamp: float) -> int:
+        """Row of an account, allocating (and evicting the least recently seen) as needed."""
+        slot = self._slots.get(account_id)
+        if slot is not None:
+            self._slots.move_to_end(account_id)
+            return slot
+
+        if self._free:
+            slot = self._free.pop()
+        else:
+            _, slot = self._slots.popitem(last=False)
+            self.account_evictions += 1
+        for name in _SCALARS:
+            getattr(self, name)[slot] = 0
+        self.first_seen[slot] = timestamp
+        self.opened_at[slot] = np.nan
+        self._slots[account_id] = slot
+        return slot
+
+    def _evict_expired(self, slot: int, now: float):
+        """Drop ring entries that fell out of the window."""
+        cutoff = now - self.window
+        times, amounts = self.times[slot], self.amounts[slot]
+        start, size = int(self.start[slot]), int(self.size[slot])
+        window_amount = float(self.window_amount[slot])
+
+        while size and times[start] < cutoff:
+            window_amount -= float(amounts[start])
+            start = (start + 1) % self.ring_size
+            size -= 1
+
+        self.start[slot] = start
+        self.size[slot] = size
+        # Reset the running sum when the window empties so rounding errors do not accumulate
+        self.window_amount[slot] = window_amount if size else 0.0
+
+    def update(
+        self,
+        account_id: str,
+        amount: float,
+        timestamp: Optional[float] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        opened_at: Optional[float] = None
+    ) -> Dict[str, Optional[float]]:
+        """
+        Compute an account's features for a new transaction, then record it.
+
+        Features describe the history before this transaction. Those that
+        cannot be computed (no coordinates, no labelled history, no known
+        open date) are None so the transform plan imputes them. An opened_at
+        (Unix time the account was opened) is remembered for later
+        transactions of the account.
+
+        Returns:
+            Dictionary of feature name to value
+        """
+        now = time.time() if timestamp is None else float(timestamp)
+        slot = self._slot(account_id, now)
+        self._evict_expired(slot, now)
+        if opened_at is not None:
+            self.opened_at[slot] = opened_at
+        opened = float(self.opened_at[slot])
+
+        size = int(self.size[slot])
+        located = int(self.located[slot])
+        labeled = int(self.labeled[slot])
+
+        distance = None
+        if latitude is not None and longitude is not None and located:
+            distance = haversine_km(
+                latitude, longitude,
+                float(self.lat_sum[slot]) / located, float(self.lon_sum[slot]) / located
+            )
+
+        features = {
+            "transaction_frequency": float(size),
+            "account_age_days": None if math.isnan(opened) else max(now - opened, 0.0) / SECONDS_PER_DAY,
+            "distance_from_home": distance,
+            "previous_fraud_rate": float(self.fraud_labels[slot]) / labeled if labeled else None
+        }
+
+        # Record the transaction; a full ring drops its oldest entry
+        if size == self.ring_size:
+            start = int(self.start[slot])
+            self.window_amount[slot] -= float(self.amounts[slot, start])
+            self.start[slot] = (start + 1) % self.ring_size
+            size -= 1
+            self.ring_overflows += 1
+        position = (int(self.start[slot]) + size) % self.ring_size
+        self.times[slot, position] = now
+        self.amounts[slot, position] = amount
+        self.size[slot] = size + 1
+        self.window_amount[slot] += amount
+
+        if latitude is not None and longitude is not None:
+            self.lat_sum[slot] += latitude
+            self.lon_sum[slot] += longitude
+            self.located[slot] += 1
+
+        self.updates += 1
+        return features
+
+    def record_labels(self, account_ids: Sequence[Optional[str]], is_fraud: Sequence[bool]) -> int:
+        """
+        Count reported fraud labels towards previous_fraud_rate.
+
+        Labels of accounts the store does not hold are ignored.
+
+        Returns:
+            Number of labels recorded
+        """
+        recorded = 0
+        for account_id, fraud in zip(account_ids, is_fraud):
+            slot = self._slots.get(account_id) if account_id is not None else None
+            if slot is None:
+                continue
+            self.labeled[slot] += 1
+            if fraud:
+                self.fraud_labels[slot] += 1
+            recorded += 1
+        return recorded
+
+    def account_state(self, account_id: str, now: Optional[float] = None) -> Optional[dict]:
+        """Current aggregates of one account (None if unknown)."""
+        slot = self._slots.get(account_id)
+        if slot is None:
+            return None
+
+        now = time.time() if now is None else now
+        self._evict_expired(slot, now)
+        located = int(self.located[slot])
+        return {
+            "window_transactions": int(self.size[slot]),
+            "window_amount": float(self.window_amount[slot]),
+            "first_seen": float(self.first_seen[slot]),
+            "opened_at": None if math.isnan(self.opened_at[slot]) else float(self.opened_at[slot]),
+            "home": [float(self.lat_sum[slot]) / located, float(self.lon_sum[slot]) / located] if located else None,
+            "labeled": int(self.labeled[slot]),
+            "fraud_labels": int(self.fraud_labels[slot])
+        }
+
+    def stats(self) -> dict:
+        """Feature store usage and memory statistics."""
+        accounts = self.accounts
+        return {
+            "accounts": accounts,
+            "max_accounts": self.max_accounts,
+            "ring_size": self.ring_size,
+            "window_seconds": self.window,
+            "bytes_per_account": self.bytes_per_account,
+            "used_bytes": accounts * self.bytes_per_account,
+            "reserved_bytes": self.max_accounts * self.bytes_per_account,
+            "updates": self.updates,
+            "account_evictions": self.account_evictions,
+            "ring_overflows": self.ring_overflows
+        }
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """Copy the state of the accounts in use, rings oldest first, least recently seen account first."""
+        slots = np.fromiter(self._slots.values(), dtype=np.intp, count=len(self._slots))
+        ring_index = (self.start[slots, None] + np.arange(self.ring_size)) % self.ring_size
+
+        arrays = {
+            "version": np.array(SNAPSHOT_VERSION),
+            "window_seconds": np.array(self.window),
+            "account_ids": np.array(list(self._slots), dtype=str),
+            "times": np.take_along_axis(self.times[slots], ring_index, axis=1),
+            "amounts": np.take_along_axis(self.amounts[slots], ring_index, axis=1)
+        }
+        for name in _SCALARS:
+            if name != "start":
+                arrays[name] = getattr(self, name)[slots]
+        return arrays
+
+    @staticmethod
+    def write_snapshot(arrays: Dict[str, np.ndarray], path: Path):
+        """Write a snapshot atomically (safe to run in a background thread)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    def save(self, path: Path):
+        """Snapshot the store to disk."""
+        self.write_snapshot(self.snapshot(), path)
+
+    def load(self, path: Path) -> int:
+        """
+        Replace the state with a snapshot, keeping the most recently seen
+        accounts and ring entries that fit this store's limits.
+
+        Returns:
+            Number of accounts restored
+        """
+        with np.load(path) as data:
+            if int(data["version"]) not in (1, 2, SNAPSHOT_VERSION):
+                raise ValueError(f"Unsupported feature store snapshot version: {int(data['version'])}")
+            arrays = {name: data[name] for name in data.files}
+        # Version 1 snapshots predate open dates
+        arrays.setdefault("opened_at", np.full(len(arrays["account_ids"]), np.nan))
+        # Versions 1 and 2 counted the model's own decisions, not labels: start those over
+        for name in ("labeled", "fraud_labels"):
+            arrays.setdefault(name, np.zeros(len(arrays["account_ids"]), dtype=np.int64))
+
+        n = min(len(arrays["account_ids"]), self.max_accounts)
+        keep = slice(len(arrays["account_ids"]) - n, None)
+        sizes = np.minimum(arrays["size"][keep], self.ring_size)
+
+        self._allocate()
+        rows = np.arange(n)
+        for name in _SCALARS:
+            if name not in ("start", "size"):
+                getattr(self, name)[rows] = arrays[name][keep]
+        self.size[rows] = sizes
+
+        # Rings are stored oldest first and left-aligned: keep the newest entries of each
+        old_times, old_amounts = arrays["times"][keep], arrays["amounts"][keep]
+        ring_index = (arrays["size"][keep] - sizes)[:, None] + np.arange(self.ring_size)
+        ring_index = ring_index.clip(0, max(old_times.shape[1] - 1, 0))
+        in_ring = np.arange(self.ring_size) < sizes[:, None]
+        if old_times.shape[1]:
+            self.times[rows] = np.where(in_ring, np.take_along_axis(old_times, ring_index, axis=1), 0.0)
+            self.amounts[rows] = np.where(in_ring, np.take_along_axis(old_amounts, ring_index, axis=1), 0.0)
+        self.window_amount[rows] = self.amounts[rows].sum(axis=1, dtype=np.float64)
+
+        self._slots = OrderedDict(zip(arrays["account_ids"][keep].tolist(), rows.tolist()))
+        # Rows are handed out from the end of the free list, lowest first
+        self._free = self._free[:self.max_accounts - n]
+        logger.info(f"Restored feature store snapshot with {n} accounts from {path}")
+        return n
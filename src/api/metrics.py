@@ -0,0 +1,243 @@
+"""Low-overhead request metrics in Prometheus text format.
+
+Histograms use fixed buckets: recording a value is one ``bisect`` and two
+additions on plain Python lists, so timing every stage of a request costs a
+few microseconds. Cumulative bucket counts are only computed when ``/metrics``
+is scraped.
+
+:class:`MetricsMiddleware` times whole requests and splits off the time spent
+before the endpoint runs (body read, JSON parsing and validation) and after
+it returns (response serialization). Endpoints record their own stages with
+:data:`STAGE_LATENCY`.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from src.api.batching import BATCH_SIZE_BUCKETS
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from 50 us to 10 s
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Request scope keys shared by the middleware and the endpoints
+START_KEY = "metrics.start"
+HANDLER_END_KEY = "metrics.handler_end"
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Fixed-bucket histogram with optional labels."""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self._series: Dict[Tuple[str, ...], _HistogramSeries] = {}
+
+    def labels(self, *labels: str) -> "_HistogramSeries":
+        """Series for fixed label values, skipping the label lookup on every observation."""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _HistogramSeries(self.buckets)
+        return series
+
+    def observe(self, value: float, *labels: str):
+        self.labels(*labels).observe(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        for labels, series in sorted(self._series.items()):
+            counts, total = series.counts, series.total
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                le = _format_labels(self.label_names, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            suffix = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class _HistogramSeries:
+    """Bucket counts (the last one is +Inf) and sum for one set of label values."""
+
+    __slots__ = ("buckets", "counts", "total")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class CallbackMetric:
+    """Gauge or counter whose values are read from a callback at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], Iterable[Tuple[Tuple[str, ...], float]]],
+        label_names: Sequence[str] = (),
+        metric_type: str = "gauge"
+    ):
+        """
+        Args:
+            name: Metric name
+            documentation: Help text
+            read: Returns (label_values, value) pairs; may return nothing
+            label_names: Names of the labels
+            metric_type: 'gauge' or 'counter'
+        """
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+        self.label_names = tuple(label_names)
+        self.metric_type = metric_type
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for labels, value in self.read():
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "fraud_api_request_duration_seconds", "End-to-end request latency.",
+    LATENCY_BUCKETS, ("endpoint",)
+))
+STAGE_LATENCY = REGISTRY.register(Histogram(
+    "fraud_api_stage_duration_seconds", "Latency of each request processing stage.",
+    LATENCY_BUCKETS, ("stage",)
+))
+BATCH_SIZE = REGISTRY.register(Histogram(
+    "fraud_api_batch_size", "Transactions scored per model call.",
+    BATCH_SIZE_BUCKETS, ("source",)
+))
+
+# Pre-bound stage series for the hot path
+STAGE_PARSE = STAGE_LATENCY.labels("parse")
+STAGE_SERIALIZE = STAGE_LATENCY.labels("serialize")
+
+REQUESTS_TOTAL = REGISTRY.register(Counter(
+    "fraud_api_requests_total", "Requests served.", ("endpoint", "status")
+))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency, status and in-flight count."""
+
+    def __init__(self, app, endpoints: Sequence[str] = ()):
+        """
+        Args:
+            app: ASGI application
+            endpoints: Paths reported under their own label; other paths are reported as 'other'
+        """
+        self.app = app
+        self.endpoints = frozenset(endpoints)
+        self.in_flight = 0
+        REGISTRY.register(CallbackMetric(
+            "fraud_api_requests_in_flight", "Requests currently being processed.",
+            lambda: [((), self.in_flight)]
+        ))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        scope[START_KEY] = started
+        endpoint = scope["path"] if scope["path"] in self.endpoints else "other"
+        status = "500"
+
+        async def send_with_metrics(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                handler_end = scope.get(HANDLER_END_KEY)
+                if handler_end is not None:
+                    STAGE_SERIALIZE.observe(time.perf_counter() - handler_end)
+            await send(message)
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            self.in_flight -= 1
+            REQUEST_LATENCY.observe(time.perf_counter() - started, endpoint)
+            REQUESTS_TOTAL.inc(endpoint, status)
+
+
+def handler_started(scope: dict):
+    """Record the time spent reading and validating the request before the endpoint ran."""
+    started = scope.get(START_KEY)
+    if started is not None:
+        STAGE_PARSE.observe(time.perf_counter() - started)
+
+
+def handler_finished(scope: dict):
+    """Mark the end of the endpoint so the middleware can time response serialization."""
+    scope[HANDLER_END_KEY] = time.perf_counter()
@@ -0,0 +1,217 @@
+"""Pre-fork production server for the fraud detection API.
+
+The parent process loads and warms the model bundle once, freezes the
+garbage collector and binds the listening socket. It then forks the
+workers. Each worker serves the inherited socket with its own uvicorn event
+loop. The model's arrays are never written after loading, so their memory
+pages stay shared copy-on-write between all workers. Total memory therefore
+stays near one model copy however many cores are used.
+
+Native thread pools (OpenMP/BLAS) are capped per worker before NumPy is
+imported, so N workers do not oversubscribe the cores.
+"""
+
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List
+
+# Environment variables read by the native thread pools at import time
+THREAD_LIMIT_VARS = (
+    "OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS"
+)
+
+# Set in each worker to its index, which a restarted worker keeps
+WORKER_INDEX_VAR = "API_WORKER_INDEX"
+
+# Fields of /proc/<pid>/smaps_rollup reported per worker (kB)
+MEMORY_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared_clean",
+    "Shared_Dirty": "shared_dirty",
+    "Private_Clean": "private_clean",
+    "Private_Dirty": "private_dirty"
+}
+
+
+def limit_native_threads(threads: int):
+    """Cap OpenMP/BLAS threads; must run before NumPy is imported to take effect."""
+    for name in THREAD_LIMIT_VARS:
+        os.environ[name] = str(threads)
+
+
+def process_memory(pid="self") -> Dict[str, int]:
+    """
+    Memory of a process in bytes, split into shared and private pages where available.
+
+    Returns:
+        Dictionary with 'rss' and, on Linux, 'pss' and shared/private breakdowns
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            memory = {}
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in MEMORY_FIELDS:
+                    memory[MEMORY_FIELDS[key]] = int(rest.split()[0]) * 1024
+            return memory
+    except OSError:
+        pass
+
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return {"rss": int(line.split()[1]) * 1024}
+    except OSError:
+        pass
+
+    if pid == "self":
+        import resource
+        # ru_maxrss is the peak RSS in kB on Linux
+        return {"max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+    return {}
+
+
+def _format_mb(memory: Dict[str, int]) -> str:
+    return ", ".join(f"{name} {value / 2**20:.1f} MB" for name, value in memory.items())
+
+
+class PreforkServer:
+    """Load the app once, then fork workers sharing the model and the socket."""
+
+    def __init__(
+        self,
+        app_path: str = "src.api.app:app",
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        workers: int = 2,
+        threads_per_worker: int = 1,
+        report_interval: float = 60.0,
+        log_level: str = "info"
+    ):
+        """
+        Args:
+            app_path: Import path of the ASGI app ('module:attribute')
+            host: Interface to bind
+            port: Port to bind
+            workers: Number of worker processes
+            threads_per_worker: OpenMP/BLAS threads allowed in each worker
+            report_interval: Seconds between per-worker memory reports (0 disables)
+            log_level: uvicorn log level
+        """
+        self.app_path = app_path
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.report_interval = report_interval
+        self.log_level = log_level
+
+        self._children: Dict[int, int] = {}  # pid -> worker index
+        self._stopping = False
+        self._socket = None
+        self._app = None
+
+    def _load_app(self):
+        """Import the app and load its model bundle in the parent."""
+        import importlib
+
+        module_name, _, attribute = self.app_path.partition(":")
+        module = importlib.import_module(module_name)
+        module.load_model_artifacts()
+        self._app = getattr(module, attribute)
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET6 if ":" in self.host else socket.AF_INET)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn(self, index: int):
+        pid = os.fork()
+        if pid:
+            self._children[pid] = index
+            return
+
+        # Worker: restore default signal handling and serve the inherited socket
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.environ[WORKER_INDEX_VAR] = str(index)
+        exit_code = 0
+        try:
+            import uvicorn
+
+            config = uvicorn.Config(self._app, log_level=self.log_level)
+            uvicorn.Server(config).run(sockets=[self._socket])
+        except BaseException as e:
+            print(f"❌ Worker {index} failed: {e}", file=sys.stderr)
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def report_memory(self) -> List[dict]:
+        """Print and return the memory of the parent and every worker."""
+        report = [{"pid": os.getpid(), "role": "parent", **process_memory()}]
+        for pid, index in sorted(self._children.items(), key=lambda item: item[1]):
+            report.append({"pid": pid, "role": f"worker-{index}", **process_memory(pid)})
+
+        for entry in report:
+            memory = {k: v for k, v in entry.items() if k not in ("pid", "role")}
+            print(f"📊 {entry['role']} (pid {entry['pid']}): {_format_mb(memory)}")
+        return report
+
+    def run(self):
+        """Load the model, fork the workers and supervise them until stopped."""
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Pre-fork serving requires os.fork (use uvicorn --workers instead)")
+
+        limit_native_threads(self.threads_per_worker)
+        self._load_app()
+        self._socket = self._bind()
+
+        # Keep the collector from touching (and so copying) the loaded objects in workers
+        gc.collect()
+        gc.freeze()
+
+        print(f"🚀 Serving on {self.host}:{self.port} with {self.workers} workers "
+              f"({self.threads_per_worker} native thread(s) each)")
+        for index in range(self.workers):
+            self._spawn(index)
+
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+
+        next_report = time.monotonic() + self.report_interval
+        while self._children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                time.sleep(0.5)
+                if self.report_interval > 0 and time.monotonic() >= next_report:
+                    self.report_memory()
+                    next_report = time.monotonic() + self.report_interval
+                continue
+
+            index = self._children.pop(pid, None)
+            if index is None or self._stopping:
+                continue
+            print(f"⚠️  Worker {index} (pid {pid}) exited with status {status}, restarting")
+            self._spawn(index)
+
+        self._socket.close()
+        print("👋 All workers stopped")
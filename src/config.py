@@ -11,9 +11,12 @@ PROCESSED_DATA_DIR = DATA_DIR / "processed"
 MODELS_DIR = PROJECT_ROOT / "models"
 LOGS_DIR = PROJECT_ROOT / "logs"
 
-# Create directories if they don't exist
-for directory in [RAW_DATA_DIR, PROCESSED_DATA_DIR, MODELS_DIR, LOGS_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+
+def ensure_directories():
+    """Create the data, model and log directories (importing this module creates nothing)."""
+    for directory in [RAW_DATA_DIR, PROCESSED_DATA_DIR, MODELS_DIR, LOGS_DIR]:
+        directory.mkdir(parents=True, exist_ok=True)
+
 
 # MLflow configuration
 MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000")
@@ -29,10 +32,66 @@ MODEL_PARAMS = {
     "random_state": 42
 }
 
+# First-stage screener of the two-stage cascade (logistic regression)
+TRAIN_SCREENER = True
+SCREENER_PARAMS = {
+    "C": 1.0,
+    "class_weight": "balanced",
+    "max_iter": 1000
+}
+SCREENER_VALIDATION_SIZE = 0.25
+
 # Data parameters
 TEST_SIZE = 0.3
 RANDOM_STATE = 42
+RAW_DATA_FORMAT = os.getenv("RAW_DATA_FORMAT", "parquet")  # parquet, feather or csv
 
 # Fraud detection specific parameters
 FRAUD_THRESHOLD = 0.5  # Probability threshold for fraud classification
 IMBALANCE_RATIO = 0.1  # Expected ratio of fraud cases in synthetic data
+
+# API serving configuration
+API_MICROBATCH_ENABLED = os.getenv("API_MICROBATCH_ENABLED", "false").lower() == "true"
+API_MICROBATCH_MAX_SIZE = int(os.getenv("API_MICROBATCH_MAX_SIZE", "256"))
+API_MICROBATCH_MAX_WAIT_MS = float(os.getenv("API_MICROBATCH_MAX_WAIT_MS", "2"))
+API_EXECUTOR = os.getenv("API_EXECUTOR", "thread")  # thread, process or inline
+API_EXECUTOR_WORKERS = int(os.getenv("API_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+API_MAX_CONCURRENT_INFERENCE = int(os.getenv("API_MAX_CONCURRENT_INFERENCE", str(API_EXECUTOR_WORKERS)))
+API_MODEL_WATCH_INTERVAL = float(os.getenv("API_MODEL_WATCH_INTERVAL", "10"))  # seconds, 0 disables
+API_STREAM_CHUNK_SIZE = int(os.getenv("API_STREAM_CHUNK_SIZE", "1000"))
+API_MODEL_ENGINE = os.getenv("API_MODEL_ENGINE", "auto")  # auto, compiled or sklearn
+API_COMPILED_MAX_ROWS = int(os.getenv("API_COMPILED_MAX_ROWS", "512"))
+API_EARLY_EXIT = os.getenv("API_EARLY_EXIT", "false").lower() == "true"
+API_EARLY_EXIT_DELTA = float(os.getenv("API_EARLY_EXIT_DELTA", "0.01"))
+API_EARLY_EXIT_BLOCK_TREES = int(os.getenv("API_EARLY_EXIT_BLOCK_TREES", "25"))
+API_CASCADE = os.getenv("API_CASCADE", "false").lower() == "true"
+API_PREDICTION_CACHE_SIZE = int(os.getenv("API_PREDICTION_CACHE_SIZE", "10000"))  # 0 disables
+API_PREDICTION_CACHE_TTL = float(os.getenv("API_PREDICTION_CACHE_TTL", "60"))  # seconds
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))  # > 1 starts the pre-fork server in run_api.py
+API_THREADS_PER_WORKER = int(os.getenv("API_THREADS_PER_WORKER", "1"))
+API_WORKER_REPORT_INTERVAL = float(os.getenv("API_WORKER_REPORT_INTERVAL", "60"))  # seconds, 0 disables
+# Large enough to admit a full micro-batch; 0 disables admission control
+API_ADMISSION_MAX_CONCURRENCY = int(os.getenv("API_ADMISSION_MAX_CONCURRENCY", str(API_MICROBATCH_MAX_SIZE)))
+API_ADMISSION_MAX_QUEUE = int(os.getenv("API_ADMISSION_MAX_QUEUE", "1024"))
+API_ADMISSION_LATENCY_TARGET_MS = float(os.getenv("API_ADMISSION_LATENCY_TARGET_MS", "500"))
+API_FEATURE_STORE = os.getenv("API_FEATURE_STORE", "false").lower() == "true"
+API_FEATURE_STORE_MAX_ACCOUNTS = int(os.getenv("API_FEATURE_STORE_MAX_ACCOUNTS", "100000"))
+API_FEATURE_STORE_RING_SIZE = int(os.getenv("API_FEATURE_STORE_RING_SIZE", "32"))
+API_FEATURE_STORE_WINDOW_SECONDS = float(os.getenv("API_FEATURE_STORE_WINDOW_SECONDS", "86400"))
+API_FEATURE_STORE_SNAPSHOT_PATH = Path(os.getenv(
+    "API_FEATURE_STORE_SNAPSHOT_PATH", str(DATA_DIR / "feature_store" / "snapshot.npz")
+))
+API_FEATURE_STORE_SNAPSHOT_INTERVAL = float(os.getenv("API_FEATURE_STORE_SNAPSHOT_INTERVAL", "60"))  # seconds, 0 disables
+API_AUDIT_LOG = os.getenv("API_AUDIT_LOG", "false").lower() == "true"
+API_AUDIT_LOG_DIR = Path(os.getenv("API_AUDIT_LOG_DIR", str(LOGS_DIR / "audit")))
+API_AUDIT_MAX_PENDING_ROWS = int(os.getenv("API_AUDIT_MAX_PENDING_ROWS", "100000"))
+API_AUDIT_FLUSH_ROWS = int(os.getenv("API_AUDIT_FLUSH_ROWS", "10000"))
+API_AUDIT_FLUSH_INTERVAL = float(os.getenv("API_AUDIT_FLUSH_INTERVAL", "1"))  # seconds
+API_AUDIT_BACKPRESSURE = os.getenv("API_AUDIT_BACKPRESSURE", "drop")  # drop or block
+API_AUDIT_SEGMENT_MAX_MB = float(os.getenv("API_AUDIT_SEGMENT_MAX_MB", "64"))
+API_AUDIT_SEGMENT_MAX_AGE = float(os.getenv("API_AUDIT_SEGMENT_MAX_AGE", "3600"))  # seconds
+API_DRIFT_MONITOR = os.getenv("API_DRIFT_MONITOR", "true").lower() == "true"
+API_DRIFT_SAMPLE_RATE = float(os.getenv("API_DRIFT_SAMPLE_RATE", "0.05"))  # fraction of scored rows binned
+API_DRIFT_WINDOW_SECONDS = float(os.getenv("API_DRIFT_WINDOW_SECONDS", "3600"))
+API_DRIFT_BUCKETS = int(os.getenv("API_DRIFT_BUCKETS", "12"))
+API_DRIFT_MIN_ROWS = int(os.getenv("API_DRIFT_MIN_ROWS", "500"))
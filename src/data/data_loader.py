@@ -1,15 +1,34 @@
 """Data loading utilities for fraud detection."""
 
-import pandas as pd
 import numpy as np
 from pathlib import Path
 import logging
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+
+from src.data.storage import (
+    RAW_DTYPES, Filter, filter_mask, raw_data_path, read_csv_chunked, read_raw_data, resolve_format, write_raw_data
+)
+
+# pandas is imported where used to keep this module cheap to import
+if TYPE_CHECKING:
+    import pandas as pd
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Merchant categories in sorted order, so integer codes match a fitted LabelEncoder
+MERCHANT_CATEGORIES = ('gas', 'grocery', 'international', 'online', 'retail')
+_LEGITIMATE_CATEGORIES = np.array([4, 3, 1, 0], dtype=np.int8)  # retail, online, grocery, gas
+_FRAUD_CATEGORIES = np.array([3, 2], dtype=np.int8)              # online, international
+_FRAUD_HOURS = np.array([0, 1, 2, 3, 23], dtype=np.float32)
 
-def generate_fraud_data(n_samples: int = 10000, fraud_ratio: float = 0.1, save_path: Path = None) -> pd.DataFrame:
+
+def generate_fraud_data(
+    n_samples: int = 10000, fraud_ratio: float = 0.1, save_path: Path = None, data_format: str = "parquet"
+) -> "pd.DataFrame":
     """
     Generate synthetic fraud detection dataset.
     
@@ -17,10 +36,14 @@ def generate_fraud_data(n_samples: int = 10000, fraud_ratio: float = 0.1, save_p
         n_samples: Total number of transactions to generate
         fraud_ratio: Proportion of fraudulent transactions
         save_path: Optional path to save the raw data
+        data_format: Format of the saved file: parquet, feather or csv
+            (columnar formats fall back to CSV without pyarrow)
         
     Returns:
         DataFrame containing the fraud detection dataset
     """
+    import pandas as pd
+    
     logger.info(f"Generating synthetic fraud detection dataset with {n_samples} samples...")
     
     np.random.seed(42)
@@ -70,29 +93,224 @@ def generate_fraud_data(n_samples: int = 10000, fraud_ratio: float = 0.1, save_p
     
     # Save raw data if path provided
     if save_path:
-        save_path.mkdir(parents=True, exist_ok=True)
-        file_path = save_path / "fraud_transactions.csv"
-        df.to_csv(file_path, index=False)
-        logger.info(f"Saved raw data to {file_path}")
+        file_path = raw_data_path(save_path, resolve_format(data_format))
+        write_raw_data(df, file_path)
     
     return df
 
 
-def load_data_from_csv(file_path: Path) -> pd.DataFrame:
+def _generate_chunk(
+    start: int, n_rows: int, n_fraud: int, seed: np.random.SeedSequence
+) -> Dict[str, np.ndarray]:
+    """
+    Generate one shuffled chunk of transactions as NumPy columns (runs in a worker).
+
+    Rows follow the distributions of generate_fraud_data; merchant_category
+    holds codes into MERCHANT_CATEGORIES.
+    """
+    rng = np.random.default_rng(seed)
+    n_legitimate = n_rows - n_fraud
+    legitimate, fraud = slice(0, n_legitimate), slice(n_legitimate, n_rows)
+
+    columns = {name: np.empty(n_rows, dtype=dtype) for name, dtype in RAW_DTYPES.items()}
+    columns['amount'][legitimate] = rng.exponential(scale=50, size=n_legitimate)
+    columns['amount'][fraud] = rng.exponential(scale=200, size=n_fraud)
+    columns['time_of_day'][legitimate] = rng.normal(loc=12, scale=4, size=n_legitimate)
+    columns['time_of_day'][fraud] = rng.choice(_FRAUD_HOURS, size=n_fraud)
+    columns['transaction_frequency'][legitimate] = rng.poisson(lam=3, size=n_legitimate)
+    columns['transaction_frequency'][fraud] = rng.poisson(lam=8, size=n_fraud)
+    columns['account_age_days'][legitimate] = rng.gamma(shape=2, scale=180, size=n_legitimate)
+    columns['account_age_days'][fraud] = rng.gamma(shape=1, scale=30, size=n_fraud)
+    columns['merchant_category'][legitimate] = rng.choice(_LEGITIMATE_CATEGORIES, size=n_legitimate)
+    columns['merchant_category'][fraud] = rng.choice(_FRAUD_CATEGORIES, size=n_fraud)
+    columns['distance_from_home'][legitimate] = rng.exponential(scale=10, size=n_legitimate)
+    columns['distance_from_home'][fraud] = rng.exponential(scale=100, size=n_fraud)
+    columns['previous_fraud_rate'][legitimate] = rng.beta(a=1, b=50, size=n_legitimate)
+    columns['previous_fraud_rate'][fraud] = rng.beta(a=5, b=10, size=n_fraud)
+    columns['is_fraud'][legitimate] = 0
+    columns['is_fraud'][fraud] = 1
+
+    # Every chunk has the same fraud ratio, so shuffling within chunks is enough
+    order = rng.permutation(n_rows)
+    for name in RAW_DTYPES:
+        if name != 'transaction_id':
+            columns[name] = columns[name][order]
+    columns['transaction_id'] = np.arange(start + 1, start + n_rows + 1, dtype=np.int64)
+    return columns
+
+
+def generate_fraud_data_chunks(
+    n_samples: int,
+    fraud_ratio: float = 0.1,
+    chunk_size: int = 1_000_000,
+    n_workers: int = 1,
+    seed: int = 42,
+    as_frames: bool = True
+) -> Iterator:
+    """
+    Stream a synthetic fraud dataset of any size in fixed-size chunks.
+
+    Each chunk draws from its own random stream, spawned from one
+    SeedSequence, so the data depends only on the seed and chunk_size,
+    whatever the number of workers. Chunks are generated in parallel but
+    yielded in order, with at most two per worker held in memory.
+
+    Args:
+        n_samples: Total number of transactions to generate
+        fraud_ratio: Proportion of fraudulent transactions (in every chunk)
+        chunk_size: Rows per chunk (the last one may be shorter)
+        n_workers: Worker processes (1 generates in this process)
+        seed: Seed of the root SeedSequence
+        as_frames: Yield DataFrames with merchant_category as a pandas
+            Categorical; otherwise dictionaries of NumPy columns with
+            category codes
+
+    Yields:
+        One chunk of transactions at a time
+    """
+    n_chunks = -(-n_samples // chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    tasks = []
+    for i in range(n_chunks):
+        start = i * chunk_size
+        end = min(start + chunk_size, n_samples)
+        # Fraud counts add up to int(n_samples * fraud_ratio) over all chunks
+        n_fraud = int(end * fraud_ratio) - int(start * fraud_ratio)
+        tasks.append((start, end - start, n_fraud, seeds[i]))
+
+    logger.info(f"Generating {n_samples} transactions in {n_chunks} chunks with {n_workers} workers...")
+    started = time.perf_counter()
+
+    if n_workers > 1:
+        pool = ProcessPoolExecutor(max_workers=n_workers)
+        pending = deque()
+        try:
+            for task in tasks:
+                pending.append(pool.submit(_generate_chunk, *task))
+                if len(pending) >= 2 * n_workers:
+                    yield _as_chunk(pending.popleft().result(), as_frames)
+            while pending:
+                yield _as_chunk(pending.popleft().result(), as_frames)
+        finally:
+            pool.shutdown(cancel_futures=True)
+    else:
+        for task in tasks:
+            yield _as_chunk(_generate_chunk(*task), as_frames)
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Generated {n_samples} transactions in {elapsed:.1f} s ({n_samples / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def _as_chunk(columns: Dict[str, np.ndarray], as_frame: bool):
+    if not as_frame:
+        return columns
+    import pandas as pd
+
+    columns['merchant_category'] = pd.Categorical.from_codes(columns['merchant_category'], MERCHANT_CATEGORIES)
+    return pd.DataFrame(columns, copy=False)
+
+
+def save_fraud_data_chunks(
+    chunks: Iterator["pd.DataFrame"], file_path: Path, row_group_size: int = 262144
+) -> int:
+    """
+    Write DataFrame chunks to one file without holding more than a chunk in memory.
+
+    The format follows the file suffix: .parquet, .feather or .csv.
+
+    Args:
+        chunks: DataFrame chunks, e.g. from generate_fraud_data_chunks
+        file_path: Output file
+        row_group_size: Parquet rows per row group
+
+    Returns:
+        Number of rows written
+    """
+    return write_raw_data(chunks, file_path, row_group_size=row_group_size)
+
+
+def load_data_from_csv(
+    file_path: Path,
+    chunksize: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Filter]] = None
+) -> "pd.DataFrame":
     """
     Load data from a CSV file.
+
+    By default the whole file is parsed with inferred types. With a
+    chunksize, the file is streamed out-of-core with the declared raw
+    schema (float32, the smallest integer types, merchant_category as a
+    category): rows are filtered and columns projected chunk by chunk, so
+    memory depends on what is kept, not on the file size.
     
     Args:
         file_path: Path to the CSV file
+        chunksize: Rows parsed at a time (None reads the file in one go)
+        columns: Columns to keep (all when None)
+        filters: Row filters that must all hold, e.g. [("amount", ">", 100.0)]
         
     Returns:
         DataFrame containing the data
     """
+    import pandas as pd
+    
     logger.info(f"Loading data from {file_path}...")
-    df = pd.read_csv(file_path)
-    logger.info(f"Loaded dataset with shape: {df.shape}")
+    if chunksize is None:
+        df = pd.read_csv(file_path, usecols=columns if not filters else None)
+        if filters:
+            df = df[filter_mask(df, filters)].reset_index(drop=True)
+            if columns is not None:
+                df = df[columns]
+        logger.info(f"Loaded dataset with shape: {df.shape}")
+    else:
+        started = time.perf_counter()
+        df = read_csv_chunked(file_path, columns=columns, filters=filters, chunksize=chunksize)
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Loaded dataset with shape: {df.shape} in {elapsed:.2f} s ({len(df) / max(elapsed, 1e-9):,.0f} rows/s), "
+            f"{df.memory_usage(deep=True).sum() / 2**20:.1f} MB, peak RSS {_peak_rss() / 2**20:.0f} MB"
+        )
     
     if 'is_fraud' in df.columns:
         logger.info(f"Fraud cases: {df['is_fraud'].sum()} ({df['is_fraud'].mean()*100:.2f}%)")
     
     return df
+
+
+def _peak_rss() -> int:
+    """Peak resident memory of this process in bytes (0 where unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # ru_maxrss is in kB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def load_data(
+    file_path: Path, columns: Optional[List[str]] = None, filters: Optional[List[Filter]] = None
+) -> "pd.DataFrame":
+    """
+    Load the raw dataset from a Parquet, Feather or CSV file.
+
+    Parquet files only read the requested columns and skip row groups
+    whose statistics rule out the filters.
+
+    Args:
+        file_path: Path to the data file
+        columns: Columns to load (all when None)
+        filters: Row filters that must all hold, e.g. [("merchant_category", "==", "online")]
+
+    Returns:
+        DataFrame containing the data
+    """
+    logger.info(f"Loading data from {file_path}...")
+    started = time.perf_counter()
+    df = read_raw_data(file_path, columns=columns, filters=filters)
+    logger.info(f"Loaded dataset with shape: {df.shape} in {time.perf_counter() - started:.2f} s")
+
+    if 'is_fraud' in df.columns:
+        logger.info(f"Fraud cases: {df['is_fraud'].sum()} ({df['is_fraud'].mean()*100:.2f}%)")
+
+    return df
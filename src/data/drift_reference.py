@@ -0,0 +1,188 @@
+"""Reference feature distributions for drift monitoring.
+
+Training bins every encoded (unscaled) feature of the training set and stores
+the bin edges and the share of rows in each bin with the feature's column in
+the transform plan. Numeric features get quantile edges, so each bin holds
+about the same share of the training rows. Categorical features get one bin
+per category code.
+
+Serving takes a uniform sample of the rows of each scored batch
+(:meth:`DriftReference.sample_index`), encodes them without imputing missing
+values, bins the observed values against the same edges
+(:meth:`DriftReference.sketch`) and compares the accumulated counts with the
+reference shares (:func:`population_stability_index`, :func:`ks_statistic`).
+
+This module only depends on NumPy, like :mod:`src.data.transform_plan`.
+"""
+
+import random
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+DEFAULT_REFERENCE_BINS = 20
+
+# Probability floor so empty bins do not make the PSI infinite
+_PSI_EPSILON = 1e-4
+
+
+def bin_index(edges: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Bin of each value: the number of inner edges at or below it."""
+    return np.searchsorted(edges, values, side="right")
+
+
+def add_reference_distributions(plan: dict, X: np.ndarray, n_bins: int = DEFAULT_REFERENCE_BINS) -> dict:
+    """
+    Store the binned distribution of each feature in a transform plan.
+
+    Args:
+        plan: Transform plan built by ``build_transform_plan``
+        X: Encoded, unscaled training features in plan column order
+        n_bins: Bins per numeric feature (fewer when quantiles coincide)
+
+    Returns:
+        The plan, with a ``reference`` entry added to every column
+    """
+    quantiles = np.linspace(0.0, 1.0, n_bins + 1)[1:-1]
+    for j, column in enumerate(plan["columns"]):
+        values = X[:, j].astype(np.float64)
+        if column["kind"] == "categorical":
+            edges = np.arange(len(column["categories"]) - 1) + 0.5
+        else:
+            edges = np.unique(np.quantile(values, quantiles))
+
+        counts = np.bincount(bin_index(edges, values), minlength=len(edges) + 1)
+        column["reference"] = {
+            "edges": edges.tolist(),
+            "proportions": (counts / max(len(values), 1)).tolist()
+        }
+    return plan
+
+
+class BatchSketch(NamedTuple):
+    """Bin counts and value range of one scored batch, in raw feature units."""
+    counts: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    n_rows: int
+
+
+class DriftReference:
+    """Reference distributions of a transform plan, compiled for batch binning."""
+
+    def __init__(self, plan: dict):
+        columns = plan["columns"]
+        self.feature_names = [c["name"] for c in columns]
+        self.kinds = [c["kind"] for c in columns]
+        self.n_features = len(columns)
+
+        edges = [np.asarray(c["reference"]["edges"], dtype=np.float64) for c in columns]
+        self.n_bins = np.array([len(e) + 1 for e in edges], dtype=np.intp)
+        self.max_bins = int(self.n_bins.max())
+
+        # Rows padded with +inf edges (never reached) and zero shares
+        self.edges = np.full((self.n_features, self.max_bins - 1), np.inf)
+        self.proportions = np.zeros((self.n_features, self.max_bins))
+        for j, (e, c) in enumerate(zip(edges, columns)):
+            self.edges[j, :len(e)] = e
+            self.proportions[j, :len(e) + 1] = c["reference"]["proportions"]
+
+        self._offsets = (np.arange(self.n_features) * self.max_bins)[:, None]
+
+    @classmethod
+    def from_plan(cls, plan: dict) -> Optional["DriftReference"]:
+        """Compile a plan's reference distributions (None if training did not save them)."""
+        if not plan["columns"] or any("reference" not in c for c in plan["columns"]):
+            return None
+        return cls(plan)
+
+    def bin_edges(self, j: int) -> np.ndarray:
+        """Inner bin edges of feature j."""
+        return self.edges[j, :self.n_bins[j] - 1]
+
+    def sample_index(self, n_rows: int, sample_rate: float = 1.0) -> Optional[np.ndarray]:
+        """
+        Pick a uniform sample of the rows of a batch.
+
+        Every k-th row (k = 1 / sample_rate) is taken from a random offset, so
+        each row is kept with probability sample_rate whatever the batch size.
+
+        Args:
+            n_rows: Number of rows in the batch
+            sample_rate: Fraction of the rows to keep
+
+        Returns:
+            Indices of the sampled rows (None if no row was sampled)
+        """
+        step = max(int(round(1.0 / sample_rate)), 1)
+        index = np.arange(random.randrange(step) if step > 1 else 0, n_rows, step)
+        return index if len(index) else None
+
+    def sketch(self, X: np.ndarray) -> BatchSketch:
+        """
+        Bin rows of raw (unscaled) encoded features.
+
+        Missing values (NaN) are not binned, so a feature's counts only cover
+        the rows where it was observed.
+
+        Args:
+            X: Features of shape (n_rows, n_features) in plan column order
+
+        Returns:
+            Counts of shape (n_features, max_bins), the per-feature range and the row count
+        """
+        # One contiguous row per feature keeps searchsorted and the reductions fast
+        XT = np.ascontiguousarray(X.T)
+        bins = np.empty(XT.shape, dtype=np.intp)
+        for j in range(self.n_features):
+            bins[j] = bin_index(self.bin_edges(j), XT[j])
+        bins += self._offsets
+
+        observed = ~np.isnan(XT)
+        counts = np.bincount(bins[observed], minlength=self.n_features * self.max_bins)
+        return BatchSketch(
+            counts.reshape(self.n_features, self.max_bins),
+            np.fmin.reduce(XT, axis=1, initial=np.inf),
+            np.fmax.reduce(XT, axis=1, initial=-np.inf),
+            len(X)
+        )
+
+    def quantiles(
+        self, counts: np.ndarray, minimum: np.ndarray, maximum: np.ndarray, probabilities: List[float]
+    ) -> np.ndarray:
+        """
+        Estimate feature quantiles from bin counts, interpolating linearly
+        within a bin; the outer bins are bounded by the observed range. The
+        estimates are coarse where live values leave the reference range,
+        since everything beyond it shares one open-ended bin.
+
+        Returns:
+            Array of shape (n_features, len(probabilities)), NaN for features without data
+        """
+        result = np.full((self.n_features, len(probabilities)), np.nan)
+        for j in range(self.n_features):
+            total = counts[j].sum()
+            if not total:
+                continue
+            bounds = np.concatenate(([minimum[j]], self.bin_edges(j), [maximum[j]]))
+            bounds = np.clip(bounds, minimum[j], maximum[j])
+            cdf = np.concatenate(([0.0], np.cumsum(counts[j, :self.n_bins[j]]) / total))
+            result[j] = np.interp(probabilities, cdf, bounds)
+        return result
+
+
+def population_stability_index(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """
+    PSI of each row of bin shares against the reference shares.
+
+    Both arguments have shape (n_features, n_bins) and rows summing to one.
+    Below 0.1 is usually read as stable, above 0.25 as a significant shift.
+    """
+    expected = np.maximum(expected, _PSI_EPSILON)
+    actual = np.maximum(actual, _PSI_EPSILON)
+    return ((actual - expected) * np.log(actual / expected)).sum(axis=1)
+
+
+def ks_statistic(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """Largest gap between the binned reference and live CDFs, per feature (a binned KS statistic)."""
+    return np.abs(np.cumsum(actual, axis=1) - np.cumsum(expected, axis=1)).max(axis=1)
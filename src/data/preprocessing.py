@@ -1,22 +1,36 @@
 """Data preprocessing utilities for fraud detection."""
 
-import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
 from pathlib import Path
 import logging
+import math
 import pickle
+import time
+from typing import TYPE_CHECKING, Callable, Iterable, Union
+
+from src.data.drift_reference import add_reference_distributions
+from src.data.storage import iter_raw_data
+from src.data.transform_plan import build_transform_plan, save_transform_plan
+
+# pandas and sklearn are imported where used to keep this module cheap to import
+if TYPE_CHECKING:
+    import pandas as pd
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows per StandardScaler.partial_fit call in the lean path
+_SCALER_BLOCK_ROWS = 1 << 16
+# Training rows the streaming path computes the reference distributions from
+_REFERENCE_SAMPLE_ROWS = 100_000
+
 
 def preprocess_data(
-    df: pd.DataFrame,
+    df: "pd.DataFrame",
     test_size: float = 0.2,
     random_state: int = 42,
-    save_path: Path = None
+    save_path: Path = None,
+    lean: bool = False
 ) -> tuple:
     """
     Preprocess the fraud detection data: encode, split and scale.
@@ -26,24 +40,35 @@ def preprocess_data(
         test_size: Proportion of test set
         random_state: Random seed
         save_path: Optional path to save processed data
+        lean: Build one float32 feature matrix without copying the frame and
+            scale it in place (same split, float32 instead of float64
+            features, about a fifth of the peak memory)
         
     Returns:
         Tuple of (X_train, X_test, y_train, y_test, scaler, encoders)
     """
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler, LabelEncoder
+    
     logger.info("Starting data preprocessing...")
     
     # Separate features and target
     feature_columns = [col for col in df.columns if col not in ['is_fraud', 'transaction_id']]
     
+    if lean:
+        return _preprocess_lean(df, feature_columns, test_size, random_state, save_path)
+    
     # Encode categorical variables
     encoders = {}
+    category_defaults = {}
     df_processed = df.copy()
     
-    categorical_cols = df_processed[feature_columns].select_dtypes(include=['object']).columns
+    categorical_cols = df_processed[feature_columns].select_dtypes(include=['object', 'category']).columns
     for col in categorical_cols:
         encoder = LabelEncoder()
         df_processed[col] = encoder.fit_transform(df_processed[col])
         encoders[col] = encoder
+        category_defaults[col] = df[col].mode().iloc[0]
         logger.info(f"Encoded categorical column: {col}")
     
     X = df_processed[feature_columns].values
@@ -68,25 +93,382 @@ def preprocess_data(
     
     # Save processed data if path provided
     if save_path:
-        save_path.mkdir(parents=True, exist_ok=True)
-        
-        np.save(save_path / "X_train.npy", X_train_scaled)
-        np.save(save_path / "X_test.npy", X_test_scaled)
-        np.save(save_path / "y_train.npy", y_train)
-        np.save(save_path / "y_test.npy", y_test)
-        
-        # Save scaler
-        with open(save_path / "scaler.pkl", 'wb') as f:
-            pickle.dump(scaler, f)
-        
-        # Save encoders
-        with open(save_path / "encoders.pkl", 'wb') as f:
-            pickle.dump(encoders, f)
-        
-        # Save feature names
-        with open(save_path / "feature_names.pkl", 'wb') as f:
-            pickle.dump(feature_columns, f)
-        
-        logger.info(f"Saved processed data to {save_path}")
+        # The transform plan used by the API to encode requests, with the
+        # training distributions the API compares live traffic against
+        plan = build_transform_plan(feature_columns, encoders, scaler, category_defaults)
+        add_reference_distributions(plan, X_train)
+        save_processed_data(
+            save_path, X_train_scaled, X_test_scaled, y_train, y_test, scaler, encoders, feature_columns, plan
+        )
     
     return X_train_scaled, X_test_scaled, y_train, y_test, scaler, encoders
+
+
+def _preprocess_lean(
+    df: "pd.DataFrame",
+    feature_columns: list,
+    test_size: float,
+    random_state: int,
+    save_path: Path = None
+) -> tuple:
+    """
+    Copy-free variant of preprocess_data.
+
+    The split is drawn on row indices (the same split train_test_split makes
+    on the full matrix), and each column is written once, in train-then-test
+    row order, into a single C-contiguous float32 matrix. X_train and X_test
+    are views of that matrix, scaled in place. Temporary memory is a column
+    at a time.
+    """
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    y_all = df['is_fraud'].to_numpy()
+    index_dtype = np.int32 if len(df) < 2**31 else np.int64
+    train_index, test_index = train_test_split(
+        np.arange(len(df), dtype=index_dtype), test_size=test_size, random_state=random_state, stratify=y_all
+    )
+    n_train = len(train_index)
+    order = np.concatenate([train_index, test_index])
+    del train_index, test_index
+
+    X = np.empty((len(df), len(feature_columns)), dtype=np.float32)
+    encoders = {}
+    category_defaults = {}
+    for j, col in enumerate(feature_columns):
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            X[:, j] = values.to_numpy()[order]
+        else:
+            encoders[col], category_defaults[col], codes = _encode_column(values)
+            X[:, j] = codes[order]
+            logger.info(f"Encoded categorical column: {col}")
+
+    y = y_all[order]
+    del order
+    X_train, X_test = X[:n_train], X[n_train:]
+    y_train, y_test = y[:n_train], y[n_train:]
+
+    logger.info(f"Features shape: {X.shape} ({X.dtype}, {X.nbytes / 2**20:.1f} MB), Target shape: {y.shape}")
+    logger.info(f"Train set size: {len(X_train)}, Test set size: {len(X_test)}")
+    logger.info(f"Train fraud rate: {y_train.mean()*100:.2f}%")
+    logger.info(f"Test fraud rate: {y_test.mean()*100:.2f}%")
+
+    # Fit on row blocks so no float64 copy of the training matrix is made
+    scaler = StandardScaler()
+    for start in range(0, n_train, _SCALER_BLOCK_ROWS):
+        scaler.partial_fit(X_train[start:start + _SCALER_BLOCK_ROWS])
+
+    plan = None
+    if save_path:
+        # Reference distributions need the unscaled features
+        plan = build_transform_plan(feature_columns, encoders, scaler, category_defaults)
+        add_reference_distributions(plan, X_train)
+
+    scaler.transform(X, copy=False)
+
+    if save_path:
+        save_processed_data(save_path, X_train, X_test, y_train, y_test, scaler, encoders, feature_columns, plan)
+
+    return X_train, X_test, y_train, y_test, scaler, encoders
+
+
+def _encode_column(values: "pd.Series") -> tuple:
+    """
+    Label-encode a categorical or string column without copying it.
+
+    Returns:
+        Tuple of (fitted LabelEncoder, most frequent category, float32 codes)
+    """
+    import pandas as pd
+    from sklearn.preprocessing import LabelEncoder
+
+    codes, uniques = pd.factorize(values)
+    if (codes < 0).any():
+        raise ValueError(f"Column {values.name} has missing values")
+    uniques = np.asarray(uniques, dtype=object)
+
+    # LabelEncoder classes are sorted, whatever the order categories were seen in
+    encoder = LabelEncoder().fit(uniques)
+    sorted_codes = np.searchsorted(encoder.classes_, uniques)
+    counts = np.zeros(len(uniques), dtype=np.int64)
+    counts[sorted_codes] = np.bincount(codes, minlength=len(uniques))
+    # Ties go to the first class in sorted order, as with Series.mode
+    default = encoder.classes_[counts.argmax()]
+    return encoder, default, sorted_codes.astype(np.float32)[codes]
+
+
+def save_processed_data(
+    save_path: Path,
+    X_train: np.ndarray,
+    X_test: np.ndarray,
+    y_train: np.ndarray,
+    y_test: np.ndarray,
+    scaler,
+    encoders: dict,
+    feature_columns: list,
+    plan: dict
+):
+    """Save the processed arrays, the fitted transformers and the transform plan."""
+    save_path.mkdir(parents=True, exist_ok=True)
+    
+    np.save(save_path / "X_train.npy", X_train)
+    np.save(save_path / "X_test.npy", X_test)
+    np.save(save_path / "y_train.npy", y_train)
+    np.save(save_path / "y_test.npy", y_test)
+    save_preprocessing_artifacts(save_path, scaler, encoders, feature_columns, plan)
+
+
+def save_preprocessing_artifacts(save_path: Path, scaler, encoders: dict, feature_columns: list, plan: dict):
+    """Save the fitted transformers, the feature names and the transform plan."""
+    save_path.mkdir(parents=True, exist_ok=True)
+    
+    # Save scaler
+    with open(save_path / "scaler.pkl", 'wb') as f:
+        pickle.dump(scaler, f)
+    
+    # Save encoders
+    with open(save_path / "encoders.pkl", 'wb') as f:
+        pickle.dump(encoders, f)
+    
+    # Save feature names
+    with open(save_path / "feature_names.pkl", 'wb') as f:
+        pickle.dump(feature_columns, f)
+    
+    save_transform_plan(plan, save_path)
+    
+    logger.info(f"Saved processed data to {save_path}")
+
+
+def preprocess_data_streaming(
+    source: Union[Path, Callable[[], Iterable["pd.DataFrame"]]],
+    save_path: Path,
+    test_size: float = 0.2,
+    random_state: int = 42,
+    chunksize: int = 1_000_000
+) -> tuple:
+    """
+    Preprocess a dataset larger than memory, one chunk at a time.
+
+    The source is read twice:
+
+    1. Draw the stratified train/test split of each chunk and accumulate
+       the category vocabularies and counts and the StandardScaler
+       statistics of the training rows (partial_fit).
+    2. Encode and scale each chunk and write its rows straight into
+       preallocated memory-mapped X/y .npy files in save_path.
+
+    The split of a chunk is drawn from a random stream seeded by
+    random_state and the chunk number, with the test count of each class
+    carried over from chunk to chunk, so both passes see the same split and
+    the class ratio is the same in train and test, as with
+    train_test_split. Rows keep their source order. Reference
+    distributions for drift monitoring are computed from an evenly spaced
+    sample of at most _REFERENCE_SAMPLE_ROWS training rows.
+
+    Memory use depends on the chunk size only. The source must yield the
+    same chunks on both passes.
+
+    Args:
+        source: Raw data file (.parquet, .feather or .csv), or a function
+            returning a fresh iterable of DataFrame chunks on each call
+        save_path: Directory of the processed data
+        test_size: Proportion of test set
+        random_state: Random seed
+        chunksize: Rows per chunk when reading a file
+
+    Returns:
+        Tuple of (X_train, X_test, y_train, y_test, scaler, encoders); the
+        arrays are read-only memory maps of the saved .npy files
+    """
+    import pandas as pd
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+    if callable(source):
+        chunks = source
+    else:
+        def chunks():
+            return iter_raw_data(source, chunksize=chunksize)
+
+    logger.info("Starting streaming data preprocessing (pass 1: split, vocabularies and scaler statistics)...")
+    started = time.perf_counter()
+
+    feature_columns = None
+    categorical_cols = []
+    numeric_cols = []
+    numeric_scaler = StandardScaler()
+    category_counts = {}   # all rows, for the defaults
+    train_category_counts = {}   # training rows, for the scaler statistics
+    class_counts = {}
+    n_rows = n_test = 0
+    for i, chunk in enumerate(chunks()):
+        if feature_columns is None:
+            feature_columns = [col for col in chunk.columns if col not in ['is_fraud', 'transaction_id']]
+            for col in feature_columns:
+                if pd.api.types.is_numeric_dtype(chunk[col].dtype):
+                    numeric_cols.append(col)
+                else:
+                    categorical_cols.append(col)
+                    category_counts[col] = {}
+                    train_category_counts[col] = {}
+
+        y = chunk['is_fraud'].to_numpy()
+        test_mask = _split_mask(y, test_size, random_state, i, class_counts)
+        train_mask = ~test_mask
+        n_rows += len(y)
+        n_test += int(test_mask.sum())
+
+        for col in categorical_cols:
+            codes, uniques = pd.factorize(chunk[col])
+            if (codes < 0).any():
+                raise ValueError(f"Column {col} has missing values")
+            _add_counts(category_counts[col], uniques, np.bincount(codes, minlength=len(uniques)))
+            _add_counts(train_category_counts[col], uniques, np.bincount(codes[train_mask], minlength=len(uniques)))
+        if numeric_cols and train_mask.any():
+            numeric_scaler.partial_fit(chunk[numeric_cols].to_numpy(dtype=np.float32)[train_mask])
+
+    if feature_columns is None:
+        raise ValueError("The source yielded no rows")
+    n_train = n_rows - n_test
+    logger.info(f"Pass 1 read {n_rows} rows in {time.perf_counter() - started:.1f} s")
+    logger.info(f"Train set size: {n_train}, Test set size: {n_test}")
+
+    # Vocabularies and defaults, as LabelEncoder and Series.mode would give on the whole frame
+    encoders = {}
+    category_defaults = {}
+    lookups = {}
+    for col in categorical_cols:
+        encoders[col] = LabelEncoder().fit(np.array(list(category_counts[col]), dtype=object))
+        classes = encoders[col].classes_
+        counts = np.array([category_counts[col][c] for c in classes])
+        category_defaults[col] = classes[counts.argmax()]
+        lookups[col] = pd.Index(classes)
+        logger.info(f"Encoded categorical column: {col}")
+
+    scaler = _combine_scaler(
+        feature_columns, numeric_cols, numeric_scaler, encoders, train_category_counts, n_train
+    )
+
+    logger.info("Pass 2: encoding, scaling and writing rows...")
+    started = time.perf_counter()
+    save_path.mkdir(parents=True, exist_ok=True)
+    n_features = len(feature_columns)
+    X_train = np.lib.format.open_memmap(save_path / "X_train.npy", mode='w+', dtype=np.float32, shape=(n_train, n_features))
+    X_test = np.lib.format.open_memmap(save_path / "X_test.npy", mode='w+', dtype=np.float32, shape=(n_test, n_features))
+    y_train = y_test = None
+    reference_step = max(1, -(-n_train // _REFERENCE_SAMPLE_ROWS))
+    reference_sample = []
+
+    class_counts = {}
+    train_offset = test_offset = 0
+    for i, chunk in enumerate(chunks()):
+        y = chunk['is_fraud'].to_numpy()
+        if y_train is None:
+            y_train = np.lib.format.open_memmap(save_path / "y_train.npy", mode='w+', dtype=y.dtype, shape=(n_train,))
+            y_test = np.lib.format.open_memmap(save_path / "y_test.npy", mode='w+', dtype=y.dtype, shape=(n_test,))
+        test_mask = _split_mask(y, test_size, random_state, i, class_counts)
+        train_mask = ~test_mask
+
+        X = np.empty((len(y), n_features), dtype=np.float32)
+        for j, col in enumerate(feature_columns):
+            if col in lookups:
+                codes, uniques = pd.factorize(chunk[col])
+                X[:, j] = lookups[col].get_indexer(uniques)[codes]
+            else:
+                X[:, j] = chunk[col].to_numpy()
+        del chunk
+
+        X_chunk_train = X[train_mask]
+        # Every reference_step-th training row, counted over the whole dataset
+        first = -train_offset % reference_step
+        reference_sample.append(X_chunk_train[first::reference_step].copy())
+        X_chunk_test = X[test_mask]
+        del X
+        for rows in (X_chunk_train, X_chunk_test):
+            if len(rows):
+                scaler.transform(rows, copy=False)
+
+        end = train_offset + len(X_chunk_train)
+        X_train[train_offset:end] = X_chunk_train
+        y_train[train_offset:end] = y[train_mask]
+        train_offset = end
+        end = test_offset + len(X_chunk_test)
+        X_test[test_offset:end] = X_chunk_test
+        y_test[test_offset:end] = y[test_mask]
+        test_offset = end
+
+    if (train_offset, test_offset) != (n_train, n_test):
+        raise ValueError("The source yielded different rows on the second pass")
+    for array in (X_train, X_test, y_train, y_test):
+        array.flush()
+    del X_train, X_test, y_train, y_test
+    logger.info(f"Pass 2 wrote {n_rows} rows in {time.perf_counter() - started:.1f} s")
+
+    plan = build_transform_plan(feature_columns, encoders, scaler, category_defaults)
+    add_reference_distributions(plan, np.concatenate(reference_sample))
+    save_preprocessing_artifacts(save_path, scaler, encoders, feature_columns, plan)
+
+    return tuple(np.load(save_path / f"{name}.npy", mmap_mode='r') for name in ("X_train", "X_test", "y_train", "y_test")) \
+        + (scaler, encoders)
+
+
+def _split_mask(y: np.ndarray, test_size: float, random_state: int, chunk: int, class_counts: dict) -> np.ndarray:
+    """
+    Test-row mask of one chunk of a streamed stratified split.
+
+    Each class gets its share of test rows, rounded so the cumulative test
+    count of the class is ceil(test_size * rows seen so far), the rounding
+    train_test_split uses for the whole dataset.
+    """
+    rng = np.random.default_rng([random_state, chunk])
+    test_mask = np.zeros(len(y), dtype=bool)
+    for label in np.unique(y):
+        rows = np.flatnonzero(y == label)
+        seen = class_counts.get(label, 0)
+        class_counts[label] = seen + len(rows)
+        n_test = math.ceil(test_size * class_counts[label]) - math.ceil(test_size * seen)
+        test_mask[rng.choice(rows, n_test, replace=False)] = True
+    return test_mask
+
+
+def _add_counts(counts: dict, values, chunk_counts: np.ndarray):
+    for value, count in zip(values, chunk_counts.tolist()):
+        counts[value] = counts.get(value, 0) + count
+
+
+def _combine_scaler(
+    feature_columns: list,
+    numeric_cols: list,
+    numeric_scaler,
+    encoders: dict,
+    train_category_counts: dict,
+    n_train: int
+):
+    """
+    StandardScaler over all features, from the partial_fit statistics of the
+    numeric columns and the training counts of the category codes.
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    mean = np.zeros(len(feature_columns))
+    var = np.zeros(len(feature_columns))
+    for j, col in enumerate(feature_columns):
+        if col in encoders:
+            counts = np.array([train_category_counts[col].get(c, 0) for c in encoders[col].classes_])
+            codes = np.arange(len(counts))
+            mean[j] = codes @ counts / n_train
+            var[j] = (codes - mean[j]) ** 2 @ counts / n_train
+        else:
+            k = numeric_cols.index(col)
+            mean[j] = numeric_scaler.mean_[k]
+            var[j] = numeric_scaler.var_[k]
+
+    scaler = StandardScaler()
+    scaler.n_features_in_ = len(feature_columns)
+    scaler.n_samples_seen_ = n_train
+    scaler.mean_ = mean
+    scaler.var_ = var
+    # Constant features are left unscaled, as StandardScaler does
+    scaler.scale_ = np.where(var > 0, np.sqrt(var), 1.0)
+    return scaler
@@ -0,0 +1,375 @@
+"""Columnar storage of the raw transaction dataset.
+
+The raw dataset is stored with an explicit schema instead of CSV type
+inference:
+
+- float32 numeric columns and the smallest integer types that fit
+- ``merchant_category`` dictionary-encoded (int8 codes plus the distinct
+  strings), loaded back as a pandas Categorical
+
+Three formats are supported, chosen by file suffix:
+
+- ``.parquet``: compressed row groups with min/max statistics, so loading
+  can skip whole row groups that cannot match a filter (predicate pushdown)
+  and read only the requested columns (projection).
+- ``.feather``: Arrow IPC file, the fastest to read and write; projection
+  is supported, filters are applied after reading.
+- ``.csv``: fallback when ``pyarrow`` is not installed (the ``arrow``
+  extra); read in chunks with the same schema, projection and filters
+  applied to each chunk, so memory depends on the result, not the file.
+
+Filters use the pyarrow notation: a list of ``(column, op, value)`` tuples
+that must all hold, with op one of ``==``, ``!=``, ``<``, ``<=``, ``>``,
+``>=``, ``in`` and ``not in``.
+"""
+
+import logging
+import operator
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DATA_FORMATS = ("parquet", "feather", "csv")
+RAW_DATA_STEM = "fraud_transactions"
+
+# Column dtypes of the raw dataset; merchant_category holds dictionary codes
+RAW_DTYPES = {
+    'transaction_id': np.int64,
+    'amount': np.float32,
+    'time_of_day': np.float32,
+    'transaction_frequency': np.int16,
+    'account_age_days': np.float32,
+    'merchant_category': np.int8,
+    'distance_from_home': np.float32,
+    'previous_fraud_rate': np.float32,
+    'is_fraud': np.int8
+}
+CATEGORICAL_COLUMNS = ('merchant_category',)
+# The same schema for pandas.read_csv
+CSV_DTYPES = {name: 'category' if name in CATEGORICAL_COLUMNS else dtype for name, dtype in RAW_DTYPES.items()}
+CSV_CHUNK_SIZE = 1_000_000
+
+Filter = Tuple[str, str, object]
+
+_COMPARISONS = {
+    "==": operator.eq, "=": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge
+}
+
+
+def has_pyarrow() -> bool:
+    """Whether the columnar formats are available."""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_format(data_format: str) -> str:
+    """Requested format, or CSV when it needs pyarrow and pyarrow is missing."""
+    if data_format not in DATA_FORMATS:
+        raise ValueError(f"Unknown data format '{data_format}', expected one of {DATA_FORMATS}")
+    if data_format != "csv" and not has_pyarrow():
+        logger.warning(f"pyarrow is not installed, writing CSV instead of {data_format}")
+        return "csv"
+    return data_format
+
+
+def raw_data_path(directory: Path, data_format: str) -> Path:
+    """Path of the raw dataset in a directory for a format."""
+    return Path(directory) / f"{RAW_DATA_STEM}.{data_format}"
+
+
+def format_of(path: Path) -> str:
+    """Storage format of a file, from its suffix."""
+    data_format = Path(path).suffix.lstrip(".")
+    if data_format not in DATA_FORMATS:
+        raise ValueError(f"Unsupported data file '{path}', expected a suffix in {DATA_FORMATS}")
+    return data_format
+
+
+def arrow_schema(names: Sequence[str]):
+    """Arrow schema of the given columns (unknown columns are left out)."""
+    import pyarrow as pa
+
+    fields = []
+    for name in names:
+        if name in CATEGORICAL_COLUMNS:
+            fields.append(pa.field(name, pa.dictionary(pa.int8(), pa.string())))
+        elif name in RAW_DTYPES:
+            fields.append(pa.field(name, pa.from_numpy_dtype(RAW_DTYPES[name])))
+    return pa.schema(fields)
+
+
+def _to_record_batch(df: "pd.DataFrame"):
+    """Convert a DataFrame chunk to a record batch with the raw schema."""
+    import pandas as pd
+    import pyarrow as pa
+
+    arrays = []
+    schema = arrow_schema(df.columns)
+    for field in schema:
+        values = df[field.name]
+        if field.name in CATEGORICAL_COLUMNS:
+            categorical = values.astype("category").array
+            arrays.append(pa.DictionaryArray.from_arrays(
+                pa.array(categorical.codes, type=pa.int8(), mask=categorical.codes < 0),
+                pa.array(np.asarray(categorical.categories, dtype=object), type=pa.string())
+            ))
+        else:
+            arrays.append(pa.array(pd.to_numeric(values).to_numpy(dtype=RAW_DTYPES[field.name])))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_raw_data(
+    chunks: Union["pd.DataFrame", Iterable["pd.DataFrame"]],
+    path: Path,
+    row_group_size: int = 262144,
+    compression: str = "zstd"
+) -> int:
+    """
+    Write the raw dataset, one DataFrame or a stream of chunks, in the format of the path suffix.
+
+    Chunks are written as they arrive, so a dataset larger than memory can
+    be saved. Columns outside the raw schema are dropped from columnar files.
+
+    Args:
+        chunks: DataFrame or iterable of DataFrames with the same columns
+        path: Output file (.parquet, .feather or .csv)
+        row_group_size: Parquet rows per row group (the granularity of predicate pushdown)
+        compression: Parquet / Feather compression codec
+
+    Returns:
+        Number of rows written
+    """
+    import pandas as pd
+
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data_format = format_of(path)
+
+    n_rows = 0
+    writer = None
+    try:
+        for i, chunk in enumerate(chunks):
+            if data_format == "csv":
+                chunk.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+                n_rows += len(chunk)
+                continue
+
+            batch = _to_record_batch(chunk)
+            if writer is None:
+                writer = _open_writer(path, data_format, batch.schema, compression)
+            if data_format == "parquet":
+                writer.write_batch(batch, row_group_size=row_group_size)
+            else:
+                writer.write_batch(batch)
+            n_rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+
+    logger.info(f"Saved {n_rows} rows to {path}")
+    return n_rows
+
+
+def _open_writer(path: Path, data_format: str, schema, compression: str):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if data_format == "parquet":
+        # Dictionary pages only pay off for the categorical columns
+        dictionary_columns = [name for name in schema.names if name in CATEGORICAL_COLUMNS]
+        return pq.ParquetWriter(path, schema, compression=compression, use_dictionary=dictionary_columns)
+    # Feather V2 is the Arrow IPC file format; it supports lz4 and zstd buffers
+    options = pa.ipc.IpcWriteOptions(compression=compression if compression in ("lz4", "zstd") else None)
+    return pa.ipc.new_file(path, schema, options=options)
+
+
+def read_raw_data(
+    path: Path,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Filter]] = None
+) -> "pd.DataFrame":
+    """
+    Load the raw dataset, or a projection and selection of it.
+
+    Args:
+        path: Data file (.parquet, .feather or .csv)
+        columns: Columns to load (all when None)
+        filters: Row filters that must all hold, e.g. [("amount", ">", 100.0)]
+
+    Returns:
+        DataFrame with the raw schema; categorical columns as pandas Categoricals
+    """
+    path = Path(path)
+    data_format = format_of(path)
+
+    if data_format == "csv":
+        return read_csv_chunked(path, columns, filters)
+
+    import pyarrow.parquet as pq
+
+    if data_format == "parquet":
+        # Row groups whose statistics rule out the filters are never read
+        table = pq.read_table(path, columns=columns, filters=filters or None)
+    else:
+        import pyarrow.feather as feather
+
+        table = feather.read_table(path, columns=_read_columns(columns, filters), memory_map=True)
+        if filters:
+            table = table.filter(pq.filters_to_expression(filters))
+        if columns is not None:
+            table = table.select(columns)
+
+    return table.to_pandas()
+
+
+def iter_raw_data(
+    path: Path, columns: Optional[List[str]] = None, chunksize: int = CSV_CHUNK_SIZE
+) -> Iterator["pd.DataFrame"]:
+    """
+    Stream the raw dataset in chunks of chunksize rows (the last one may be
+    shorter), in file order, whatever the format and the row groups or
+    record batches it was written with.
+
+    Categorical columns come back as pandas Categoricals whose categories
+    may differ from chunk to chunk.
+
+    Args:
+        path: Data file (.parquet, .feather or .csv)
+        columns: Columns to load (all when None)
+        chunksize: Maximum rows per chunk
+
+    Yields:
+        One DataFrame chunk at a time
+    """
+    path = Path(path)
+    data_format = format_of(path)
+
+    if data_format == "csv":
+        import pandas as pd
+
+        with pd.read_csv(path, usecols=columns, dtype=CSV_DTYPES, chunksize=chunksize) as reader:
+            yield from reader
+    elif data_format == "parquet":
+        import pyarrow.parquet as pq
+
+        # Pre-buffering would keep the column chunks of the whole file in memory
+        parquet_file = pq.ParquetFile(path, pre_buffer=False)
+        yield from _rebatch(parquet_file.iter_batches(batch_size=chunksize, columns=columns), chunksize)
+    else:
+        import pyarrow as pa
+
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+            if columns is not None:
+                batches = (batch.select(columns) for batch in batches)
+            yield from _rebatch(batches, chunksize)
+
+
+def _rebatch(batches: Iterable, chunksize: int) -> Iterator["pd.DataFrame"]:
+    """Regroup Arrow record batches of any size into DataFrames of chunksize rows."""
+    import pyarrow as pa
+
+    pending = []
+    n_pending = 0
+    for batch in batches:
+        while batch.num_rows:
+            take = min(chunksize - n_pending, batch.num_rows)
+            pending.append(batch.slice(0, take))
+            n_pending += take
+            batch = batch.slice(take)
+            if n_pending == chunksize:
+                yield pa.Table.from_batches(pending).to_pandas()
+                pending = []
+                n_pending = 0
+    if n_pending:
+        yield pa.Table.from_batches(pending).to_pandas()
+
+
+def _read_columns(columns: Optional[List[str]], filters: Optional[List[Filter]]) -> Optional[List[str]]:
+    """Columns to read: the projection plus the columns the filters need."""
+    if columns is None or not filters:
+        return columns
+    return list(dict.fromkeys(columns + [name for name, _, _ in filters]))
+
+
+def read_csv_chunked(
+    path: Path,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Filter]] = None,
+    chunksize: int = CSV_CHUNK_SIZE
+) -> "pd.DataFrame":
+    """
+    Stream a CSV file with the raw schema, keeping only the selected rows and columns.
+
+    Each chunk is parsed straight into the declared dtypes, filtered and
+    projected; the kept values are copied out so the chunk can be freed.
+    The columns are concatenated one at a time at the end. Peak memory is
+    about twice the result, whatever the file size. Columns outside the
+    schema keep the types pandas infers.
+
+    Args:
+        path: CSV file
+        columns: Columns to keep (all when None)
+        filters: Row filters that must all hold
+        chunksize: Rows parsed at a time
+
+    Returns:
+        DataFrame with the raw schema; categorical columns as pandas Categoricals
+    """
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+
+    names = None
+    parts: Dict[str, list] = {}
+    with pd.read_csv(path, usecols=_read_columns(columns, filters), dtype=CSV_DTYPES, chunksize=chunksize) as reader:
+        for chunk in reader:
+            if names is None:
+                names = columns if columns is not None else list(chunk.columns)
+                parts = {name: [] for name in names}
+            mask = filter_mask(chunk, filters) if filters else None
+            for name in names:
+                values = chunk[name].array if isinstance(chunk[name].dtype, pd.CategoricalDtype) \
+                    else chunk[name].to_numpy()
+                parts[name].append(values[mask] if mask is not None else values.copy())
+            del chunk
+
+    result = {}
+    for name in names or []:
+        values = parts.pop(name)
+        if isinstance(values[0], pd.Categorical):
+            # Chunks see different subsets of the categories
+            result[name] = union_categoricals(values, sort_categories=True)
+        else:
+            result[name] = np.concatenate(values)
+        del values
+    return pd.DataFrame(result, columns=names, copy=False)
+
+
+def filter_mask(df: "pd.DataFrame", filters: List[Filter]) -> np.ndarray:
+    """Boolean mask of the rows of a DataFrame matching all filters."""
+    mask = np.ones(len(df), dtype=bool)
+    for name, op, value in filters:
+        values = df[name]
+        if op == "in":
+            matches = values.isin(value)
+        elif op == "not in":
+            matches = ~values.isin(value)
+        elif op in _COMPARISONS:
+            matches = _COMPARISONS[op](values, value)
+        else:
+            raise ValueError(f"Unsupported filter operator '{op}'")
+        mask &= np.asarray(matches, dtype=bool)
+    return mask
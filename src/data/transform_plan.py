@@ -0,0 +1,215 @@
+"""Feature-transform plan shared by training and serving.
+
+Training emits the plan as JSON: the feature column order, the category to
+code lookup tables of the fitted LabelEncoders and the StandardScaler mean and
+scale vectors. Serving compiles it once into index arrays so that a single row
+or a whole batch is encoded with a handful of NumPy operations.
+
+This module only depends on NumPy so the API can use it without pulling in
+pandas or scikit-learn.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PLAN_VERSION = 1
+PLAN_FILENAME = "transform_plan.json"
+
+
+def build_transform_plan(
+    feature_columns: List[str],
+    encoders: dict,
+    scaler,
+    category_defaults: Optional[Dict[str, str]] = None
+) -> dict:
+    """
+    Build a serializable transform plan from fitted preprocessing artifacts.
+
+    Args:
+        feature_columns: Ordered feature column names
+        encoders: Mapping of categorical column name to fitted LabelEncoder
+        scaler: Fitted StandardScaler
+        category_defaults: Category used for unseen values, per categorical column
+
+    Returns:
+        Plan dictionary ready to be saved as JSON
+    """
+    category_defaults = category_defaults or {}
+
+    columns = []
+    for j, col in enumerate(feature_columns):
+        if col in encoders:
+            categories = [str(c) for c in encoders[col].classes_]
+            default = category_defaults.get(col, categories[0])
+            columns.append({
+                "name": col,
+                "kind": "categorical",
+                "categories": categories,
+                "default_code": categories.index(str(default))
+            })
+        else:
+            # Missing numeric values are imputed with the training mean
+            columns.append({
+                "name": col,
+                "kind": "numeric",
+                "default": float(scaler.mean_[j])
+            })
+
+    return {
+        "version": PLAN_VERSION,
+        "columns": columns,
+        "mean": [float(v) for v in scaler.mean_],
+        "scale": [float(v) for v in scaler.scale_]
+    }
+
+
+def save_transform_plan(plan: dict, save_path: Path) -> Path:
+    """Save a transform plan as JSON in the given directory."""
+    save_path.mkdir(parents=True, exist_ok=True)
+    plan_path = save_path / PLAN_FILENAME
+
+    with open(plan_path, 'w') as f:
+        json.dump(plan, f, indent=2)
+
+    logger.info(f"Saved transform plan to {plan_path}")
+    return plan_path
+
+
+def load_transform_plan(plan_path: Path) -> dict:
+    """Load a transform plan from JSON."""
+    with open(plan_path, 'r') as f:
+        plan = json.load(f)
+
+    if plan.get("version") != PLAN_VERSION:
+        raise ValueError(f"Unsupported transform plan version: {plan.get('version')}")
+
+    return plan
+
+
+def _as_float_column(values) -> np.ndarray:
+    """Convert a column to float64, mapping missing or non-numeric values to NaN."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        column = np.empty(len(values), dtype=np.float64)
+        for i, value in enumerate(values):
+            try:
+                column[i] = float(value)
+            except (TypeError, ValueError):
+                column[i] = np.nan
+        return column
+
+
+class CategoryTable(NamedTuple):
+    """Compiled lookup table of one categorical feature."""
+    index: int
+    sorted_categories: np.ndarray
+    codes: np.ndarray
+    default_code: int
+
+
+class CompiledTransformPlan:
+    """Transform plan compiled into index arrays for fast batch encoding."""
+
+    def __init__(self, plan: dict):
+        columns = plan["columns"]
+        self.feature_names = [c["name"] for c in columns]
+        self.n_features = len(columns)
+
+        numeric = [(j, c) for j, c in enumerate(columns) if c["kind"] == "numeric"]
+        self.numeric_index = np.array([j for j, _ in numeric], dtype=np.intp)
+        self.numeric_names = [c["name"] for _, c in numeric]
+        self.numeric_defaults = np.array([c["default"] for _, c in numeric], dtype=np.float64)
+
+        # Sorted category tables so lookups are a single searchsorted per column
+        self.categorical: Dict[str, CategoryTable] = {}
+        for j, c in enumerate(columns):
+            if c["kind"] != "categorical":
+                continue
+            categories = np.asarray(c["categories"], dtype=str)
+            order = np.argsort(categories)
+            self.categorical[c["name"]] = CategoryTable(
+                index=j,
+                sorted_categories=categories[order],
+                codes=order.astype(np.float64),
+                default_code=c["default_code"]
+            )
+
+        self.mean = np.asarray(plan["mean"], dtype=np.float64)
+        self.scale = np.asarray(plan["scale"], dtype=np.float64)
+
+    def encode_categorical(self, name: str, values, unknown: Optional[float] = None) -> np.ndarray:
+        """
+        Map raw category values (or integer codes) of one column to codes.
+
+        Unknown values get the column's default code, or ``unknown`` when given.
+        """
+        table = self.categorical[name]
+        n_categories = len(table.sorted_categories)
+        fill = float(table.default_code) if unknown is None else unknown
+
+        values = np.asarray(values)
+        if values.dtype.kind in "iu":
+            # Already integer codes; out-of-range codes fall back to the default
+            valid = (values >= 0) & (values < n_categories)
+            return np.where(valid, values.astype(np.float64), fill)
+
+        values = values.astype(str)
+        pos = np.searchsorted(table.sorted_categories, values).clip(0, n_categories - 1)
+        found = table.sorted_categories[pos] == values
+        return np.where(found, table.codes[pos], fill)
+
+    def transform_columns(
+        self, columns: Mapping[str, Sequence], n_rows: int, scale: bool = True, impute: bool = True
+    ) -> np.ndarray:
+        """
+        Encode (and optionally scale) a batch given as a mapping of column values.
+
+        Args:
+            columns: Mapping of raw feature name to a sequence of values
+            n_rows: Number of rows in the batch
+            scale: Whether to apply the scaler mean/scale vectors
+            impute: Whether to fill missing values and unknown categories with
+                the training defaults; otherwise they are left as NaN
+
+        Returns:
+            Feature matrix of shape (n_rows, n_features) in training column order
+        """
+        X = np.empty((n_rows, self.n_features), dtype=np.float64)
+
+        for j, name, default in zip(self.numeric_index, self.numeric_names, self.numeric_defaults):
+            values = columns.get(name)
+            X[:, j] = (default if impute else np.nan) if values is None else _as_float_column(values)
+
+        unknown = None if impute else np.nan
+        for name, table in self.categorical.items():
+            values = columns.get(name)
+            if values is None:
+                X[:, table.index] = table.default_code if impute else np.nan
+            else:
+                X[:, table.index] = self.encode_categorical(name, values, unknown)
+
+        # Impute missing numeric values in one pass
+        if impute:
+            numeric = X[:, self.numeric_index]
+            missing = np.isnan(numeric)
+            if missing.any():
+                numeric[missing] = np.take(self.numeric_defaults, np.nonzero(missing)[1])
+                X[:, self.numeric_index] = numeric
+
+        if scale:
+            self.scale_features(X)
+
+        return X
+
+    def scale_features(self, X: np.ndarray) -> np.ndarray:
+        """Standardize an encoded feature matrix in place."""
+        X -= self.mean
+        X /= self.scale
+        return X
@@ -0,0 +1,267 @@
+"""Single-file, memory-mappable model bundle.
+
+A bundle holds everything the API needs to score transactions: the compiled
+forest, the transform plan (feature order, imputation defaults, category
+tables, scaler vectors) and, optionally, the cascade screener. It replaces
+the model pickle plus the ``scaler.pkl`` / ``encoders.pkl`` /
+``feature_names.pkl`` files. Layout::
+
+    b"FDBUNDLE" | uint32 format version | uint32 reserved | uint64 header length
+    JSON header | padding | array 0 | padding | array 1 | ...
+
+The JSON header holds the metadata and the dtype, shape and offset of every
+array. Arrays are stored uncompressed, little-endian and 64-byte aligned, so
+loading maps the file and wraps each array with ``np.frombuffer``. Nothing is
+unpickled or copied, and processes mapping the same file share its pages.
+
+A single SHA-256 checksum covers the header and all array data. Its prefix
+is used as the model version.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import stat
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.models.compiled_forest import CompiledForest
+from src.models.screener import LinearScreener
+
+BUNDLE_MAGIC = b"FDBUNDLE"
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_SUFFIX = ".fdb"
+ALIGNMENT = 64
+
+_PREAMBLE = struct.Struct("<8sIIQ")
+_CHECKSUM_PLACEHOLDER = "0" * 64
+
+
+def _align(offset: int) -> int:
+    return offset + (-offset % ALIGNMENT)
+
+
+def _canonical_header(header: dict) -> bytes:
+    return json.dumps(header, sort_keys=True, separators=(",", ":")).encode()
+
+
+def write_bundle(path: Path, metadata: dict, arrays: Dict[str, np.ndarray]) -> str:
+    """
+    Write metadata and named arrays as a bundle file.
+
+    Returns:
+        Hex SHA-256 checksum of the bundle
+    """
+    # Arrays are laid out and hashed in name order, the order of the canonical header
+    arrays = {
+        name: np.ascontiguousarray(arrays[name], dtype=arrays[name].dtype.newbyteorder("<"))
+        for name in sorted(arrays)
+    }
+
+    specs = {
+        name: {"dtype": values.dtype.str, "shape": list(values.shape), "offset": 0, "nbytes": values.nbytes}
+        for name, values in arrays.items()
+    }
+    header = {"format_version": BUNDLE_FORMAT_VERSION, "metadata": metadata, "arrays": specs,
+              "checksum": _CHECKSUM_PLACEHOLDER}
+
+    # The checksum has a fixed length, but the offsets are part of the header:
+    # lay out again until the data start no longer moves
+    data_start = None
+    while True:
+        start = _align(_PREAMBLE.size + len(_canonical_header(header)))
+        if start == data_start:
+            break
+        data_start = offset = start
+        for spec in specs.values():
+            spec["offset"] = offset
+            offset = _align(offset + spec["nbytes"])
+
+    digest = hashlib.sha256(_canonical_header({**header, "checksum": None}))
+    for values in arrays.values():
+        digest.update(memoryview(values).cast("B"))
+    header["checksum"] = digest.hexdigest()
+
+    header_bytes = _canonical_header(header)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # A running API maps the current bundle: writing over it in place would
+    # change arrays under in-flight requests (or SIGBUS them if the file
+    # shrinks). Write a new file next to it and rename it over the old one;
+    # existing mappings keep the old inode.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREAMBLE.pack(BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, 0, len(header_bytes)))
+            f.write(header_bytes)
+            for name, values in arrays.items():
+                f.write(b"\0" * (specs[name]["offset"] - f.tell()))
+                f.write(memoryview(values).cast("B"))
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file owner-only; keep the permissions of the file it replaces
+        os.chmod(tmp_name, stat.S_IMODE(os.stat(path).st_mode) if path.exists() else 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    return header["checksum"]
+
+
+def read_bundle(path: Path, verify: bool = True) -> Tuple[dict, Dict[str, np.ndarray], str]:
+    """
+    Memory-map a bundle file.
+
+    Args:
+        path: Bundle file
+        verify: Recompute the checksum over the header and all arrays
+
+    Returns:
+        Tuple of (metadata, read-only arrays, checksum)
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(buffer) < _PREAMBLE.size:
+        raise ValueError(f"Not a model bundle: {path}")
+    magic, version, _, header_length = _PREAMBLE.unpack_from(buffer, 0)
+    if magic != BUNDLE_MAGIC:
+        raise ValueError(f"Not a model bundle: {path}")
+    if version != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format version: {version}")
+
+    header = json.loads(buffer[_PREAMBLE.size:_PREAMBLE.size + header_length])
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        if spec["offset"] + spec["nbytes"] > len(buffer):
+            raise ValueError(f"Truncated bundle: array '{name}' is incomplete")
+        dtype = np.dtype(spec["dtype"])
+        count = spec["nbytes"] // dtype.itemsize
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=spec["offset"]).reshape(spec["shape"])
+
+    if verify:
+        digest = hashlib.sha256(_canonical_header({**header, "checksum": None}))
+        for values in arrays.values():
+            digest.update(memoryview(values).cast("B"))
+        if digest.hexdigest() != header["checksum"]:
+            raise ValueError(f"Bundle checksum mismatch: {path}")
+
+    return header["metadata"], arrays, header["checksum"]
+
+
+def save_model_bundle(
+    path: Path,
+    forest: CompiledForest,
+    plan: dict,
+    screener: Optional[LinearScreener] = None
+) -> str:
+    """
+    Save a compiled forest, its transform plan and an optional screener as one bundle.
+
+    Returns:
+        Hex SHA-256 checksum of the bundle
+    """
+    columns = plan["columns"]
+    arrays = {
+        "forest/feature": forest._feature,
+        "forest/threshold": forest.threshold,
+        "forest/left": forest.left,
+        "forest/right": forest.right,
+        "forest/leaf_value": forest.leaf_value,
+        "forest/roots": forest._roots,
+        "forest/children": forest._children,
+        "plan/mean": np.asarray(plan["mean"], dtype=np.float64),
+        "plan/scale": np.asarray(plan["scale"], dtype=np.float64)
+    }
+    for column in columns:
+        if column["kind"] == "categorical":
+            arrays[f"plan/categories/{column['name']}"] = np.asarray(column["categories"], dtype=str)
+
+    metadata = {
+        "forest": {
+            "max_depth": forest.max_depth,
+            "n_features": forest.n_features,
+            "input_scaled": forest.input_scaled
+        },
+        # Category lists and scaler vectors travel as arrays
+        "plan": {
+            "version": plan["version"],
+            "columns": [
+                {k: v for k, v in column.items() if k != "categories"} for column in columns
+            ]
+        }
+    }
+
+    if screener is not None:
+        arrays["screener/weights"] = screener.weights
+        metadata["screener"] = {
+            "bias": screener.bias,
+            "low_cutoff": screener.low_cutoff,
+            "high_cutoff": screener.high_cutoff,
+            "input_scaled": screener.input_scaled
+        }
+
+    return write_bundle(path, metadata, arrays)
+
+
+def load_model_bundle_file(
+    path: Path, verify: bool = True
+) -> Tuple[CompiledForest, dict, Optional[LinearScreener], str]:
+    """
+    Load a bundle written by :func:`save_model_bundle` without copying its arrays.
+
+    Returns:
+        Tuple of (compiled_forest, transform_plan, screener_or_None, checksum)
+    """
+    metadata, arrays, checksum = read_bundle(path, verify=verify)
+
+    forest_meta = metadata["forest"]
+    forest = CompiledForest(
+        feature=arrays["forest/feature"],
+        threshold=arrays["forest/threshold"],
+        left=arrays["forest/left"],
+        right=arrays["forest/right"],
+        leaf_value=arrays["forest/leaf_value"],
+        roots=arrays["forest/roots"],
+        max_depth=forest_meta["max_depth"],
+        n_features=forest_meta["n_features"],
+        input_scaled=forest_meta["input_scaled"],
+        children=arrays["forest/children"]
+    )
+
+    columns = []
+    for column in metadata["plan"]["columns"]:
+        column = dict(column)
+        if column["kind"] == "categorical":
+            column["categories"] = arrays[f"plan/categories/{column['name']}"].tolist()
+        columns.append(column)
+    plan = {
+        "version": metadata["plan"]["version"],
+        "columns": columns,
+        "mean": arrays["plan/mean"],
+        "scale": arrays["plan/scale"]
+    }
+
+    screener = None
+    if "screener" in metadata:
+        screener_meta = metadata["screener"]
+        screener = LinearScreener(
+            weights=arrays["screener/weights"],
+            bias=screener_meta["bias"],
+            low_cutoff=screener_meta["low_cutoff"],
+            high_cutoff=screener_meta["high_cutoff"],
+            input_scaled=screener_meta["input_scaled"]
+        )
+
+    return forest, plan, screener, checksum
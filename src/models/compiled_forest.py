@@ -0,0 +1,311 @@
+"""Array-backed inference engine for trained Random Forests.
+
+All estimators of a fitted ``RandomForestClassifier`` are flattened into
+contiguous node tables (feature index, threshold, left/right child and the
+fraud probability stored at each leaf). Prediction walks every tree for a
+block of rows at once with vectorized NumPy gathers, which avoids the
+per-tree Python and input-validation overhead of scikit-learn on small
+batches. Outputs match ``predict_proba`` within floating-point tolerance.
+
+An early-exit mode evaluates trees in blocks and stops scoring a row as soon
+as a concentration bound shows its final decision cannot change.
+
+A compiled forest can also absorb the StandardScaler: every split threshold
+is rewritten into raw feature units (``fuse_scaler``), so the fused forest
+scores unscaled features directly.
+
+This module only depends on NumPy, so a saved compiled forest can be served
+without importing scikit-learn.
+"""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+COMPILED_FORMAT_VERSION = 1
+
+# Probabilities at which the fraud decision (0.5) or the confidence bucket changes
+DECISION_BOUNDARIES = (0.3, 0.4, 0.5, 0.6, 0.7)
+
+
+class CompiledForest:
+    """Flattened binary-classification forest scored with NumPy."""
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        leaf_value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        n_features: int,
+        input_scaled: bool = True,
+        block_rows: int = 256,
+        children: np.ndarray = None
+    ):
+        """
+        Args:
+            feature: Feature index tested at each node (0 at leaves)
+            threshold: Split threshold of each node (+inf at leaves)
+            left: Left child of each node (leaves point to themselves)
+            right: Right child of each node (leaves point to themselves)
+            leaf_value: Positive-class probability at each node
+            roots: Index of the root node of each tree
+            max_depth: Depth of the deepest tree
+            n_features: Number of input features
+            input_scaled: Whether thresholds expect standardized (True) or raw (False) features
+            block_rows: Rows scored together, bounding the (rows x trees) work arrays
+            children: Precomputed traversal table (see below), e.g. memory-mapped from a bundle
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.input_scaled = bool(input_scaled)
+        self.n_estimators = len(roots)
+        self.block_rows = block_rows
+        self.classes_ = np.array([0, 1])
+
+        # Traversal tables: next node is children[2 * node + went_left]
+        self._feature = feature.astype(np.intp, copy=False)
+        if children is None:
+            children = np.column_stack([right, left]).astype(np.intp).ravel()
+        self._children = children.astype(np.intp, copy=False)
+        self._roots = roots.astype(np.intp, copy=False)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompiledForest":
+        """Flatten a fitted binary RandomForestClassifier."""
+        if model.n_classes_ != 2:
+            raise ValueError("Only binary classification forests can be compiled")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(offset, offset + n_nodes)
+            is_leaf = tree.children_left == -1
+
+            # Leaves loop back to themselves so every row can take max_depth steps
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+
+            # Older scikit-learn stores weighted counts, newer stores fractions
+            counts = tree.value[:, 0, :]
+            values.append(counts[:, 1] / counts.sum(axis=1))
+
+            roots.append(offset)
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            leaf_value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            n_features=model.n_features_in_
+        )
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    def fuse_scaler(self, mean: np.ndarray, scale: np.ndarray) -> "CompiledForest":
+        """
+        Rewrite split thresholds into raw feature units.
+
+        A standardized split ``(x - mean) / scale <= t`` is the raw split
+        ``x <= t * scale + mean`` because the scale is positive.
+
+        Args:
+            mean: Scaler mean of each feature
+            scale: Scaler scale of each feature
+
+        Returns:
+            New forest that accepts unscaled features
+        """
+        if not self.input_scaled:
+            raise ValueError("Forest already works on raw features")
+
+        mean = np.asarray(mean, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+        if np.any(scale <= 0):
+            raise ValueError("Scaler scale must be positive to fold it into thresholds")
+
+        # Leaves keep their +inf threshold
+        threshold = self.threshold * scale[self.feature] + mean[self.feature]
+
+        return CompiledForest(
+            feature=self.feature,
+            threshold=threshold,
+            left=self.left,
+            right=self.right,
+            leaf_value=self.leaf_value,
+            roots=self.roots,
+            max_depth=self.max_depth,
+            n_features=self.n_features,
+            input_scaled=False,
+            block_rows=self.block_rows
+        )
+
+    def tree_leaf_values(self, X: np.ndarray, trees: slice = slice(None)) -> np.ndarray:
+        """
+        Positive-class probability of each selected tree for each row.
+
+        Returns:
+            Array of shape (n_selected_trees, n_rows)
+        """
+        # Standardized trees compare float32 inputs, exactly like scikit-learn;
+        # fused trees compare raw values against float64 thresholds. Features
+        # are laid out column-major so each gather reads one contiguous row.
+        dtype = np.float32 if self.input_scaled else np.float64
+        X_T = np.ascontiguousarray(np.asarray(X, dtype=dtype).T)
+        n_rows = X_T.shape[1]
+        flat_X = X_T.ravel()
+        row = np.arange(n_rows, dtype=np.intp)
+
+        node = np.repeat(self._roots[trees][:, None], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            went_left = flat_X[self._feature[node] * n_rows + row] <= self.threshold[node]
+            node = self._children[2 * node + went_left]
+
+        return self.leaf_value[node]
+
+    def predict_fraud_proba(self, X: np.ndarray) -> np.ndarray:
+        """Fraud probability (mean over trees) for each row."""
+        X = np.asarray(X)
+        proba = np.empty(X.shape[0], dtype=np.float64)
+        for start in range(0, X.shape[0], self.block_rows):
+            block = X[start:start + self.block_rows]
+            proba[start:start + len(block)] = self.tree_leaf_values(block).mean(axis=0)
+        return proba
+
+    def early_exit_margin(self, n_trees: int, delta: float) -> float:
+        """
+        Hoeffding-Serfling bound on how far the mean of the remaining trees can move.
+
+        Trees are sampled without replacement from the forest, and every leaf
+        value lies in [0, 1]. With probability at least 1 - delta, the mean over
+        the first n_trees is within the returned margin of the mean over all trees.
+        """
+        if n_trees >= self.n_estimators:
+            return 0.0
+        finite_population = 1.0 - (n_trees - 1) / self.n_estimators
+        return float(np.sqrt(finite_population * np.log(2.0 / delta) / (2.0 * n_trees)))
+
+    def predict_fraud_proba_early_exit(
+        self,
+        X: np.ndarray,
+        boundaries=DECISION_BOUNDARIES,
+        block_trees: int = 25,
+        delta: float = 0.01
+    ) -> tuple:
+        """
+        Fraud probability with per-row early exit.
+
+        Trees are evaluated block by block. A row is retired once no decision
+        boundary lies within the early-exit margin of its running mean, and
+        its running mean is returned as its probability.
+
+        Args:
+            X: Input features
+            boundaries: Probabilities where the downstream decision changes
+            block_trees: Number of trees evaluated between retirement checks
+            delta: Allowed probability that a retired row's decision differs from the full forest
+
+        Returns:
+            Tuple of (fraud_probabilities, trees_evaluated_per_row)
+        """
+        X = np.asarray(X)
+        n_rows = X.shape[0]
+        boundaries = np.asarray(boundaries, dtype=np.float64)
+
+        sums = np.zeros(n_rows, dtype=np.float64)
+        proba = np.empty(n_rows, dtype=np.float64)
+        trees_used = np.full(n_rows, self.n_estimators, dtype=np.int32)
+        active = np.arange(n_rows)
+
+        for start in range(0, self.n_estimators, block_trees):
+            stop = min(start + block_trees, self.n_estimators)
+            for row_start in range(0, len(active), self.block_rows):
+                rows = active[row_start:row_start + self.block_rows]
+                sums[rows] += self.tree_leaf_values(X[rows], slice(start, stop)).sum(axis=0)
+
+            mean = sums[active] / stop
+            margin = self.early_exit_margin(stop, delta)
+            if stop < self.n_estimators:
+                undecided = (np.abs(mean[:, None] - boundaries) <= margin).any(axis=1)
+            else:
+                undecided = np.zeros(len(active), dtype=bool)
+
+            retired = active[~undecided]
+            proba[retired] = mean[~undecided]
+            trees_used[retired] = stop
+            active = active[undecided]
+            if len(active) == 0:
+                break
+
+        return proba, trees_used
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities with the same layout as scikit-learn."""
+        fraud = self.predict_fraud_proba(X)
+        return np.column_stack([1.0 - fraud, fraud])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predicted class for each row."""
+        return (self.predict_fraud_proba(X) > 0.5).astype(np.int64)
+
+    def save(self, path: Path):
+        """Save the node tables as an uncompressed .npz file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                format_version=COMPILED_FORMAT_VERSION,
+                feature=self.feature,
+                threshold=self.threshold,
+                left=self.left,
+                right=self.right,
+                leaf_value=self.leaf_value,
+                roots=self.roots,
+                max_depth=self.max_depth,
+                n_features=self.n_features,
+                input_scaled=self.input_scaled
+            )
+        logger.info(f"Compiled forest saved to {path}")
+
+    @classmethod
+    def load(cls, path: Path) -> "CompiledForest":
+        """Load a compiled forest saved with :meth:`save`."""
+        with np.load(path) as data:
+            if int(data["format_version"]) != COMPILED_FORMAT_VERSION:
+                raise ValueError(f"Unsupported compiled forest version: {int(data['format_version'])}")
+            return cls(
+                feature=data["feature"],
+                threshold=data["threshold"],
+                left=data["left"],
+                right=data["right"],
+                leaf_value=data["leaf_value"],
+                roots=data["roots"],
+                max_depth=int(data["max_depth"]),
+                n_features=int(data["n_features"]),
+                input_scaled=bool(data["input_scaled"]) if "input_scaled" in data else True
+            )
@@ -0,0 +1,121 @@
+"""Cheap linear first stage of a two-stage (cascade) fraud model.
+
+A logistic regression scores every row with one dot product. Rows scoring
+below ``low_cutoff`` are confidently legitimate and rows above
+``high_cutoff`` confidently fraudulent; both are answered by the screener.
+Only the ambiguous rows in between are passed to the Random Forest.
+
+The cut-offs are chosen on validation data so that no validation fraud case
+is short-circuited as legitimate (recall is preserved) and no legitimate
+case is short-circuited as fraud.
+
+Like the compiled forest, this module only depends on NumPy.
+"""
+
+import logging
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SCREENER_FORMAT_VERSION = 1
+
+
+class LinearScreener:
+    """Logistic-regression screener with short-circuit cut-offs."""
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: float,
+        low_cutoff: float,
+        high_cutoff: float,
+        input_scaled: bool = True
+    ):
+        """
+        Args:
+            weights: Coefficient of each feature
+            bias: Intercept
+            low_cutoff: Fraud probability below which a row is answered as legitimate
+            high_cutoff: Fraud probability above which a row is answered as fraud
+            input_scaled: Whether weights expect standardized (True) or raw (False) features
+        """
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.low_cutoff = float(low_cutoff)
+        self.high_cutoff = float(high_cutoff)
+        self.input_scaled = bool(input_scaled)
+
+    @classmethod
+    def from_sklearn(cls, model, low_cutoff: float = 0.0, high_cutoff: float = 1.0) -> "LinearScreener":
+        """Wrap a fitted binary LogisticRegression."""
+        return cls(model.coef_[0], model.intercept_[0], low_cutoff, high_cutoff)
+
+    def fuse_scaler(self, mean: np.ndarray, scale: np.ndarray) -> "LinearScreener":
+        """
+        Rewrite the weights into raw feature units.
+
+        ``w . (x - mean) / scale + b`` equals ``(w / scale) . x + b - w . (mean / scale)``.
+
+        Returns:
+            New screener that accepts unscaled features
+        """
+        if not self.input_scaled:
+            raise ValueError("Screener already works on raw features")
+
+        mean = np.asarray(mean, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+        return LinearScreener(
+            weights=self.weights / scale,
+            bias=self.bias - float(np.dot(self.weights, mean / scale)),
+            low_cutoff=self.low_cutoff,
+            high_cutoff=self.high_cutoff,
+            input_scaled=False
+        )
+
+    def predict_fraud_proba(self, X: np.ndarray) -> np.ndarray:
+        """Screener fraud probability for each row."""
+        return 1.0 / (1.0 + np.exp(-(np.asarray(X, dtype=np.float64) @ self.weights + self.bias)))
+
+    def screen(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score rows with the screener and flag those needing the full model.
+
+        Returns:
+            Tuple of (screener_probabilities, ambiguous_mask)
+        """
+        proba = self.predict_fraud_proba(X)
+        ambiguous = (proba >= self.low_cutoff) & (proba <= self.high_cutoff)
+        return proba, ambiguous
+
+    def save(self, path: Path):
+        """Save the screener as an .npz file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                format_version=SCREENER_FORMAT_VERSION,
+                weights=self.weights,
+                bias=self.bias,
+                low_cutoff=self.low_cutoff,
+                high_cutoff=self.high_cutoff,
+                input_scaled=self.input_scaled
+            )
+        logger.info(f"Screener saved to {path}")
+
+    @classmethod
+    def load(cls, path: Path) -> "LinearScreener":
+        """Load a screener saved with :meth:`save`."""
+        with np.load(path) as data:
+            if int(data["format_version"]) != SCREENER_FORMAT_VERSION:
+                raise ValueError(f"Unsupported screener version: {int(data['format_version'])}")
+            return cls(
+                weights=data["weights"],
+                bias=float(data["bias"]),
+                low_cutoff=float(data["low_cutoff"]),
+                high_cutoff=float(data["high_cutoff"]),
+                input_scaled=bool(data["input_scaled"])
+            )
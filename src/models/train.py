@@ -1,16 +1,20 @@
 """Model training utilities for fraud detection."""
 
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    roc_auc_score, confusion_matrix, classification_report
-)
-import mlflow
-import mlflow.sklearn
 import logging
 from pathlib import Path
 import pickle
+from typing import TYPE_CHECKING
+
+from src.data.transform_plan import load_transform_plan
+from src.models.bundle_format import save_model_bundle
+from src.models.compiled_forest import DECISION_BOUNDARIES, CompiledForest
+from src.models.screener import LinearScreener
+
+# sklearn and mlflow take seconds to import; they are imported where used so
+# that loading this module (e.g. from the API) stays cheap
+if TYPE_CHECKING:
+    from sklearn.ensemble import RandomForestClassifier
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,7 +25,7 @@ def train_model(
     y_train: np.ndarray,
     params: dict,
     experiment_name: str = "default"
-) -> RandomForestClassifier:
+) -> "RandomForestClassifier":
     """
     Train a Random Forest model for fraud detection with MLflow tracking.
     
@@ -37,6 +41,8 @@ def train_model(
     logger.info("Starting model training for fraud detection...")
     logger.info(f"Training samples: {len(X_train)}, Fraud rate: {y_train.mean()*100:.2f}%")
     
+    from sklearn.ensemble import RandomForestClassifier
+    
     # Train model
     model = RandomForestClassifier(**params)
     model.fit(X_train, y_train)
@@ -47,7 +53,7 @@ def train_model(
 
 
 def evaluate_model(
-    model: RandomForestClassifier,
+    model: "RandomForestClassifier",
     X_test: np.ndarray,
     y_test: np.ndarray,
     log_to_mlflow: bool = True
@@ -64,6 +70,11 @@ def evaluate_model(
     Returns:
         Dictionary of metrics
     """
+    from sklearn.metrics import (
+        accuracy_score, precision_score, recall_score, f1_score,
+        roc_auc_score, confusion_matrix
+    )
+    
     logger.info("Evaluating model...")
     
     # Predictions
@@ -101,6 +112,8 @@ def evaluate_model(
     
     # Log to MLflow
     if log_to_mlflow:
+        import mlflow
+        
         mlflow.log_metrics(metrics)
         
         # Log confusion matrix as text
@@ -110,7 +123,7 @@ def evaluate_model(
     return metrics
 
 
-def save_model(model: RandomForestClassifier, save_path: Path, model_name: str = "fraud_model.pkl"):
+def save_model(model: "RandomForestClassifier", save_path: Path, model_name: str = "fraud_model.pkl"):
     """
     Save model to disk.
     
@@ -126,3 +139,282 @@ def save_model(model: RandomForestClassifier, save_path: Path, model_name: str =
         pickle.dump(model, f)
     
     logger.info(f"Model saved to {model_path}")
+
+
+def compile_model(
+    model: "RandomForestClassifier",
+    X_check: np.ndarray = None,
+    save_path: Path = None,
+    model_name: str = "fraud_model_compiled.npz",
+    tolerance: float = 1e-9
+) -> CompiledForest:
+    """
+    Flatten a trained forest into the array-backed inference engine.
+    
+    Args:
+        model: Trained model
+        X_check: Optional features used to verify the compiled outputs match sklearn
+        save_path: Optional directory to save the compiled forest
+        model_name: Name of the compiled forest file
+        tolerance: Maximum allowed absolute difference in fraud probability
+        
+    Returns:
+        Compiled forest
+    """
+    compiled = CompiledForest.from_sklearn(model)
+    logger.info(f"Compiled {compiled.n_estimators} trees into {compiled.n_nodes} nodes "
+                f"(max depth {compiled.max_depth})")
+    
+    if X_check is not None:
+        max_diff = np.abs(compiled.predict_fraud_proba(X_check) - model.predict_proba(X_check)[:, 1]).max()
+        logger.info(f"Compiled forest max abs difference vs sklearn: {max_diff:.2e}")
+        if max_diff > tolerance:
+            raise ValueError(f"Compiled forest does not match sklearn (max abs difference {max_diff:.2e})")
+    
+    if save_path:
+        compiled.save(save_path / model_name)
+    
+    return compiled
+
+
+def export_fused_model(
+    compiled: CompiledForest,
+    scaler_path: Path,
+    save_path: Path,
+    model_name: str = "fraud_model_fused.npz",
+    X_check: np.ndarray = None,
+    tolerance: float = 1e-4
+) -> CompiledForest:
+    """
+    Fold the saved StandardScaler into the compiled forest's split thresholds.
+    
+    The exported forest scores raw (unscaled) features, so serving skips the
+    scaling step. Rows lying within float32 rounding of a split point may
+    take the other branch, so outputs agree with the scaled forest up to a
+    tiny mean difference rather than exactly.
+    
+    Args:
+        compiled: Compiled forest trained on scaled features
+        scaler_path: Path to the saved scaler.pkl
+        save_path: Directory to save the fused forest
+        model_name: Name of the fused forest file
+        X_check: Optional scaled features used to verify the fused outputs
+        tolerance: Maximum allowed mean absolute difference in fraud probability
+        
+    Returns:
+        Fused compiled forest
+    """
+    with open(scaler_path, 'rb') as f:
+        scaler = pickle.load(f)
+    
+    fused = compiled.fuse_scaler(scaler.mean_, scaler.scale_)
+    
+    if X_check is not None:
+        X_raw = scaler.inverse_transform(X_check)
+        diff = np.abs(fused.predict_fraud_proba(X_raw) - compiled.predict_fraud_proba(X_check))
+        logger.info(f"Fused forest abs difference vs scaled forest: mean {diff.mean():.2e}, max {diff.max():.2e}")
+        if diff.mean() > tolerance:
+            raise ValueError(f"Fused forest does not match the scaled forest (mean abs difference {diff.mean():.2e})")
+    
+    fused.save(save_path / model_name)
+    
+    return fused
+
+
+def export_model_bundle(
+    compiled: CompiledForest,
+    plan_path: Path,
+    save_path: Path,
+    model_name: str = "fraud_model.fdb",
+    screener: LinearScreener = None
+) -> str:
+    """
+    Save the deployable model as one memory-mappable bundle file.
+    
+    The bundle holds the compiled forest, the transform plan (feature order,
+    defaults, category tables and scaler vectors) and the optional cascade
+    screener, covered by one checksum.
+    
+    Args:
+        compiled: Compiled (or scaler-fused) forest to serve
+        plan_path: Path to the saved transform_plan.json
+        save_path: Directory to save the bundle
+        model_name: Name of the bundle file
+        screener: Optional cascade screener
+        
+    Returns:
+        Hex SHA-256 checksum of the bundle
+    """
+    plan = load_transform_plan(plan_path)
+    bundle_path = save_path / model_name
+    checksum = save_model_bundle(bundle_path, compiled, plan, screener)
+    logger.info(f"Model bundle saved to {bundle_path} (sha256 {checksum[:12]})")
+    return checksum
+
+
+def evaluate_early_exit(
+    compiled: CompiledForest,
+    X_test: np.ndarray,
+    deltas: tuple = (0.1, 0.01, 0.001),
+    block_trees: int = 25,
+    boundaries: tuple = DECISION_BOUNDARIES,
+    threshold: float = 0.5,
+    log_to_mlflow: bool = False
+) -> dict:
+    """
+    Report how early-exit inference agrees with the full forest on the test set.
+    
+    A row agrees when no decision boundary (fraud threshold or confidence
+    bucket edge) lies between its early-exit and full-forest probabilities.
+    
+    Args:
+        compiled: Compiled forest, the one that is served (the fused forest
+            when training exported one)
+        X_test: Test features (scaled, or raw for a fused forest)
+        deltas: Early-exit confidence parameters to compare
+        block_trees: Trees evaluated between retirement checks
+        boundaries: Probabilities where the confidence bucket changes
+        threshold: Fraud probability threshold (always treated as a boundary)
+        log_to_mlflow: Whether to log to MLflow
+        
+    Returns:
+        Dictionary mapping each delta to its agreement report
+    """
+    full = compiled.predict_fraud_proba(X_test)
+    boundaries = np.union1d(boundaries, [threshold])
+    
+    reports = {}
+    for delta in deltas:
+        early, trees_used = compiled.predict_fraud_proba_early_exit(
+            X_test, boundaries=boundaries, block_trees=block_trees, delta=delta
+        )
+        low = np.minimum(early, full)[:, None]
+        high = np.maximum(early, full)[:, None]
+        crossed = ((low <= boundaries) & (boundaries <= high)).any(axis=1) & (early != full)
+        
+        reports[delta] = {
+            "decision_agreement": float(1.0 - crossed.mean()),
+            "fraud_decision_agreement": float(((early > threshold) == (full > threshold)).mean()),
+            "mean_trees_evaluated": float(trees_used.mean()),
+            "tree_evaluation_fraction": float(trees_used.mean() / compiled.n_estimators),
+            "max_abs_probability_diff": float(np.abs(early - full).max())
+        }
+        logger.info(f"Early exit (delta={delta}): {reports[delta]}")
+        
+        if log_to_mlflow:
+            import mlflow
+            
+            mlflow.log_metrics({f"early_exit_{k}_delta_{delta}": v for k, v in reports[delta].items()})
+    
+    return reports
+
+
+def train_screener(
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    params: dict = None,
+    validation_size: float = 0.25,
+    random_state: int = 42,
+    threshold: float = 0.5
+) -> LinearScreener:
+    """
+    Train the logistic-regression first stage of the cascade.
+    
+    The screener is fit on part of the training data. The held-out part sets
+    the short-circuit cut-offs: the low cut-off sits just below the lowest
+    score of any validation fraud case, and the high cut-off just above the
+    highest score of any validation legitimate case, so neither recall nor
+    precision drops on validation. Both are then clamped around the fraud
+    threshold, so the screener probability served for a short-circuited row
+    always lands on the side of the threshold matching its decision.
+    
+    Args:
+        X_train: Training features (scaled)
+        y_train: Training labels
+        params: LogisticRegression hyperparameters
+        validation_size: Fraction of the training data used to choose the cut-offs
+        random_state: Random seed for the validation split
+        threshold: Fraud probability threshold used when serving
+        
+    Returns:
+        Screener with calibrated cut-offs
+    """
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import train_test_split
+    
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=validation_size, random_state=random_state, stratify=y_train
+    )
+    
+    model = LogisticRegression(**(params or {}))
+    model.fit(X_fit, y_fit)
+    
+    screener = LinearScreener.from_sklearn(model)
+    val_proba = screener.predict_fraud_proba(X_val)
+    y_val = np.asarray(y_val)
+    
+    # Stay strictly inside the extreme validation scores of the opposite class
+    low_cutoff = np.nextafter(val_proba[y_val == 1].min(), 0.0)
+    high_cutoff = np.nextafter(val_proba[y_val == 0].max(), 1.0)
+    screener.low_cutoff = float(min(low_cutoff, threshold))
+    screener.high_cutoff = float(max(high_cutoff, threshold))
+    
+    short_circuited = (val_proba < screener.low_cutoff) | (val_proba > screener.high_cutoff)
+    logger.info(f"Screener cut-offs: legitimate below {screener.low_cutoff:.4f}, "
+                f"fraud above {screener.high_cutoff:.4f} "
+                f"({short_circuited.mean():.1%} of validation rows short-circuited)")
+    
+    return screener
+
+
+def evaluate_cascade(
+    screener: LinearScreener,
+    model: "RandomForestClassifier",
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    threshold: float = 0.5,
+    log_to_mlflow: bool = True
+) -> dict:
+    """
+    Compare the screener + forest cascade with the forest alone.
+    
+    Args:
+        screener: Trained screener (on scaled features)
+        model: Trained forest
+        X_test: Test features (scaled)
+        y_test: Test labels
+        threshold: Fraud probability threshold
+        log_to_mlflow: Whether to log to MLflow
+        
+    Returns:
+        Dictionary of cascade metrics
+    """
+    from sklearn.metrics import precision_score, recall_score
+    
+    forest_pred = model.predict_proba(X_test)[:, 1] > threshold
+    screener_proba, ambiguous = screener.screen(X_test)
+    
+    cascade_pred = screener_proba > screener.high_cutoff
+    if ambiguous.any():
+        cascade_pred[ambiguous] = forest_pred[ambiguous]
+    
+    metrics = {
+        "cascade_short_circuit_fraction": float(1.0 - ambiguous.mean()),
+        "cascade_short_circuit_legitimate_fraction": float((screener_proba < screener.low_cutoff).mean()),
+        "cascade_short_circuit_fraud_fraction": float((screener_proba > screener.high_cutoff).mean()),
+        "cascade_recall": recall_score(y_test, cascade_pred, zero_division=0),
+        "cascade_precision": precision_score(y_test, cascade_pred, zero_division=0),
+        "cascade_forest_recall": recall_score(y_test, forest_pred, zero_division=0),
+        "cascade_decision_agreement": float((cascade_pred == forest_pred).mean())
+    }
+    metrics["cascade_recall_change"] = metrics["cascade_recall"] - metrics["cascade_forest_recall"]
+    
+    logger.info(f"Cascade: {metrics['cascade_short_circuit_fraction']:.1%} of rows short-circuited, "
+                f"recall {metrics['cascade_recall']:.4f} vs forest {metrics['cascade_forest_recall']:.4f}")
+    
+    if log_to_mlflow:
+        import mlflow
+        
+        mlflow.log_metrics(metrics)
+    
+    return metrics
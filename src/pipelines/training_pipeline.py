@@ -8,17 +8,22 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
 from zenml import pipeline, step
-import mlflow
 import logging
 
 from src.config import (
-    RAW_DATA_DIR, PROCESSED_DATA_DIR, MODELS_DIR,
+    RAW_DATA_DIR, RAW_DATA_FORMAT, PROCESSED_DATA_DIR, MODELS_DIR,
     MLFLOW_TRACKING_URI, EXPERIMENT_NAME, MODEL_PARAMS,
-    TEST_SIZE, RANDOM_STATE, IMBALANCE_RATIO
+    TEST_SIZE, RANDOM_STATE, IMBALANCE_RATIO,
+    FRAUD_THRESHOLD, TRAIN_SCREENER, SCREENER_PARAMS, SCREENER_VALIDATION_SIZE,
+    ensure_directories
 )
 from src.data.data_loader import generate_fraud_data
 from src.data.preprocessing import preprocess_data
-from src.models.train import train_model, evaluate_model, save_model
+from src.data.transform_plan import PLAN_FILENAME
+from src.models.train import (
+    train_model, evaluate_model, save_model, compile_model, export_fused_model,
+    evaluate_early_exit, train_screener, evaluate_cascade, export_model_bundle
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,7 +36,8 @@ def load_data_step() -> dict:
     df = generate_fraud_data(
         n_samples=10000, 
         fraud_ratio=IMBALANCE_RATIO,
-        save_path=RAW_DATA_DIR
+        save_path=RAW_DATA_DIR,
+        data_format=RAW_DATA_FORMAT
     )
     return {"dataframe": df}
 
@@ -59,6 +65,8 @@ def train_model_step(data: dict) -> dict:
     """Train the fraud detection model."""
     logger.info("Step 3: Training fraud detection model...")
     
+    import mlflow
+    
     # Set MLflow tracking URI
     mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
     
@@ -68,7 +76,18 @@ def train_model_step(data: dict) -> dict:
         params=MODEL_PARAMS,
         experiment_name=EXPERIMENT_NAME
     )
-    return {"model": model, **data}
+    
+    screener = None
+    if TRAIN_SCREENER:
+        screener = train_screener(
+            data["X_train"],
+            data["y_train"],
+            params=SCREENER_PARAMS,
+            validation_size=SCREENER_VALIDATION_SIZE,
+            random_state=RANDOM_STATE,
+            threshold=FRAUD_THRESHOLD
+        )
+    return {"model": model, "screener": screener, **data}
 
 
 @step
@@ -82,7 +101,14 @@ def evaluate_model_step(data: dict) -> dict:
         data["y_test"],
         log_to_mlflow=True
     )
-    return {"metrics": metrics, **data}
+    
+    cascade_metrics = None
+    if data["screener"] is not None:
+        cascade_metrics = evaluate_cascade(
+            data["screener"], data["model"], data["X_test"], data["y_test"],
+            threshold=FRAUD_THRESHOLD, log_to_mlflow=True
+        )
+    return {"metrics": metrics, "cascade_metrics": cascade_metrics, **data}
 
 
 @step
@@ -90,6 +116,23 @@ def save_model_step(data: dict) -> None:
     """Save the fraud detection model."""
     logger.info("Step 5: Saving fraud detection model...")
     save_model(data["model"], MODELS_DIR, model_name="fraud_detector.pkl")
+    compiled = compile_model(
+        data["model"], data["X_test"], MODELS_DIR, model_name="fraud_detector_compiled.npz"
+    )
+    fused = export_fused_model(
+        compiled, PROCESSED_DATA_DIR / "scaler.pkl", MODELS_DIR,
+        model_name="fraud_detector_fused.npz", X_check=data["X_test"]
+    )
+    # Evaluate the forest that ships in the bundle: the fused one, on raw features
+    early_exit_report = evaluate_early_exit(
+        fused, data["scaler"].inverse_transform(data["X_test"]), threshold=FRAUD_THRESHOLD, log_to_mlflow=True
+    )
+    if data["screener"] is not None:
+        data["screener"].save(MODELS_DIR / "fraud_detector_screener.npz")
+    export_model_bundle(
+        fused, PROCESSED_DATA_DIR / PLAN_FILENAME, MODELS_DIR,
+        model_name="fraud_detector.fdb", screener=data["screener"]
+    )
     
     logger.info("\n" + "="*60)
     logger.info("FRAUD DETECTION PIPELINE COMPLETED!")
@@ -105,6 +148,15 @@ def save_model_step(data: dict) -> None:
     logger.info(f"  False Positives: {data['metrics']['false_positives']}")
     logger.info(f"  False Negatives: {data['metrics']['false_negatives']}")
     logger.info(f"  True Positives: {data['metrics']['true_positives']}")
+    logger.info(f"\nEarly-Exit Inference (agreement with full forest / trees evaluated):")
+    for delta, report in early_exit_report.items():
+        logger.info(f"  delta={delta}: {report['decision_agreement']:.4f} / "
+                    f"{report['tree_evaluation_fraction']:.1%}")
+    if data["cascade_metrics"] is not None:
+        cascade = data["cascade_metrics"]
+        logger.info(f"\nCascade Screener:")
+        logger.info(f"  Short-circuited: {cascade['cascade_short_circuit_fraction']:.1%}")
+        logger.info(f"  Recall: {cascade['cascade_recall']:.4f} (forest alone: {cascade['cascade_forest_recall']:.4f})")
     logger.info("="*60)
 
 
@@ -124,6 +176,7 @@ if __name__ == "__main__":
     logger.info("="*60)
     logger.info(f"MLflow tracking URI: {MLFLOW_TRACKING_URI}")
     logger.info(f"Experiment name: {EXPERIMENT_NAME}")
+    ensure_directories()
     
     # Run the pipeline
     pipeline_instance = fraud_detection_pipeline()
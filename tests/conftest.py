@@ -0,0 +1,81 @@
+"""Shared fixtures: a small trained model and an API client serving it."""
+
+import contextlib
+import pickle
+
+import pytest
+
+from src.data.data_loader import generate_fraud_data
+from src.data.preprocessing import preprocess_data
+
+
+@pytest.fixture(scope="session")
+def processed_data(tmp_path_factory):
+    """Preprocessed synthetic data, saved under <root>/data/processed like the pipelines do."""
+    root = tmp_path_factory.mktemp("artifacts")
+    df = generate_fraud_data(n_samples=3000, fraud_ratio=0.1)
+    X_train, X_test, y_train, y_test, scaler, encoders = preprocess_data(
+        df, test_size=0.3, random_state=42, save_path=root / "data" / "processed"
+    )
+    return root, X_train, X_test, y_train, y_test
+
+
+@pytest.fixture(scope="session")
+def trained_model(processed_data):
+    """A small forest trained on the processed data."""
+    from sklearn.ensemble import RandomForestClassifier
+
+    _, X_train, _, y_train, _ = processed_data
+    model = RandomForestClassifier(n_estimators=15, max_depth=6, class_weight="balanced", random_state=0)
+    return model.fit(X_train, y_train)
+
+
+@pytest.fixture(scope="session")
+def artifacts_dir(processed_data, trained_model):
+    """Working directory holding models/ and data/processed/ as the API expects them."""
+    from src.models.train import compile_model
+
+    root, _, X_test, _, _ = processed_data
+    (root / "models").mkdir(exist_ok=True)
+    with open(root / "models" / "fraud_detector.pkl", "wb") as f:
+        pickle.dump(trained_model, f)
+    compile_model(trained_model, X_test, root / "models", "fraud_detector_compiled.npz")
+    return root
+
+
+@pytest.fixture
+def make_client(artifacts_dir, tmp_path, monkeypatch):
+    """
+    Start the API on the test artifacts and return a TestClient.
+
+    Keyword arguments override the API_* settings of src.api.app for the test.
+    """
+    from fastapi.testclient import TestClient
+
+    import src.api.app as api
+
+    monkeypatch.chdir(artifacts_dir)
+    monkeypatch.setattr(api, "bundle", None)
+    monkeypatch.setattr(api, "API_MODEL_WATCH_INTERVAL", 0)
+    monkeypatch.setattr(api, "API_EXECUTOR", "thread")
+    monkeypatch.setattr(api, "API_AUDIT_LOG_DIR", tmp_path / "audit")
+    monkeypatch.setattr(api, "API_FEATURE_STORE_SNAPSHOT_PATH", tmp_path / "feature_store" / "snapshot.npz")
+    monkeypatch.setattr(api, "API_FEATURE_STORE_SNAPSHOT_INTERVAL", 0)
+
+    with contextlib.ExitStack() as stack:
+        def start(**settings) -> TestClient:
+            for name, value in settings.items():
+                assert hasattr(api, name), name
+                monkeypatch.setattr(api, name, value)
+            return stack.enter_context(TestClient(api.app))
+
+        yield start
+
+
+TRANSACTION = {
+    "amount": 120.0,
+    "merchant_category": "grocery",
+    "time_of_day": "morning",
+    "location": "online",
+    "transaction_type": "purchase"
+}
@@ -0,0 +1,115 @@
+"""Tests for admission control and load shedding."""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from src.api.admission import AdmissionController, AdmissionRejected
+
+
+def test_slots_are_handed_over_in_fifo_order():
+    admission = AdmissionController(max_concurrency=1, max_queue=10, latency_target=10)
+    order = []
+
+    async def request(name):
+        async with admission.admit():
+            order.append(name)
+            await asyncio.sleep(0.001)
+
+    async def run():
+        await asyncio.gather(*(request(i) for i in range(5)))
+
+    asyncio.run(run())
+    assert order == [0, 1, 2, 3, 4]
+    assert admission.in_flight == 0 and admission.queued == 0
+    assert admission.admitted == 5
+
+
+def test_full_queue_is_rejected_with_429():
+    admission = AdmissionController(max_concurrency=1, max_queue=1, latency_target=10)
+
+    async def run():
+        await admission.acquire()
+        queued = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire()
+        admission.release()
+        await queued
+        admission.release()
+        return rejected.value
+
+    rejected = asyncio.run(run())
+    assert (rejected.reason, rejected.status_code) == ("queue_full", 429)
+    assert rejected.retry_after >= 1
+    assert admission.shed["queue_full"] == 1
+    assert admission.in_flight == 0
+
+
+def test_projected_latency_over_target_is_rejected_with_503():
+    admission = AdmissionController(max_concurrency=2, max_queue=10, latency_target=0.4)
+    admission.service_time = 0.3
+
+    async def run():
+        await admission.acquire()
+        await admission.acquire()
+        # Projected: 1 * 0.3 s / 2 slots queued + 0.3 s served > 0.4 s
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire()
+        return rejected.value
+
+    rejected = asyncio.run(run())
+    assert (rejected.reason, rejected.status_code) == ("latency_target", 503)
+    assert admission.queued == 0
+
+
+def test_queue_timeout_and_cancellation_give_back_nothing():
+    admission = AdmissionController(max_concurrency=1, max_queue=10, latency_target=0.02)
+
+    async def run():
+        await admission.acquire()
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire()
+
+        waiter = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        admission.release()
+        return rejected.value
+
+    rejected = asyncio.run(run())
+    assert rejected.reason == "queue_timeout"
+    assert admission.in_flight == 0 and admission.queued == 0
+
+
+def test_slot_handed_over_as_the_deadline_expires_is_not_lost():
+    admission = AdmissionController(max_concurrency=1, max_queue=10, latency_target=10)
+
+    async def expiring_wait_for(waiter, timeout):
+        # release() hands the slot over in the same step as the deadline fires
+        admission.release()
+        raise asyncio.TimeoutError
+
+    async def run():
+        await admission.acquire()
+        with mock.patch.object(asyncio, "wait_for", expiring_wait_for):
+            await admission.acquire()
+        assert admission.in_flight == 1
+        admission.release()
+
+    asyncio.run(run())
+    assert admission.in_flight == 0 and admission.queued == 0
+    assert admission.admitted == 2
+    assert admission.shed["queue_timeout"] == 0
+
+
+def test_service_time_is_a_moving_average():
+    admission = AdmissionController(smoothing=0.5)
+    admission.in_flight = 2
+    admission.release(0.2)
+    admission.release(0.4)
+    assert admission.service_time == pytest.approx(0.3)
@@ -0,0 +1,29 @@
+"""Audit records written by the API."""
+
+import time
+
+from conftest import TRANSACTION
+
+from src.api.audit import read_audit_log
+
+
+def wait_for_rows(directory, n_rows, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        df = read_audit_log(directory) if directory.exists() else None
+        if (df is not None and len(df) >= n_rows) or time.monotonic() > deadline:
+            return df
+        time.sleep(0.01)
+
+
+def test_cache_hits_are_audited(make_client, tmp_path):
+    client = make_client(API_AUDIT_LOG=True, API_AUDIT_FLUSH_INTERVAL=0.01, API_PREDICTION_CACHE_SIZE=100)
+    transaction = {**TRANSACTION, "transaction_id": "000123"}
+    responses = [client.post("/predict", json=transaction).json() for _ in range(3)]
+    assert client.get("/cache-stats").json()["hits"] == 2
+
+    df = wait_for_rows(tmp_path / "audit", 3)
+    assert df["cached"].tolist() == [False, True, True]
+    assert df["transaction_id"].tolist() == ["000123"] * 3
+    assert df["model_version"].tolist() == [responses[0]["model_version"]] * 3
+    assert df["fraud_probability"].tolist() == [responses[0]["fraud_probability"]] * 3
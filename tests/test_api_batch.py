@@ -0,0 +1,67 @@
+"""/batch-predict scores every row exactly like /predict scores it alone."""
+
+import pytest
+
+from conftest import TRANSACTION
+
+ROWS = [
+    TRANSACTION,
+    {**TRANSACTION, "amount": 2450.0, "merchant_category": "online", "time_of_day": "night"},
+    # Categories never seen in training
+    {**TRANSACTION, "merchant_category": "casino", "location": "moon", "transaction_type": "barter"},
+    # A numeric time of day
+    {**TRANSACTION, "amount": 0.0, "time_of_day": "23"},
+    # Fields the model has no use for
+    {**TRANSACTION, "amount": 310.5, "loyalty_tier": "gold", "latitude": 48.85}
+]
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client()
+
+
+def predict_each(client, rows):
+    predictions = []
+    for row in rows:
+        response = client.post("/predict", json=row)
+        assert response.status_code == 200, response.text
+        predictions.append(response.json())
+    return predictions
+
+
+def assert_same_predictions(batch, singles):
+    assert len(batch) == len(singles)
+    for scored, single in zip(batch, singles):
+        assert scored["fraud_probability"] == pytest.approx(single["fraud_probability"], abs=1e-9)
+        assert {**scored, "fraud_probability": None} == {**single, "fraud_probability": None}
+
+
+def test_batch_matches_single_predictions(client):
+    singles = predict_each(client, ROWS)
+
+    response = client.post("/batch-predict", json={"transactions": ROWS})
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    assert body["total_transactions"] == len(ROWS)
+    assert body["fraud_count"] == sum(single["is_fraud"] for single in singles)
+    assert_same_predictions(body["predictions"], singles)
+
+
+def test_large_batch_matches_single_predictions(client):
+    singles = predict_each(client, ROWS)
+
+    rows = ROWS * 200
+    response = client.post("/batch-predict", json={"transactions": rows})
+    assert response.status_code == 200, response.text
+
+    assert_same_predictions(response.json()["predictions"], singles * 200)
+
+
+def test_empty_batch(client):
+    response = client.post("/batch-predict", json={"transactions": []})
+
+    assert response.status_code == 200
+    assert response.json()["total_transactions"] == 0
+    assert response.json()["predictions"] == []
@@ -0,0 +1,53 @@
+"""The account feature store as seen through /predict."""
+
+from conftest import TRANSACTION
+
+
+def test_repeated_account_transactions_are_all_recorded(make_client):
+    client = make_client(API_FEATURE_STORE=True, API_PREDICTION_CACHE_SIZE=100)
+    transaction = {**TRANSACTION, "account_id": "acct-1"}
+
+    for _ in range(20):
+        assert client.post("/predict", json=transaction).status_code == 200
+
+    state = client.get("/features/acct-1").json()
+    assert state["window_transactions"] == 20
+    assert client.get("/cache-stats").json()["hits"] == 0
+
+
+def test_previous_fraud_rate_comes_from_labels_not_decisions(make_client):
+    import src.api.app as api
+
+    # Every transaction is flagged: the decisions must not feed previous_fraud_rate
+    client = make_client(API_FEATURE_STORE=True, FRAUD_THRESHOLD=-1.0)
+    transaction = {**TRANSACTION, "account_id": "acct-1"}
+    for _ in range(3):
+        assert client.post("/predict", json=transaction).json()["is_fraud"]
+    assert api.feature_store.update("acct-1", 1.0)["previous_fraud_rate"] is None
+
+    response = client.post("/labels", json={"labels": [
+        {"account_id": "acct-1", "is_fraud": True},
+        {"account_id": "acct-1", "is_fraud": False},
+        {"account_id": "acct-unknown", "is_fraud": True}
+    ]})
+    assert response.json() == {"received": 3, "recorded": 2}
+    state = client.get("/features/acct-1").json()
+    assert (state["labeled"], state["fraud_labels"]) == (2, 1)
+    assert api.feature_store.update("acct-1", 1.0)["previous_fraud_rate"] == 0.5
+
+
+def test_prefork_workers_restore_their_own_snapshot(make_client, tmp_path, monkeypatch):
+    import src.api.app as api
+    from src.api.feature_store import FeatureStore
+
+    monkeypatch.setenv("API_WORKER_INDEX", "1")
+    path = api.feature_store_snapshot_path()
+    assert path == tmp_path / "feature_store" / "snapshot.worker-1.npz"
+
+    store = FeatureStore(max_accounts=4)
+    store.update("acct-7", 50.0)
+    store.save(path)
+
+    client = make_client(API_FEATURE_STORE=True)
+    assert client.get("/features/acct-7").status_code == 200
+    assert not (tmp_path / "feature_store" / "snapshot.npz").exists()
@@ -0,0 +1,26 @@
+"""Tests for the NDJSON streaming endpoint."""
+
+import json
+
+from conftest import TRANSACTION
+
+
+def test_invalid_lines_get_per_line_errors(make_client):
+    client = make_client()
+    lines = [
+        json.dumps(TRANSACTION),
+        "this is not json",
+        json.dumps({"amount": "a lot"}),
+        json.dumps(dict(TRANSACTION, amount=9000.0))
+    ]
+
+    response = client.post("/batch-predict/stream", content="\n".join(lines) + "\n")
+
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert "fraud_probability" in records[0]
+    assert records[1]["line"] == 2 and records[1]["errors"]
+    assert records[2]["line"] == 3 and records[2]["errors"]
+    assert "fraud_probability" in records[3]
+    assert records[-1]["summary"]["total_transactions"] == 2
+    assert records[-1]["summary"]["invalid_lines"] == 2
@@ -0,0 +1,41 @@
+"""Tests for loading the served model bundle."""
+
+import shutil
+
+import numpy as np
+
+from src.api.artifacts import load_model_bundle
+from src.data.transform_plan import PLAN_FILENAME
+from src.models.bundle_format import load_model_bundle_file
+from src.models.compiled_forest import CompiledForest
+from src.models.train import export_model_bundle
+
+
+def test_bundle_file_defers_the_pickle_until_a_large_batch(artifacts_dir, trained_model, tmp_path):
+    models = tmp_path / "models"
+    models.mkdir()
+    shutil.copy(artifacts_dir / "models" / "fraud_detector.pkl", models / "fraud_detector.pkl")
+    compiled = CompiledForest.from_sklearn(trained_model)
+    processed = artifacts_dir / "data" / "processed"
+    export_model_bundle(compiled, processed / PLAN_FILENAME, models, "fraud_detector.fdb")
+
+    bundle = load_model_bundle(
+        model_paths=[str(models / "fraud_detector.pkl")], processed_dir=str(processed),
+        engine="auto", compiled_max_rows=8
+    )
+    assert bundle.bundle_path is not None
+    assert not bundle.sklearn_loaded
+    # The version comes from the bundle checksum alone, so loading never reads the pickle
+    assert bundle.version == load_model_bundle_file(bundle.bundle_path)[3][:12]
+
+    plan = bundle.transform_plan
+    rng = np.random.default_rng(0)
+    columns = {name: plan.mean[j] + plan.scale[j] * rng.normal(size=32)
+               for j, name in zip(plan.numeric_index, plan.numeric_names)}
+
+    small = bundle.score_columns({name: values[:8] for name, values in columns.items()}, 8)
+    assert not bundle.sklearn_loaded
+
+    large = bundle.score_columns(columns, 32)
+    assert bundle.sklearn_loaded
+    np.testing.assert_allclose(large[:8], small, atol=1e-9)
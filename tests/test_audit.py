@@ -0,0 +1,83 @@
+"""Tests for the audit log segment format."""
+
+import asyncio
+
+import numpy as np
+
+from src.api.audit import SEGMENT_MAGIC, AuditLog, encode_block, iter_segment_blocks, read_audit_log
+
+
+def write_segment(path, *blocks):
+    with open(path, "wb") as f:
+        f.write(SEGMENT_MAGIC)
+        for block in blocks:
+            f.write(block)
+
+
+def test_declared_string_columns_keep_their_values(tmp_path):
+    ids = ["000123", "98765432109876543210", None]
+    columns = {"transaction_id": ids, "account_id": [None, None, None], "latitude": [1.5, None, 2.0]}
+    write_segment(tmp_path / "a.seg", encode_block(columns, string_columns=("transaction_id", "account_id")))
+
+    (block,) = iter_segment_blocks(tmp_path / "a.seg")
+    assert block["transaction_id"].tolist() == ids
+    assert block["account_id"].tolist() == [None, None, None]
+    # Undeclared object columns of numbers and None are still stored as floats
+    assert block["latitude"].dtype == np.float64
+    assert np.isnan(block["latitude"][1])
+
+
+def test_audit_log_round_trip(tmp_path):
+    async def run():
+        log = AuditLog(tmp_path, flush_interval=0.01, string_columns=("transaction_id",))
+        log.start()
+        await log.record({"transaction_id": ["000123", None], "fraud_probability": np.array([0.1, 0.9])}, 2)
+        await log.record({"transaction_id": ["42", "7"], "fraud_probability": np.array([0.2, 0.3])}, 2)
+        await log.stop()
+        return log
+
+    log = asyncio.run(run())
+    assert log.rows_written == 4 and log.rows_dropped == 0
+
+    df = read_audit_log(tmp_path)
+    assert df["transaction_id"].isna().tolist() == [False, True, False, False]
+    assert df["transaction_id"].dropna().tolist() == ["000123", "42", "7"]
+    assert df["fraud_probability"].tolist() == [0.1, 0.9, 0.2, 0.3]
+
+
+def test_truncated_tail_block_is_skipped(tmp_path):
+    first = encode_block({"x": np.arange(3.0)})
+    second = encode_block({"x": np.arange(3.0, 6.0)})
+    write_segment(tmp_path / "a.seg", first, second[:-5])
+
+    blocks = list(iter_segment_blocks(tmp_path / "a.seg"))
+    assert len(blocks) == 1
+    np.testing.assert_array_equal(blocks[0]["x"], [0.0, 1.0, 2.0])
+
+
+def test_full_ring_drops_batches_under_the_drop_policy(tmp_path):
+    async def run():
+        log = AuditLog(tmp_path, max_pending_rows=4, flush_interval=60, backpressure="drop")
+        log.start()
+        await log.record({"x": np.arange(3.0)}, 3)
+        await log.record({"x": np.arange(3.0)}, 3)
+        await log.stop()
+        return log
+
+    log = asyncio.run(run())
+    assert (log.rows_written, log.rows_dropped) == (3, 3)
+
+
+def test_segments_rotate_past_their_size_limit(tmp_path):
+    async def run():
+        log = AuditLog(tmp_path, flush_rows=1, segment_max_bytes=1)
+        log.start()
+        for i in range(3):
+            await log.record({"x": np.full(2, float(i))}, 2)
+            await asyncio.sleep(0.01)
+        await log.stop()
+        return log
+
+    log = asyncio.run(run())
+    assert log.writer.segments == 3
+    assert read_audit_log(tmp_path)["x"].tolist() == [0.0, 0.0, 1.0, 1.0, 2.0, 2.0]
@@ -0,0 +1,141 @@
+"""Tests for the adaptive micro-batcher."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.api.batching import MicroBatcher
+
+
+class RecordingScorer:
+    """score_batch stand-in that doubles each item and records the batches it saw."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches = []
+
+    async def __call__(self, items):
+        self.batches.append(list(items))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return [item * 2 for item in items]
+
+
+def test_each_request_gets_its_own_result():
+    scorer = RecordingScorer(delay=0.01)
+    batcher = MicroBatcher(scorer, max_batch_size=8, max_wait_ms=20)
+
+    async def run():
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(50)))
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert results == [i * 2 for i in range(50)]
+    assert sorted(item for batch in scorer.batches for item in batch) == list(range(50))
+    assert all(len(batch) <= 8 for batch in scorer.batches)
+    # Concurrent requests share model calls
+    assert len(scorer.batches) < 50
+    assert batcher.stats()["items"] == 50
+
+
+def test_max_wait_flushes_a_partial_batch():
+    scorer = RecordingScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=256, max_wait_ms=50)
+
+    async def run():
+        batcher.start()
+        try:
+            # Back-to-back arrivals make the batcher expect companions and open a window
+            await asyncio.gather(*(batcher.submit(i) for i in range(4)))
+            started = time.perf_counter()
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+            return results, time.perf_counter() - started
+        finally:
+            await batcher.stop()
+
+    results, elapsed = asyncio.run(run())
+
+    assert results == [0, 2, 4]
+    assert scorer.batches[-1] == [0, 1, 2]
+    # Closed by the window, far below the batch size, without waiting much longer than it
+    assert 0.03 <= elapsed < 1.0
+
+
+def test_sparse_requests_are_scored_without_waiting():
+    scorer = RecordingScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=256, max_wait_ms=20)
+
+    async def run():
+        batcher.start()
+        try:
+            for i in range(3):
+                started = time.perf_counter()
+                assert await batcher.submit(i) == i * 2
+                # Arrivals further apart than the window: no companions to wait for
+                assert time.perf_counter() - started < 0.02
+                await asyncio.sleep(0.03)
+        finally:
+            await batcher.stop()
+
+    asyncio.run(run())
+    assert scorer.batches[1:] == [[1], [2]]
+
+
+def test_scoring_errors_reach_every_request_of_the_batch():
+    async def failing(items):
+        raise ValueError("model exploded")
+
+    batcher = MicroBatcher(failing, max_batch_size=4, max_wait_ms=20)
+
+    async def run():
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(4)), return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_stop_fails_requests_still_queued():
+    batcher = MicroBatcher(RecordingScorer(), max_batch_size=4, max_wait_ms=20)
+
+    async def run():
+        # The batching task never runs, so the request stays queued
+        batcher._wakeup = asyncio.Event()
+        request = asyncio.create_task(batcher.submit(1))
+        await asyncio.sleep(0)
+        await batcher.stop()
+        with pytest.raises(RuntimeError, match="stopped"):
+            await request
+
+    asyncio.run(run())
+    assert batcher.stats()["pending"] == 0
+
+
+def test_stop_fails_the_batch_being_scored():
+    scoring = None
+
+    async def never_returns(items):
+        scoring.set()
+        await asyncio.Event().wait()
+
+    batcher = MicroBatcher(never_returns, max_batch_size=4, max_wait_ms=0)
+
+    async def run():
+        nonlocal scoring
+        scoring = asyncio.Event()
+        batcher.start()
+        request = asyncio.create_task(batcher.submit(1))
+        await scoring.wait()
+        await batcher.stop()
+        with pytest.raises(RuntimeError, match="stopped"):
+            await asyncio.wait_for(request, 1.0)
+
+    asyncio.run(run())
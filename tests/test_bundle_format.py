@@ -0,0 +1,47 @@
+"""Tests for the memory-mappable model bundle."""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.models.bundle_format import read_bundle, write_bundle
+
+
+def test_round_trip(tmp_path):
+    arrays = {"b": np.arange(5, dtype=np.int32), "a": np.linspace(0, 1, 7).reshape(7, 1)}
+    checksum = write_bundle(tmp_path / "m.fdb", {"answer": 42}, arrays)
+
+    metadata, loaded, loaded_checksum = read_bundle(tmp_path / "m.fdb")
+
+    assert metadata == {"answer": 42}
+    assert loaded_checksum == checksum
+    for name, values in arrays.items():
+        np.testing.assert_array_equal(loaded[name], values)
+        assert loaded[name].ctypes.data % 64 == 0
+
+
+def test_corrupted_bundle_fails_checksum(tmp_path):
+    path = tmp_path / "m.fdb"
+    write_bundle(path, {}, {"x": np.zeros(100)})
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="checksum"):
+        read_bundle(path)
+
+
+def test_rewrite_leaves_mapped_bundle_intact(tmp_path):
+    path = tmp_path / "m.fdb"
+    write_bundle(path, {"v": 1}, {"x": np.arange(100_000, dtype=np.float64)})
+    _, old, _ = read_bundle(path)
+
+    # A smaller bundle would truncate the mapped file if written in place
+    write_bundle(path, {"v": 2}, {"x": np.ones(10)})
+
+    np.testing.assert_array_equal(old["x"], np.arange(100_000, dtype=np.float64))
+    metadata, new, _ = read_bundle(path)
+    assert metadata == {"v": 2}
+    np.testing.assert_array_equal(new["x"], np.ones(10))
+    assert os.listdir(tmp_path) == ["m.fdb"]
@@ -0,0 +1,116 @@
+"""Tests for the prediction cache."""
+
+import asyncio
+
+import pytest
+
+from src.api.cache import PredictionCache, transaction_key
+
+
+def test_key_is_canonical_and_versioned():
+    assert transaction_key({"a": 1, "b": "x"}, "v1") == transaction_key({"b": "x", "a": 1}, "v1")
+    assert transaction_key({"a": 1}, "v1") != transaction_key({"a": 1}, "v2")
+    assert transaction_key({"a": 1}, "v1") != transaction_key({"a": 2}, "v1")
+
+
+def test_hits_expiry_and_lru_eviction(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("src.api.cache.time.monotonic", lambda: now[0])
+    cache = PredictionCache(max_entries=2, ttl_seconds=10)
+    calls = []
+
+    async def compute(value):
+        calls.append(value)
+        return value
+
+    async def run():
+        assert await cache.get_or_compute("a", lambda: compute(1)) == 1
+        assert await cache.get_or_compute("a", lambda: compute(2)) == 1
+        await cache.get_or_compute("b", lambda: compute(3))
+        await cache.get_or_compute("a", lambda: compute(4))  # a is now most recently used
+        await cache.get_or_compute("c", lambda: compute(5))  # evicts b
+        assert await cache.get_or_compute("a", lambda: compute(6)) == 1
+        now[0] = 11.0
+        assert await cache.get_or_compute("a", lambda: compute(7)) == 7
+
+    asyncio.run(run())
+    assert calls == [1, 3, 5, 7]
+    stats = cache.stats()
+    assert (stats["hits"], stats["evictions"], stats["expirations"]) == (3, 1, 1)
+
+
+def test_concurrent_requests_share_one_computation():
+    cache = PredictionCache()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["result"] * 5
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_computation():
+    cache = PredictionCache()
+    release = None
+
+    async def compute():
+        await release.wait()
+        return "result"
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        owner = asyncio.create_task(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return await owner
+
+    assert asyncio.run(run()) == "result"
+    assert cache.stats()["entries"] == 1
+
+
+def test_cancelled_owner_cancels_waiters_and_caches_nothing():
+    cache = PredictionCache()
+
+    async def compute():
+        await asyncio.sleep(10)
+
+    async def run():
+        owner = asyncio.create_task(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        owner.cancel()
+        results = await asyncio.gather(owner, waiter, return_exceptions=True)
+        return [type(result) for result in results]
+
+    assert asyncio.run(run()) == [asyncio.CancelledError, asyncio.CancelledError]
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = PredictionCache()
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("model failed")
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(3)), return_exceptions=True)
+
+    assert [type(result) for result in asyncio.run(run())] == [RuntimeError] * 3
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,64 @@
+"""Tests for the raw columnar payload format."""
+
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from src.api.columnar import RAW_MAGIC, decode_raw_columns, encode_raw_columns
+from src.data.transform_plan import CompiledTransformPlan
+
+PLAN = CompiledTransformPlan({
+    "version": 1,
+    "columns": [
+        {"name": "amount", "kind": "numeric", "default": 0.0},
+        {"name": "merchant_category", "kind": "categorical", "categories": ["grocery", "online"],
+         "default_code": 0}
+    ],
+    "mean": [0.0, 0.0],
+    "scale": [1.0, 1.0]
+})
+
+
+def payload(header: dict, data: bytes = b"") -> bytes:
+    header = json.dumps(header).encode()
+    return RAW_MAGIC + struct.pack("<I", len(header)) + header + data
+
+
+def test_round_trip_without_copies():
+    columns = {"amount": np.array([1.5, 2.5]), "merchant_category": np.array([1, 0], dtype=np.int32)}
+    body = encode_raw_columns(columns)
+    decoded, n_rows = decode_raw_columns(body, PLAN)
+
+    assert n_rows == 2
+    for name, values in columns.items():
+        np.testing.assert_array_equal(decoded[name], values)
+        assert decoded[name].base is not None
+
+
+@pytest.mark.parametrize("header", [
+    {"n_rows": -1, "columns": [{"name": "amount", "dtype": "<f8"}]},
+    {"n_rows": 1, "columns": [{"dtype": "<f8"}]},
+    {"n_rows": 1, "columns": [{"name": "amount"}]},
+    {"n_rows": 1, "columns": [{"name": "amount", "dtype": "not-a-dtype"}]},
+    {"n_rows": 1, "columns": [{"name": "amount", "dtype": "<U4"}]},
+    {"n_rows": 1, "columns": ["amount"]},
+    {"columns": []},
+])
+def test_malformed_headers_raise_value_error(header):
+    with pytest.raises(ValueError):
+        decode_raw_columns(payload(header, b"\0" * 64))
+
+
+def test_truncated_buffer():
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_raw_columns(payload({"n_rows": 100, "columns": [{"name": "amount", "dtype": "<f8"}]}, b"\0" * 8))
+
+
+def test_float_codes_for_categorical_features_are_rejected():
+    body = encode_raw_columns({"merchant_category": np.array([1.0, 0.0])})
+    with pytest.raises(ValueError, match="integer codes"):
+        decode_raw_columns(body, PLAN)
+    # Without a plan the column is decoded as sent (e.g. audit segments)
+    assert decode_raw_columns(body)[1] == 2
@@ -0,0 +1,71 @@
+"""Tests for the array-backed compiled forest."""
+
+import numpy as np
+
+from src.models.compiled_forest import CompiledForest
+
+
+def test_matches_sklearn(trained_model, processed_data):
+    _, _, X_test, _, _ = processed_data
+    compiled = CompiledForest.from_sklearn(trained_model)
+
+    np.testing.assert_allclose(compiled.predict_proba(X_test), trained_model.predict_proba(X_test), atol=1e-12)
+    np.testing.assert_array_equal(compiled.predict(X_test), trained_model.predict(X_test))
+
+
+def test_save_load_round_trip(trained_model, processed_data, tmp_path):
+    _, _, X_test, _, _ = processed_data
+    compiled = CompiledForest.from_sklearn(trained_model)
+    compiled.save(tmp_path / "forest.npz")
+    loaded = CompiledForest.load(tmp_path / "forest.npz")
+
+    np.testing.assert_array_equal(loaded.predict_fraud_proba(X_test), compiled.predict_fraud_proba(X_test))
+
+
+def test_fused_scaler_scores_raw_features(trained_model, processed_data):
+    _, _, X_test, _, _ = processed_data
+    rng = np.random.default_rng(0)
+    mean = rng.normal(size=X_test.shape[1])
+    scale = rng.uniform(0.5, 2.0, size=X_test.shape[1])
+    compiled = CompiledForest.from_sklearn(trained_model)
+    fused = compiled.fuse_scaler(mean, scale)
+
+    diff = np.abs(fused.predict_fraud_proba(X_test * scale + mean) - compiled.predict_fraud_proba(X_test))
+    # Only rows within float32 rounding of a split may take the other branch
+    assert diff.mean() < 1e-3
+
+
+def test_early_exit_without_retirement_is_exact(trained_model, processed_data):
+    _, _, X_test, _, _ = processed_data
+    compiled = CompiledForest.from_sklearn(trained_model)
+
+    # A boundary at every probability keeps every row active until the last tree
+    proba, trees_used = compiled.predict_fraud_proba_early_exit(
+        X_test, boundaries=np.linspace(0, 1, 1001), block_trees=4, delta=0.01
+    )
+    np.testing.assert_allclose(proba, compiled.predict_fraud_proba(X_test), atol=1e-12)
+    assert (trees_used == compiled.n_estimators).all()
+
+
+def test_early_exit_retires_clear_rows(trained_model, processed_data):
+    _, _, X_test, _, _ = processed_data
+    compiled = CompiledForest.from_sklearn(trained_model)
+
+    proba, trees_used = compiled.predict_fraud_proba_early_exit(X_test, block_trees=5, delta=0.1)
+    assert trees_used.min() < compiled.n_estimators
+    full = compiled.predict_fraud_proba(X_test)
+    assert ((proba > 0.5) == (full > 0.5)).mean() >= 0.99
+
+
+def test_early_exit_report_uses_the_fraud_threshold(trained_model, processed_data):
+    from src.models.compiled_forest import DECISION_BOUNDARIES
+    from src.models.train import evaluate_early_exit
+
+    _, _, X_test, _, _ = processed_data
+    compiled = CompiledForest.from_sklearn(trained_model)
+
+    report = evaluate_early_exit(compiled, X_test, deltas=(0.1,), block_trees=5, threshold=0.35)[0.1]
+    boundaries = np.union1d(DECISION_BOUNDARIES, [0.35])
+    early, _ = compiled.predict_fraud_proba_early_exit(X_test, boundaries=boundaries, block_trees=5, delta=0.1)
+    full = compiled.predict_fraud_proba(X_test)
+    assert report["fraud_decision_agreement"] == ((early > 0.35) == (full > 0.35)).mean()
@@ -0,0 +1,86 @@
+"""Tests for the chunked data generator and the chunked CSV loader."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_loader import (
+    MERCHANT_CATEGORIES, generate_fraud_data_chunks, load_data_from_csv, save_fraud_data_chunks
+)
+
+N_SAMPLES = 5000
+CHUNK_SIZE = 1200
+
+
+def generate(n_workers: int) -> pd.DataFrame:
+    chunks = generate_fraud_data_chunks(N_SAMPLES, chunk_size=CHUNK_SIZE, n_workers=n_workers, seed=7)
+    return pd.concat(list(chunks), ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def generated():
+    return generate(n_workers=1)
+
+
+@pytest.mark.parametrize("n_workers", [2, 3])
+def test_output_does_not_depend_on_the_number_of_workers(generated, n_workers):
+    pd.testing.assert_frame_equal(generate(n_workers), generated)
+
+
+def test_chunks_have_the_requested_size_and_fraud_ratio():
+    chunks = list(generate_fraud_data_chunks(N_SAMPLES, fraud_ratio=0.1, chunk_size=CHUNK_SIZE, as_frames=False))
+
+    assert [len(chunk["amount"]) for chunk in chunks] == [1200, 1200, 1200, 1200, 200]
+    assert sum(int(chunk["is_fraud"].sum()) for chunk in chunks) == int(N_SAMPLES * 0.1)
+    ids = np.concatenate([chunk["transaction_id"] for chunk in chunks])
+    np.testing.assert_array_equal(ids, np.arange(1, N_SAMPLES + 1))
+
+
+def test_seed_changes_the_data(generated):
+    other = pd.concat(generate_fraud_data_chunks(N_SAMPLES, chunk_size=CHUNK_SIZE, seed=8), ignore_index=True)
+
+    assert not np.array_equal(other["amount"].to_numpy(), generated["amount"].to_numpy())
+    assert list(generated["merchant_category"].cat.categories) == list(MERCHANT_CATEGORIES)
+
+
+@pytest.fixture(scope="module")
+def csv_path(generated, tmp_path_factory):
+    path = tmp_path_factory.mktemp("raw") / "fraud_transactions.csv"
+    save_fraud_data_chunks(
+        (generated.iloc[start:start + CHUNK_SIZE] for start in range(0, N_SAMPLES, CHUNK_SIZE)), path
+    )
+    return path
+
+
+def assert_same_values(chunked: pd.DataFrame, expected: pd.DataFrame):
+    assert list(chunked.columns) == list(expected.columns)
+    assert len(chunked) == len(expected)
+    for name in expected.columns:
+        if isinstance(chunked[name].dtype, pd.CategoricalDtype):
+            assert chunked[name].astype(str).tolist() == expected[name].astype(str).tolist()
+        else:
+            # The chunked reader parses floats straight to float32
+            np.testing.assert_allclose(chunked[name].to_numpy(np.float64), expected[name].to_numpy(np.float64), rtol=1e-6)
+
+
+@pytest.mark.parametrize("chunksize", [1000, 4096, 100_000])
+def test_chunked_load_matches_a_single_read(csv_path, chunksize):
+    chunked = load_data_from_csv(csv_path, chunksize=chunksize)
+
+    assert_same_values(chunked, pd.read_csv(csv_path))
+    assert chunked["amount"].dtype == np.float32
+    assert isinstance(chunked["merchant_category"].dtype, pd.CategoricalDtype)
+
+
+def test_chunked_filters_and_projection_match_pandas(csv_path):
+    filters = [("amount", ">", 100.0), ("merchant_category", "==", "online")]
+    columns = ["transaction_id", "amount", "is_fraud"]
+
+    chunked = load_data_from_csv(csv_path, chunksize=1000, columns=columns, filters=filters)
+
+    expected = pd.read_csv(csv_path)
+    expected = expected[(expected["amount"] > 100.0) & (expected["merchant_category"] == "online")][columns]
+    assert 0 < len(chunked) < N_SAMPLES
+    assert_same_values(chunked, expected.reset_index(drop=True))
+    # Without a chunksize the same filters give the same rows
+    assert_same_values(load_data_from_csv(csv_path, columns=columns, filters=filters), chunked)
@@ -0,0 +1,104 @@
+"""Tests for the drift reference distributions and the streaming monitor."""
+
+import numpy as np
+import pytest
+
+from src.api.drift import DriftMonitor
+from src.data.drift_reference import (
+    DriftReference, add_reference_distributions, ks_statistic, population_stability_index
+)
+
+N_ROWS = 20000
+
+
+def make_reference(X: np.ndarray) -> DriftReference:
+    plan = {
+        "columns": [
+            {"name": "amount", "kind": "numeric"},
+            {"name": "merchant_category", "kind": "categorical", "categories": ["a", "b", "c"]}
+        ],
+        "mean": [100.0, 1.0],
+        "scale": [20.0, 1.0]
+    }
+    return DriftReference.from_plan(add_reference_distributions(plan, X, n_bins=10))
+
+
+def training_rows(rng, shift: float = 0.0) -> np.ndarray:
+    return np.column_stack([rng.normal(100 + shift, 20, N_ROWS), rng.integers(0, 3, N_ROWS)]).astype(np.float64)
+
+
+@pytest.fixture
+def reference():
+    return make_reference(training_rows(np.random.default_rng(0)))
+
+
+def test_reference_bins_hold_equal_shares(reference):
+    assert reference.n_bins.tolist() == [10, 3]
+    np.testing.assert_allclose(reference.proportions[0], 0.1, atol=1e-3)
+    np.testing.assert_allclose(reference.proportions[1, :3], 1 / 3, atol=0.02)
+    assert DriftReference.from_plan({"columns": [{"name": "x", "kind": "numeric"}]}) is None
+
+
+def test_sketch_counts_every_row(reference):
+    X = training_rows(np.random.default_rng(1))
+    sketch = reference.sketch(X)
+    assert (sketch.counts.sum(axis=1) == N_ROWS).all()
+    np.testing.assert_array_equal(sketch.minimum, X.min(axis=0))
+
+
+def test_sketch_skips_missing_values(reference):
+    X = training_rows(np.random.default_rng(1))
+    X[::2, 0] = np.nan
+    sketch = reference.sketch(X)
+    assert sketch.n_rows == N_ROWS
+    assert sketch.counts[0].sum() == N_ROWS // 2
+    assert sketch.counts[1].sum() == N_ROWS
+    assert sketch.minimum[0] == np.nanmin(X[:, 0])
+
+
+def test_sample_index_takes_a_uniform_share_of_the_rows(reference):
+    index = reference.sample_index(100, 0.1)
+    assert len(index) == 10
+    assert (np.diff(index) == 10).all()
+    assert reference.sample_index(0, 0.1) is None
+
+
+def test_psi_and_ks_separate_shifted_traffic(reference):
+    same = reference.sketch(training_rows(np.random.default_rng(1))).counts / N_ROWS
+    shifted = reference.sketch(training_rows(np.random.default_rng(1), shift=20)).counts / N_ROWS
+
+    psi_same = population_stability_index(reference.proportions, same)
+    psi_shifted = population_stability_index(reference.proportions, shifted)
+    assert psi_same[0] < 0.01 and psi_shifted[0] > 0.25
+    assert psi_shifted[1] < 0.01
+    assert ks_statistic(reference.proportions, shifted)[0] > 0.3
+
+
+def test_monitor_reports_drift_in_the_window_only(reference):
+    monitor = DriftMonitor(reference, "v1", window_seconds=100, n_buckets=10, min_rows=1000)
+    monitor.add(training_rows(np.random.default_rng(1), shift=20), "v1", now=0.0)
+    monitor.add(training_rows(np.random.default_rng(2)), "v0", now=0.0)
+
+    report = monitor.report(now=50.0)
+    assert report["window_rows"] == N_ROWS
+    assert report["drifted_features"] == ["amount"]
+    assert report["features"]["merchant_category"]["status"] == "stable"
+    assert 110 < report["features"]["amount"]["live_quantiles"]["p50"] < 130
+    assert monitor.stats()["stale_samples"] == 1
+
+    # The bucket has left the window
+    assert monitor.report(now=150.0)["features"]["amount"]["status"] == "insufficient_data"
+
+
+def test_monitor_does_not_score_features_that_are_never_observed(reference):
+    monitor = DriftMonitor(reference, "v1", window_seconds=100, n_buckets=10, min_rows=1000)
+    X = training_rows(np.random.default_rng(1))
+    X[:, 1] = np.nan
+    monitor.add(X, "v1", now=0.0)
+
+    report = monitor.report(now=50.0)
+    assert report["window_rows"] == N_ROWS
+    assert report["drifted_features"] == []
+    assert report["features"]["amount"]["status"] == "stable"
+    assert report["features"]["merchant_category"]["status"] == "insufficient_data"
+    assert report["features"]["merchant_category"]["observed_rows"] == 0
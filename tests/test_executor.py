@@ -0,0 +1,111 @@
+"""Tests for the inference executor and the event-loop lag monitor."""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from src.api.executor import EventLoopLagMonitor, InferenceExecutor
+
+
+class ConcurrencyProbe:
+    """Blocking call that records how many copies of itself run at once."""
+
+    def __init__(self, duration: float):
+        self.duration = duration
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.duration)
+        with self._lock:
+            self.running -= 1
+        return value
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError, match="Unknown executor kind"):
+        InferenceExecutor(kind="gpu")
+
+
+def test_concurrency_is_bounded_below_the_pool_size():
+    executor = InferenceExecutor(kind="thread", max_workers=4, max_concurrency=2)
+    probe = ConcurrencyProbe(duration=0.02)
+
+    async def run():
+        executor.start()
+        try:
+            return await asyncio.gather(*(executor.run(probe, i) for i in range(8)))
+        finally:
+            executor.shutdown()
+
+    assert asyncio.run(run()) == list(range(8))
+    assert probe.peak == 2
+    stats = executor.stats()
+    assert (stats["calls"], stats["in_flight"], stats["waiting"]) == (8, 0, 0)
+
+
+def lag_while_blocking(kind: str, duration: float = 0.2) -> float:
+    """Maximum event-loop lag seen while one blocking call runs on an executor of the given kind."""
+    executor = InferenceExecutor(kind=kind, max_workers=1)
+    monitor = EventLoopLagMonitor(interval=0.01)
+
+    async def run():
+        executor.start()
+        monitor.start()
+        try:
+            await asyncio.sleep(0.03)
+            await executor.run(time.sleep, duration)
+            await asyncio.sleep(0.03)
+        finally:
+            await monitor.stop()
+            executor.shutdown()
+
+    asyncio.run(run())
+    assert monitor.samples > 0
+    return monitor.stats()["max_lag_ms"] / 1000
+
+
+def test_thread_executor_keeps_the_event_loop_free():
+    assert lag_while_blocking("thread") < 0.1
+
+
+def test_lag_monitor_sees_inline_calls_block_the_loop():
+    assert lag_while_blocking("inline") >= 0.15
+
+
+def test_process_workers_are_warmed_up_and_serve_calls():
+    executor = InferenceExecutor(kind="process", max_workers=2)
+
+    async def run():
+        executor.start()
+        try:
+            await executor.warm_up(os.getpid)
+            return await asyncio.gather(*(executor.run(os.getpid) for _ in range(4)))
+        finally:
+            executor.shutdown()
+
+    pids = asyncio.run(run())
+    assert os.getpid() not in pids
+    assert len(set(pids)) <= 2
+
+
+def test_drain_waits_for_calls_in_flight():
+    executor = InferenceExecutor(kind="thread", max_workers=1)
+
+    async def run():
+        executor.start()
+        call = asyncio.create_task(executor.run(time.sleep, 0.05))
+        queued = asyncio.create_task(executor.run(time.sleep, 0.05))
+        await asyncio.sleep(0.01)
+        await executor.drain_and_shutdown(poll_interval=0.005)
+        return call.done() and queued.done()
+
+    assert asyncio.run(run())
+    assert executor.calls == 2
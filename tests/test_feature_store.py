@@ -0,0 +1,127 @@
+"""Tests for the online account feature store."""
+
+import math
+
+import numpy as np
+
+from src.api.feature_store import SECONDS_PER_DAY, FeatureStore
+
+T0 = 1_700_000_000.0
+
+
+def test_account_age_needs_an_open_date():
+    store = FeatureStore(max_accounts=4, ring_size=4)
+
+    # First sight of an account says nothing about its age
+    assert store.update("a", 10.0, T0)["account_age_days"] is None
+    assert store.update("a", 10.0, T0 + SECONDS_PER_DAY)["account_age_days"] is None
+
+    opened = T0 - 30 * SECONDS_PER_DAY
+    assert math.isclose(store.update("b", 10.0, T0, opened_at=opened)["account_age_days"], 30.0)
+    # The open date is remembered for later transactions
+    assert math.isclose(store.update("b", 10.0, T0 + SECONDS_PER_DAY)["account_age_days"], 31.0)
+
+
+def test_snapshot_keeps_open_dates(tmp_path):
+    store = FeatureStore(max_accounts=4, ring_size=4)
+    store.update("a", 10.0, T0, opened_at=T0 - SECONDS_PER_DAY)
+    store.update("b", 20.0, T0)
+    store.save(tmp_path / "snapshot.npz")
+
+    restored = FeatureStore(max_accounts=4, ring_size=4)
+    assert restored.load(tmp_path / "snapshot.npz") == 2
+    assert restored.account_state("a", T0)["opened_at"] == T0 - SECONDS_PER_DAY
+    assert restored.account_state("b", T0)["opened_at"] is None
+
+
+def test_version_1_snapshot_loads_without_open_dates(tmp_path):
+    store = FeatureStore(max_accounts=4, ring_size=4)
+    store.update("a", 10.0, T0)
+    arrays = store.snapshot()
+    del arrays["opened_at"]
+    arrays["version"] = np.array(1)
+    FeatureStore.write_snapshot(arrays, tmp_path / "snapshot.npz")
+
+    restored = FeatureStore(max_accounts=4, ring_size=4)
+    assert restored.load(tmp_path / "snapshot.npz") == 1
+    assert restored.update("a", 10.0, T0 + 60)["account_age_days"] is None
+
+
+def test_window_counts_and_evicts_old_transactions():
+    store = FeatureStore(max_accounts=4, ring_size=8, window_seconds=100)
+    frequencies = [store.update("a", 1.0, T0 + t)["transaction_frequency"] for t in (0, 10, 20, 150)]
+
+    # Features describe the history before each transaction; at t=150 the first three left the window
+    assert frequencies == [0.0, 1.0, 2.0, 0.0]
+    state = store.account_state("a", T0 + 150)
+    assert state["window_transactions"] == 1
+    assert state["window_amount"] == 1.0
+
+
+def test_full_ring_drops_its_oldest_entry():
+    store = FeatureStore(max_accounts=2, ring_size=3)
+    for t in range(5):
+        store.update("a", float(t + 1), T0 + t)
+
+    state = store.account_state("a", T0 + 5)
+    assert state["window_transactions"] == 3
+    assert state["window_amount"] == 3.0 + 4.0 + 5.0
+    assert store.ring_overflows == 2
+
+
+def test_distance_from_home_and_previous_fraud_rate():
+    store = FeatureStore(max_accounts=2)
+    first = store.update("a", 1.0, T0, latitude=48.8566, longitude=2.3522)
+    assert first["distance_from_home"] is None and first["previous_fraud_rate"] is None
+    assert store.record_labels(["a", None, "unknown"], [True, True, True]) == 1
+    store.update("a", 1.0, T0 + 1, latitude=48.8566, longitude=2.3522)
+    store.record_labels(["a"], [False])
+
+    features = store.update("a", 1.0, T0 + 2, latitude=51.5074, longitude=-0.1278)
+    # Paris to London
+    assert 340 < features["distance_from_home"] < 345
+    assert features["previous_fraud_rate"] == 0.5
+
+
+def test_version_2_snapshot_drops_the_model_decision_counts(tmp_path):
+    store = FeatureStore(max_accounts=4, ring_size=4)
+    store.update("a", 10.0, T0)
+    arrays = store.snapshot()
+    del arrays["labeled"], arrays["fraud_labels"]
+    arrays["scored"], arrays["flagged"] = np.array([4]), np.array([2])
+    arrays["version"] = np.array(2)
+    FeatureStore.write_snapshot(arrays, tmp_path / "snapshot.npz")
+
+    restored = FeatureStore(max_accounts=4, ring_size=4)
+    assert restored.load(tmp_path / "snapshot.npz") == 1
+    assert restored.update("a", 10.0, T0 + 60)["previous_fraud_rate"] is None
+
+
+def test_least_recently_seen_account_is_evicted():
+    store = FeatureStore(max_accounts=2)
+    store.update("a", 1.0, T0)
+    store.update("b", 1.0, T0)
+    store.update("a", 1.0, T0 + 1)
+    store.update("c", 1.0, T0 + 2)
+
+    assert store.account_state("b") is None
+    assert store.account_state("a", T0 + 2)["window_transactions"] == 2
+    assert store.account_evictions == 1
+    assert store.stats()["used_bytes"] == 2 * store.bytes_per_account
+
+
+def test_restore_into_a_smaller_store_keeps_recent_accounts_and_entries(tmp_path):
+    store = FeatureStore(max_accounts=4, ring_size=4)
+    for t, account in enumerate(["a", "b", "c", "c", "c", "c"]):
+        store.update(account, float(t), T0 + t)
+    store.save(tmp_path / "snapshot.npz")
+
+    restored = FeatureStore(max_accounts=2, ring_size=2)
+    assert restored.load(tmp_path / "snapshot.npz") == 2
+    assert restored.account_state("a") is None
+    state = restored.account_state("c", T0 + 6)
+    assert state["window_transactions"] == 2
+    assert state["window_amount"] == 4.0 + 5.0
+    # New accounts still get free rows
+    restored.update("d", 1.0, T0 + 7)
+    assert restored.account_state("b") is None and restored.accounts == 2
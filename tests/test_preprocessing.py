@@ -0,0 +1,109 @@
+"""Tests for the lean in-memory and the streaming (out-of-core) preprocessing."""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_loader import generate_fraud_data, generate_fraud_data_chunks
+from src.data.preprocessing import preprocess_data, preprocess_data_streaming
+from src.data.storage import has_pyarrow, raw_data_path, write_raw_data
+from src.data.transform_plan import PLAN_FILENAME, load_transform_plan
+
+CHUNK_ROWS = 700
+
+
+@pytest.fixture(scope="module")
+def raw_data():
+    return generate_fraud_data(n_samples=3000, fraud_ratio=0.1)
+
+
+@pytest.mark.parametrize("source", ["frame", "chunked generator"])
+def test_lean_matches_the_default_path(raw_data, tmp_path, source):
+    if source == "chunked generator":
+        # float32 columns and a categorical merchant_category
+        raw_data = pd.concat(generate_fraud_data_chunks(3000, chunk_size=1000), ignore_index=True)
+
+    default = preprocess_data(raw_data, test_size=0.25, random_state=7, save_path=tmp_path / "default")
+    lean = preprocess_data(raw_data, test_size=0.25, random_state=7, save_path=tmp_path / "lean", lean=True)
+
+    for lean_X, default_X in zip(lean[:2], default[:2]):
+        assert lean_X.dtype == np.float32
+        np.testing.assert_allclose(lean_X, default_X, rtol=1e-4, atol=1e-5)
+    for lean_y, default_y in zip(lean[2:4], default[2:4]):
+        np.testing.assert_array_equal(lean_y, default_y)
+    np.testing.assert_allclose(lean[4].mean_, default[4].mean_, rtol=1e-6)
+    np.testing.assert_allclose(lean[4].scale_, default[4].scale_, rtol=1e-6)
+    assert lean[5].keys() == default[5].keys()
+    for name, encoder in default[5].items():
+        np.testing.assert_array_equal(lean[5][name].classes_, encoder.classes_)
+
+    lean_plan = load_transform_plan(tmp_path / "lean" / PLAN_FILENAME)
+    default_plan = load_transform_plan(tmp_path / "default" / PLAN_FILENAME)
+    for lean_column, default_column in zip(lean_plan["columns"], default_plan["columns"]):
+        assert lean_column.keys() == default_column.keys()
+        if default_column["kind"] == "categorical":
+            assert lean_column == default_column
+        else:
+            assert lean_column["default"] == pytest.approx(default_column["default"], rel=1e-6)
+
+
+def test_lean_features_are_one_contiguous_matrix(raw_data):
+    X_train, X_test, _, _, _, _ = preprocess_data(raw_data, test_size=0.25, random_state=7, lean=True)
+
+    assert X_train.flags.c_contiguous and X_test.flags.c_contiguous
+    assert X_train.base is not None and X_train.base is X_test.base
+    np.testing.assert_allclose(X_train.mean(axis=0), 0.0, atol=1e-4)
+
+
+def chunked(df):
+    return lambda: (df[start:start + CHUNK_ROWS] for start in range(0, len(df), CHUNK_ROWS))
+
+
+def test_split_is_stratified_and_keeps_every_row(raw_data, tmp_path):
+    X_train, X_test, y_train, y_test, _, _ = preprocess_data_streaming(
+        chunked(raw_data), tmp_path, test_size=0.25, random_state=7
+    )
+
+    assert len(X_train) + len(X_test) == len(raw_data)
+    assert X_train.shape[1] == raw_data.shape[1] - 2
+    for label, count in raw_data["is_fraud"].value_counts().items():
+        # The same rounding as train_test_split over the whole dataset
+        assert (y_test == label).sum() == math.ceil(0.25 * count)
+        assert (y_train == label).sum() == count - math.ceil(0.25 * count)
+
+
+def test_split_is_reproducible_and_seeded(raw_data, tmp_path):
+    first = preprocess_data_streaming(chunked(raw_data), tmp_path / "a", random_state=7)
+    second = preprocess_data_streaming(chunked(raw_data), tmp_path / "b", random_state=7)
+    other = preprocess_data_streaming(chunked(raw_data), tmp_path / "c", random_state=8)
+
+    np.testing.assert_array_equal(first[0], second[0])
+    np.testing.assert_array_equal(first[3], second[3])
+    assert first[0].shape == other[0].shape
+    assert not np.array_equal(first[0], other[0])
+
+
+def test_training_features_are_standardized(raw_data, tmp_path):
+    X_train, X_test, _, _, scaler, encoders = preprocess_data_streaming(chunked(raw_data), tmp_path)
+
+    np.testing.assert_allclose(X_train.mean(axis=0), 0.0, atol=1e-4)
+    np.testing.assert_allclose(X_train.std(axis=0), 1.0, atol=1e-3)
+    assert set(encoders["merchant_category"].classes_) == set(raw_data["merchant_category"])
+    # Outputs are read-only memory maps of the saved arrays
+    assert isinstance(X_test, np.memmap) and not X_test.flags.writeable
+    assert (tmp_path / "X_train.npy").exists()
+
+
+@pytest.mark.skipif(not has_pyarrow(), reason="pyarrow is not installed")
+def test_split_does_not_depend_on_the_file_format(raw_data, tmp_path):
+    results = []
+    for data_format in ("parquet", "csv"):
+        path = raw_data_path(tmp_path / data_format, data_format)
+        write_raw_data(raw_data, path, row_group_size=500)
+        results.append(preprocess_data_streaming(path, tmp_path / f"{data_format}-out", chunksize=CHUNK_ROWS))
+
+    (X_parquet, _, y_parquet, _, _, _), (X_csv, _, y_csv, _, _, _) = results
+    np.testing.assert_allclose(X_parquet, X_csv, atol=1e-5)
+    np.testing.assert_array_equal(y_parquet, y_csv)
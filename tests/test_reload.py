@@ -0,0 +1,102 @@
+"""Tests for hot-reloading the model bundle."""
+
+import pickle
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import TRANSACTION
+
+
+@pytest.fixture
+def deploy_dir(artifacts_dir, tmp_path, monkeypatch):
+    """Private copy of the artifacts, so deployments don't leak into other tests."""
+    root = tmp_path / "deploy"
+    shutil.copytree(artifacts_dir / "models", root / "models")
+    shutil.copytree(artifacts_dir / "data" / "processed", root / "data" / "processed")
+    monkeypatch.chdir(root)
+    return root
+
+
+@pytest.fixture
+def retrained_model(processed_data):
+    """A model that scores TRANSACTION differently from the one first deployed."""
+    from sklearn.ensemble import RandomForestClassifier
+
+    _, X_train, _, y_train, _ = processed_data
+    model = RandomForestClassifier(n_estimators=5, max_depth=3, random_state=1)
+    return model.fit(X_train, y_train)
+
+
+def deploy(root, model, X_test):
+    """Write a model the way the training pipeline does."""
+    from src.models.train import compile_model
+
+    with open(root / "models" / "fraud_detector.pkl", "wb") as f:
+        pickle.dump(model, f)
+    compile_model(model, X_test, root / "models", "fraud_detector_compiled.npz")
+
+
+def score(client):
+    response = client.post("/predict", json=TRANSACTION)
+    assert response.status_code == 200
+    body = response.json()
+    return body["model_version"], body["fraud_probability"]
+
+
+def test_reload_serves_the_new_model(make_client, deploy_dir, retrained_model, processed_data):
+    client = make_client()
+    old_version, old_probability = score(client)
+
+    deploy(deploy_dir, retrained_model, processed_data[2])
+    response = client.post("/admin/reload")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["previous_version"] == old_version
+    new_version = body["model_version"]
+    assert new_version != old_version
+    assert client.get("/model-info").json()["model_version"] == new_version
+    version, probability = score(client)
+    assert version == new_version
+    assert probability != pytest.approx(old_probability)
+
+
+def test_requests_during_a_reload_see_one_whole_bundle(make_client, deploy_dir, retrained_model, processed_data):
+    client = make_client()
+    old = score(client)
+    deploy(deploy_dir, retrained_model, processed_data[2])
+
+    done = threading.Event()
+
+    def hammer():
+        seen = []
+        while not done.is_set():
+            seen.append(score(client))
+        return seen
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        workers = [pool.submit(hammer) for _ in range(4)]
+        response = client.post("/admin/reload")
+        new = score(client)
+        done.set()
+        seen = [result for worker in workers for result in worker.result()]
+
+    assert response.status_code == 200
+    assert new[0] != old[0]
+    # Every response pairs a version with that version's model: never a mix of the two
+    for version, probability in seen:
+        assert (version, pytest.approx(probability)) in (old, new)
+
+
+def test_failed_reload_keeps_the_current_model(make_client, deploy_dir):
+    client = make_client()
+    version, probability = score(client)
+
+    (deploy_dir / "data" / "processed" / "scaler.pkl").write_bytes(b"not a pickle")
+    response = client.post("/admin/reload")
+
+    assert response.status_code == 500
+    assert score(client) == (version, probability)
@@ -0,0 +1,59 @@
+"""Tests for the cascade's linear screener."""
+
+import numpy as np
+import pytest
+
+from src.models.screener import LinearScreener
+from src.models.train import train_screener
+
+
+@pytest.fixture(scope="module")
+def screener(processed_data):
+    _, X_train, _, y_train, _ = processed_data
+    return train_screener(X_train, y_train, params={"max_iter": 1000})
+
+
+def test_matches_logistic_regression(processed_data):
+    from sklearn.linear_model import LogisticRegression
+
+    _, X_train, X_test, y_train, _ = processed_data
+    model = LogisticRegression(max_iter=1000).fit(X_train, y_train)
+    np.testing.assert_allclose(
+        LinearScreener.from_sklearn(model).predict_fraud_proba(X_test), model.predict_proba(X_test)[:, 1],
+        atol=1e-12
+    )
+
+
+def test_short_circuited_rows_fall_on_the_side_of_their_decision(screener, processed_data):
+    _, _, X_test, _, _ = processed_data
+    assert screener.low_cutoff <= 0.5 <= screener.high_cutoff
+
+    proba, ambiguous = screener.screen(X_test)
+    assert not ambiguous.all()
+    assert (proba[~ambiguous & (proba < screener.low_cutoff)] <= 0.5).all()
+    assert (proba[~ambiguous & (proba > screener.high_cutoff)] > 0.5).all()
+
+
+def test_fused_scaler_scores_raw_features(screener, processed_data):
+    _, _, X_test, _, _ = processed_data
+    rng = np.random.default_rng(0)
+    mean = rng.normal(size=X_test.shape[1])
+    scale = rng.uniform(0.5, 2.0, size=X_test.shape[1])
+    fused = screener.fuse_scaler(mean, scale)
+
+    assert not fused.input_scaled
+    np.testing.assert_allclose(
+        fused.predict_fraud_proba(X_test * scale + mean), screener.predict_fraud_proba(X_test), atol=1e-9
+    )
+    with pytest.raises(ValueError):
+        fused.fuse_scaler(mean, scale)
+
+
+def test_save_load_round_trip(screener, tmp_path):
+    screener.save(tmp_path / "screener.npz")
+    loaded = LinearScreener.load(tmp_path / "screener.npz")
+
+    np.testing.assert_array_equal(loaded.weights, screener.weights)
+    assert (loaded.bias, loaded.low_cutoff, loaded.high_cutoff, loaded.input_scaled) == (
+        screener.bias, screener.low_cutoff, screener.high_cutoff, screener.input_scaled
+    )
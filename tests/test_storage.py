@@ -0,0 +1,63 @@
+"""Tests for the columnar storage of the raw dataset."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_loader import generate_fraud_data
+from src.data.storage import (
+    DATA_FORMATS, RAW_DTYPES, filter_mask, has_pyarrow, iter_raw_data, raw_data_path, read_raw_data,
+    write_raw_data
+)
+
+FILTERS = [("amount", ">", 100.0), ("merchant_category", "in", ["grocery", "online"])]
+
+
+@pytest.fixture(scope="module")
+def raw_data():
+    return generate_fraud_data(n_samples=5000, fraud_ratio=0.1)
+
+
+@pytest.fixture(scope="module", params=DATA_FORMATS)
+def stored(request, raw_data, tmp_path_factory):
+    if request.param != "csv" and not has_pyarrow():
+        pytest.skip("pyarrow is not installed")
+    path = raw_data_path(tmp_path_factory.mktemp(request.param), request.param)
+    # Several chunks and small row groups, like the chunked generator writes
+    write_raw_data((raw_data[start:start + 1500] for start in range(0, len(raw_data), 1500)), path,
+                   row_group_size=1000)
+    return path
+
+
+def test_round_trip_keeps_values_and_schema(stored, raw_data):
+    df = read_raw_data(stored)
+
+    assert list(df.columns) == list(raw_data.columns)
+    assert isinstance(df["merchant_category"].dtype, pd.CategoricalDtype)
+    assert df["merchant_category"].astype(str).tolist() == raw_data["merchant_category"].tolist()
+    for name, dtype in RAW_DTYPES.items():
+        if name != "merchant_category":
+            assert df[name].dtype == dtype, name
+            np.testing.assert_allclose(df[name], raw_data[name].astype(dtype), err_msg=name)
+
+
+def test_projection_and_filters_match_pandas(stored, raw_data):
+    df = read_raw_data(stored, columns=["transaction_id", "amount"], filters=FILTERS)
+
+    expected = raw_data[filter_mask(raw_data, FILTERS)]
+    assert list(df.columns) == ["transaction_id", "amount"]
+    np.testing.assert_array_equal(np.sort(df["transaction_id"]), np.sort(expected["transaction_id"]))
+
+
+def test_iteration_gives_exact_chunks_in_file_order(stored, raw_data):
+    chunks = list(iter_raw_data(stored, columns=["transaction_id"], chunksize=1200))
+
+    assert [len(chunk) for chunk in chunks] == [1200, 1200, 1200, 1200, 200]
+    np.testing.assert_array_equal(
+        np.concatenate([chunk["transaction_id"].to_numpy() for chunk in chunks]), raw_data["transaction_id"]
+    )
+
+
+def test_filter_mask_rejects_unknown_operators(raw_data):
+    with pytest.raises(ValueError):
+        filter_mask(raw_data, [("amount", "~", 1.0)])
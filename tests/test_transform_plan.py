@@ -0,0 +1,84 @@
+"""The compiled transform plan encodes raw rows exactly like preprocess_data."""
+
+import numpy as np
+import pytest
+from sklearn.model_selection import train_test_split
+
+from src.data.data_loader import generate_fraud_data
+from src.data.preprocessing import preprocess_data
+from src.data.transform_plan import PLAN_FILENAME, CompiledTransformPlan, load_transform_plan
+
+TEST_SIZE = 0.25
+RANDOM_STATE = 3
+
+
+@pytest.fixture(scope="module")
+def raw_data():
+    return generate_fraud_data(n_samples=2000, fraud_ratio=0.1)
+
+
+@pytest.fixture(scope="module")
+def split_rows(raw_data):
+    """Raw train and test rows, split like preprocess_data splits the encoded matrix."""
+    return train_test_split(raw_data, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=raw_data["is_fraud"])
+
+
+@pytest.fixture(scope="module")
+def processed(raw_data, tmp_path_factory):
+    save_path = tmp_path_factory.mktemp("processed")
+    X_train, X_test, _, _, _, _ = preprocess_data(
+        raw_data, test_size=TEST_SIZE, random_state=RANDOM_STATE, save_path=save_path
+    )
+    plan = CompiledTransformPlan(load_transform_plan(save_path / PLAN_FILENAME))
+    return X_train, X_test, plan
+
+
+def test_plan_output_matches_preprocess_data(split_rows, processed):
+    train_rows, test_rows = split_rows
+    X_train, X_test, plan = processed
+
+    for rows, expected in ((train_rows, X_train), (test_rows, X_test)):
+        columns = {name: rows[name].tolist() for name in plan.feature_names}
+        np.testing.assert_allclose(plan.transform_columns(columns, len(rows)), expected, rtol=1e-12, atol=1e-12)
+
+
+def test_single_row_matches_batch(split_rows, processed):
+    _, test_rows = split_rows
+    _, X_test, plan = processed
+
+    row = test_rows.iloc[0]
+    X = plan.transform_columns({name: [row[name]] for name in plan.feature_names}, 1)
+
+    np.testing.assert_allclose(X[0], X_test[0], rtol=1e-12, atol=1e-12)
+
+
+def test_unseen_categories_and_missing_values_get_the_defaults(raw_data, split_rows, processed):
+    train_rows, _ = split_rows
+    _, _, plan = processed
+    categories = sorted(raw_data["merchant_category"].unique())
+    mode_code = categories.index(raw_data["merchant_category"].mode().iloc[0])
+
+    columns = {
+        "amount": [np.nan, "n/a", None, 12.5],
+        "merchant_category": ["casino", None, "", "gas"]
+    }
+    X = plan.transform_columns(columns, 4, scale=False)
+
+    amount = plan.feature_names.index("amount")
+    np.testing.assert_allclose(X[:, amount], [train_rows["amount"].mean()] * 3 + [12.5])
+    merchant = plan.feature_names.index("merchant_category")
+    np.testing.assert_array_equal(X[:, merchant], [mode_code] * 3 + [categories.index("gas")])
+
+    # Columns left out entirely are imputed with the training mean for every row
+    for name in ("time_of_day", "account_age_days", "previous_fraud_rate"):
+        np.testing.assert_allclose(X[:, plan.feature_names.index(name)], train_rows[name].mean())
+
+
+def test_integer_codes_outside_the_table_get_the_default(processed):
+    _, _, plan = processed
+    table = plan.categorical["merchant_category"]
+    n_categories = len(table.sorted_categories)
+
+    codes = plan.encode_categorical("merchant_category", np.array([0, n_categories - 1, n_categories, -1]))
+
+    np.testing.assert_array_equal(codes, [0, n_categories - 1, table.default_code, table.default_code])